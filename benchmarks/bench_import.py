@@ -0,0 +1,125 @@
+"""Import-time benchmark for the hire CLI startup path.
+
+Runs `python -X importtime` in fresh interpreters, reports the cumulative
+import time of `hire.cli` and the wall time of `hire --version`, and fails if
+either exceeds its budget or if heavy modules leak into the startup path.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--budget-ms MS]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported just to start the CLI
+FORBIDDEN_AT_STARTUP = [
+    "argparse",
+    "subprocess",
+    "sqlite3",
+    "concurrent.futures",
+    "hire.adapters.base",
+    "hire.commands.ask",
+    "hire.session",
+]
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(REPO_ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def measure_import_us() -> int:
+    """Cumulative import time of hire.cli in microseconds, in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import hire.cli"],
+        capture_output=True,
+        text=True,
+        env=_env(),
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == "hire.cli":
+            return int(parts[1])
+    raise RuntimeError("hire.cli not found in -X importtime output")
+
+
+def measure_version_ms() -> float:
+    """Wall time of `hire --version` in milliseconds, including interpreter startup."""
+    code = "import sys; sys.argv = ['hire', '--version']; from hire.cli import main; main()"
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], capture_output=True, env=_env(), check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_baseline_ms() -> float:
+    """Wall time of a bare interpreter, to separate it from hire's own cost."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def loaded_forbidden_modules() -> list[str]:
+    """Forbidden modules present in sys.modules after importing hire.cli."""
+    code = (
+        "import sys, json, hire.cli; "
+        f"print(json.dumps([m for m in {FORBIDDEN_AT_STARTUP!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=_env(), check=True
+    )
+    return json.loads(result.stdout)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15, help="Runs per measurement")
+    parser.add_argument(
+        "--budget-ms", type=float, default=10.0,
+        help="Budget for the cumulative import time of hire.cli",
+    )
+    parser.add_argument(
+        "--version-budget-ms", type=float, default=20.0,
+        help="Budget for `hire --version` on top of a bare interpreter",
+    )
+    args = parser.parse_args()
+
+    # Warm up so .pyc files exist and the OS cache is populated
+    measure_import_us()
+
+    import_ms = statistics.median(measure_import_us() / 1000 for _ in range(args.runs))
+    baseline_ms = statistics.median(measure_baseline_ms() for _ in range(args.runs))
+    version_ms = statistics.median(measure_version_ms() for _ in range(args.runs))
+    forbidden = loaded_forbidden_modules()
+
+    report = {
+        "benchmark": "import",
+        "runs": args.runs,
+        "import_hire_cli_ms": round(import_ms, 3),
+        "version_wall_ms": round(version_ms, 3),
+        "interpreter_wall_ms": round(baseline_ms, 3),
+        "version_overhead_ms": round(version_ms - baseline_ms, 3),
+        "forbidden_modules_loaded": forbidden,
+        "budget_ms": args.budget_ms,
+        "version_budget_ms": args.version_budget_ms,
+    }
+    report["ok"] = (
+        import_ms <= args.budget_ms
+        and version_ms - baseline_ms <= args.version_budget_ms
+        and not forbidden
+    )
+    print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
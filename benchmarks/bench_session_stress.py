@@ -0,0 +1,155 @@
+"""Concurrency stress benchmark for session writes.
+
+Starts N processes that create, update and delete sessions in a shared,
+temporary data dir, then checks that nothing was corrupted: every session
+file parses, each latest pointer names an existing session of its agent,
+and the store lists exactly the sessions that should survive.
+
+Usage:
+    python benchmarks/bench_session_stress.py [--procs N] [--iterations M]
+        [--backend json|sqlite] [--fsync]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+AGENTS = ["claude", "codex", "gemini"]
+
+
+def worker(seed: int, iterations: int) -> tuple[list[str], list[str], int]:
+    """Create/update/delete sessions; return (created, deleted, operations)."""
+    from hire.session import create_session, delete_session, save_session
+
+    rng = random.Random(seed)
+    mine: list[dict] = []
+    created: list[str] = []
+    deleted: list[str] = []
+    operations = 0
+
+    for i in range(iterations):
+        session = create_session(rng.choice(AGENTS), f"cli-{seed}-{i}", name=f"w{seed}-{i}")
+        created.append(session["id"])
+        mine.append(session)
+        operations += 1
+
+        # Update one of ours
+        target = rng.choice(mine)
+        target["cli_session_id"] = f"cli-{seed}-{i}-updated"
+        save_session(target)
+        operations += 1
+
+        # Delete about a third of what we create
+        if rng.random() < 0.33:
+            victim = mine.pop(rng.randrange(len(mine)))
+            if delete_session(victim):
+                deleted.append(victim["id"])
+            operations += 1
+
+    return created, deleted, operations
+
+
+def verify_json_files(data_dir: Path) -> list[str]:
+    """Check every file the JSON store wrote for truncation or bad pointers."""
+    problems = []
+    sessions_dir = data_dir / "hire" / "sessions"
+    for agent_dir in sessions_dir.iterdir():
+        if not agent_dir.is_dir():
+            continue
+        for path in agent_dir.glob("*.json"):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                problems.append(f"{path.name}: unreadable ({e})")
+                continue
+            if path.name == "latest.json":
+                target = agent_dir / data.get("filename", "")
+                if not target.is_file():
+                    problems.append(f"{agent_dir.name}/latest.json points to missing session")
+            elif data.get("id") != path.stem or data.get("agent") != agent_dir.name:
+                problems.append(f"{path.name}: content does not match its location")
+        leftovers = list(agent_dir.glob(".*.tmp"))
+        if leftovers:
+            problems.append(f"{agent_dir.name}: {len(leftovers)} leftover temp file(s)")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--procs", type=int, default=8, help="Concurrent processes")
+    parser.add_argument("--iterations", type=int, default=100, help="Iterations per process")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--fsync", action="store_true", help="Enable storage.fsync")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="hire-stress-") as tmp:
+        data_dir = Path(tmp) / "data"
+        config_dir = Path(tmp) / "config"
+        os.environ["XDG_DATA_HOME"] = str(data_dir)
+        os.environ["XDG_CONFIG_HOME"] = str(config_dir)
+        (config_dir / "hire").mkdir(parents=True)
+        with open(config_dir / "hire" / "config.json", "w", encoding="utf-8") as f:
+            json.dump({"storage": {"backend": args.backend, "fsync": args.fsync}}, f)
+
+        start = time.perf_counter()
+        with multiprocessing.Pool(args.procs) as pool:
+            results = pool.starmap(worker, [(seed, args.iterations) for seed in range(args.procs)])
+        elapsed = time.perf_counter() - start
+
+        created = {sid for c, _, _ in results for sid in c}
+        deleted = {sid for _, d, _ in results for sid in d}
+        operations = sum(ops for _, _, ops in results)
+
+        from hire.session import get_latest_session, list_sessions
+        from hire.store import get_store
+
+        problems = verify_json_files(data_dir) if args.backend == "json" else []
+
+        listed = {s["id"] for s in list_sessions()}
+        expected = created - deleted
+        if listed != expected:
+            problems.append(
+                f"store lists {len(listed)} sessions, expected {len(expected)} "
+                f"({len(expected - listed)} missing, {len(listed - expected)} unexpected)"
+            )
+
+        # The index must agree with a full rescan of the files
+        get_store().reindex()
+        if {s["id"] for s in list_sessions()} != listed:
+            problems.append("index disagrees with session files")
+
+        for agent in AGENTS:
+            latest = get_latest_session(agent)
+            if latest is not None and latest["id"] not in expected:
+                problems.append(f"latest {agent} session was deleted")
+
+    report = {
+        "benchmark": "session_stress",
+        "backend": args.backend,
+        "fsync": args.fsync,
+        "procs": args.procs,
+        "iterations": args.iterations,
+        "operations": operations,
+        "elapsed_s": round(elapsed, 3),
+        "ops_per_s": round(operations / elapsed, 1),
+        "sessions_created": len(created),
+        "sessions_deleted": len(deleted),
+        "problems": problems,
+        "ok": not problems,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,422 @@
+"""Benchmark suite: hire overhead, session store scaling, parsing, write contention.
+
+Everything runs against temporary data dirs and fake claude, codex and gemini
+executables (benchmarks/fake_agent.py), so no real agent is needed. Sections:
+
+    overhead    end-to-end `hire <agent> ...` wall time, and hire's own share
+                of it (total minus the agent subprocess) from --timings
+    sessions    list_sessions/find_session/get_latest_session at 1k, 10k and
+                100k stored sessions, per storage backend
+    parse       adapter parse throughput for large outputs, for both the
+                buffered (ask) and line-by-line (stream) paths
+    contention  concurrent save_session from N processes: throughput and
+                per-save latency percentiles
+
+Results are printed as one JSON document. Exits non-zero if the median
+overhead exceeds --overhead-budget or a section fails.
+
+Usage:
+    python benchmarks/bench_suite.py [--only SECTION,...] [--sizes N,...]
+        [--quick] [-o results.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fake_agent  # noqa: E402
+
+SECTIONS = ["overhead", "sessions", "parse", "contention"]
+BACKENDS = ["json", "sqlite"]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Median, p95 and min of a list of seconds, in milliseconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+    }
+
+
+def timed(func: Callable[[], object], repeat: int) -> list[float]:
+    """Run func repeat times and return each run's seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def make_root(root: Path, config: dict) -> dict[str, str]:
+    """Create config and data dirs under root; return the XDG variables."""
+    config_dir = root / "config" / "hire"
+    config_dir.mkdir(parents=True)
+    (config_dir / "config.json").write_text(json.dumps({"metrics": {"enabled": False}, **config}))
+    return {"XDG_CONFIG_HOME": str(root / "config"), "XDG_DATA_HOME": str(root / "data")}
+
+
+def use_root(xdg: dict[str, str]) -> None:
+    """Point this process at a benchmark root (call before importing hire)."""
+    os.environ.update(xdg)
+    os.environ["HIRE_NO_DAEMON"] = "1"
+
+
+# --- overhead ---------------------------------------------------------------
+
+
+def bench_overhead(tmp: Path, runs: int, latency: float, payload: int) -> dict:
+    """Time `hire <agent> ping --json --timings` against the fake agents."""
+    root = tmp / "overhead"
+    wrappers = fake_agent.install(root / "bin")
+    adapters = {agent: {"command": path, "args": []} for agent, path in wrappers.items()}
+    env = {
+        **os.environ,
+        **make_root(root, {"adapters": adapters}),
+        "PYTHONPATH": str(REPO_ROOT),
+        "HIRE_NO_DAEMON": "1",
+        "FAKE_STARTUP": "0",
+        "FAKE_LATENCY": str(latency),
+        "FAKE_PAYLOAD": str(payload),
+    }
+
+    results = {}
+    for agent in fake_agent.AGENTS:
+        wall, hire_s, agent_s = [], [], []
+        for i in range(runs):
+            # Every other call continues the previous session
+            args = ["-c"] if i % 2 else []
+            cmd = [sys.executable, "-m", "hire.cli", agent, "ping", "--json", "--timings", *args]
+            start = time.perf_counter()
+            proc = subprocess.run(cmd, env=env, stdin=subprocess.DEVNULL,
+                                  capture_output=True, text=True)
+            wall.append(time.perf_counter() - start)
+            if proc.returncode != 0:
+                return {"error": f"{agent}: {proc.stderr.strip() or proc.stdout.strip()}"}
+            timings = json.loads(proc.stdout)["timings"]
+            agent_s.append(timings.get("subprocess", 0.0))
+            hire_s.append(timings["total"] - timings.get("subprocess", 0.0))
+        results[agent] = {
+            "wall": summarize(wall),
+            "agent": summarize(agent_s),
+            "overhead": summarize(hire_s),
+        }
+    return {"runs": runs, "latency_s": latency, "payload_bytes": payload, "agents": results}
+
+
+# --- sessions ---------------------------------------------------------------
+
+
+def make_sessions(count: int) -> list[dict]:
+    """Sessions spread over the agents, one in ten named, oldest first."""
+    rng = random.Random(count)
+    start = datetime(2025, 1, 1)
+    sessions = []
+    for i in range(count):
+        stamp = (start + timedelta(seconds=i)).isoformat()
+        sessions.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "cli_session_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "agent": fake_agent.AGENTS[i % len(fake_agent.AGENTS)],
+            "name": f"task-{i}" if i % 10 == 0 else None,
+            "created_at": stamp,
+            "updated_at": stamp,
+        })
+    return sessions
+
+
+def populate(backend: str, sessions: list[dict]) -> float:
+    """Write sessions straight to disk; return the time spent indexing them.
+
+    Saving one by one through the store would take minutes at 100k, so the
+    JSON files (or SQLite rows) are written directly, then the JSON index is
+    rebuilt the way hire does after sessions change behind its back.
+    """
+    from hire.paths import get_data_dir, get_sessions_dir
+
+    if backend == "sqlite":
+        import sqlite3
+
+        from hire.store.sqlite_store import DB_FILENAME, SCHEMA
+
+        start = time.perf_counter()
+        conn = sqlite3.connect(get_data_dir() / DB_FILENAME)
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.executemany(
+                "INSERT INTO sessions (id, agent, name, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+                [(s["id"], s["agent"], s["name"], s["updated_at"], json.dumps(s))
+                 for s in sessions],
+            )
+        conn.close()
+        return time.perf_counter() - start
+
+    from hire.store import JsonSessionStore
+
+    latest: dict[str, str] = {}
+    for session in sessions:
+        path = get_sessions_dir(session["agent"]) / f"{session['id']}.json"
+        path.write_text(json.dumps(session, indent=2), encoding="utf-8")
+        latest[session["agent"]] = path.name
+    for agent, filename in latest.items():
+        pointer = {"session_id": filename[:-5], "filename": filename}
+        (get_sessions_dir(agent) / "latest.json").write_text(json.dumps(pointer))
+
+    start = time.perf_counter()
+    # A separate instance, so the one hire.session uses starts cold
+    JsonSessionStore().reindex()
+    return time.perf_counter() - start
+
+
+def session_case(xdg: dict[str, str], backend: str, count: int, repeat: int) -> dict:
+    """Populate a store with count sessions and time lookups (runs in a fresh process)."""
+    use_root(xdg)
+    from hire import session as hire_session
+
+    sessions = make_sessions(count)
+    index_s = populate(backend, sessions)
+
+    result: dict = {"backend": backend, "sessions": count, "index_s": round(index_s, 3)}
+    # First call in the process: loads the JSON index or opens the database
+    result["list_first"] = summarize(timed(hire_session.list_sessions, 1))
+    result["list"] = summarize(timed(hire_session.list_sessions, repeat))
+    result["list_agent"] = summarize(timed(lambda: hire_session.list_sessions("claude"), repeat))
+    result["latest"] = summarize(timed(lambda: hire_session.get_latest_session("codex"), repeat))
+
+    probes = [sessions[(i * 7919) % count] for i in range(repeat)]
+    named = [s for s in sessions[::max(1, count // repeat)] if s["name"]] or probes
+    cases = {
+        "find_id": [s["id"] for s in probes],
+        "find_prefix": [s["id"][:8] for s in probes],
+        "find_name": [s["name"] for s in named],
+        "find_missing": [f"missing-{i}" for i in range(repeat)],
+    }
+    for key, needles in cases.items():
+        samples = []
+        for needle in needles:
+            start = time.perf_counter()
+            found = hire_session.find_session(needle)
+            samples.append(time.perf_counter() - start)
+            if (found is None) != (key == "find_missing"):
+                raise RuntimeError(f"{key}: unexpected result for {needle!r}")
+        result[key] = summarize(samples)
+    return result
+
+
+def bench_sessions(tmp: Path, sizes: list[int], repeat: int) -> list[dict]:
+    """Run session_case for every backend and size, each in its own process."""
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for backend in BACKENDS:
+        for count in sizes:
+            xdg = make_root(tmp / f"sessions-{backend}-{count}", {"storage": {"backend": backend}})
+            with ProcessPoolExecutor(1, mp_context=ctx) as pool:
+                results.append(pool.submit(session_case, xdg, backend, count, repeat).result())
+    return results
+
+
+# --- parse ------------------------------------------------------------------
+
+
+def agent_output(agent: str, size: int, shape: str, stream: bool) -> str:
+    """About size bytes of one agent's output.
+
+    shape "answer" is one long response; "events" is a long run of tool
+    calls with 4 KiB of output each, around a short response.
+    """
+    if shape == "answer":
+        text, tools, tool_output = fake_agent.filler("answer", size), 0, 0
+    else:
+        text, tools, tool_output = fake_agent.filler("answer", 4096), size // 4096, 4096
+    session_id = str(uuid.uuid4())
+    if agent == "claude":
+        events = fake_agent.claude_events(session_id, text, tools, tool_output, stream)
+    elif agent == "codex":
+        events = fake_agent.codex_events(session_id, text, tools, tool_output)
+    else:
+        events = fake_agent.gemini_events(session_id, text, tools, tool_output, stream)
+    return "".join(json.dumps(event) + "\n" for event in events)
+
+
+def bench_parse(sizes_mb: list[int], repeat: int) -> list[dict]:
+    """Time parse_output and the stream line parser on large outputs."""
+    from hire.adapters import get_adapter
+
+    results = []
+    for agent in fake_agent.AGENTS:
+        adapter = get_adapter(agent)
+        for size_mb in sizes_mb:
+            for shape in ("answer", "events"):
+                for stream in (False, True):
+                    if shape == "events" and not stream and agent != "codex":
+                        # claude and gemini json output holds only the answer
+                        continue
+                    output = agent_output(agent, size_mb * 1024 * 1024, shape, stream)
+                    if stream:
+                        lines = output.splitlines(keepends=True)
+
+                        def parse(adapter=adapter, lines=lines) -> dict:
+                            state = adapter.new_stream_state(None)
+                            for line in lines:
+                                adapter.parse_stream_line(line, state)
+                            return adapter.stream_result(state)
+                    else:
+                        def parse(adapter=adapter, output=output) -> dict:
+                            return adapter.parse_output(output, None)
+
+                    if not parse()["response"]:
+                        raise RuntimeError(f"{agent} {shape}: no response parsed")
+                    samples = timed(parse, repeat)
+                    best = min(samples)
+                    results.append({
+                        "agent": agent,
+                        "mode": "stream" if stream else "ask",
+                        "shape": shape,
+                        "bytes": len(output.encode("utf-8")),
+                        **summarize(samples),
+                        "mb_per_s": round(len(output) / best / 1e6, 1),
+                    })
+    return results
+
+
+# --- contention -------------------------------------------------------------
+
+
+def contention_worker(xdg: dict[str, str], seed: int, saves: int) -> list[float]:
+    """Save one session saves times; return each save's seconds."""
+    use_root(xdg)
+    from hire.session import create_session, save_session
+
+    session = create_session(fake_agent.AGENTS[seed % 3], f"cli-{seed}", name=f"w{seed}")
+    samples = []
+    for i in range(saves):
+        session["cli_session_id"] = f"cli-{seed}-{i}"
+        start = time.perf_counter()
+        save_session(session)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_contention(tmp: Path, procs_list: list[int], saves: int) -> list[dict]:
+    """Run contention_worker in N processes at once, per backend and N."""
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for backend in BACKENDS:
+        for procs in procs_list:
+            xdg = make_root(tmp / f"contention-{backend}-{procs}",
+                            {"storage": {"backend": backend}})
+            with ProcessPoolExecutor(procs, mp_context=ctx) as pool:
+                # Start the interpreters before timing
+                list(pool.map(abs, range(procs)))
+                start = time.perf_counter()
+                futures = [pool.submit(contention_worker, xdg, seed, saves)
+                           for seed in range(procs)]
+                samples = [s for future in futures for s in future.result()]
+                elapsed = time.perf_counter() - start
+            results.append({
+                "backend": backend,
+                "procs": procs,
+                "saves": len(samples),
+                "elapsed_s": round(elapsed, 3),
+                "saves_per_s": round(len(samples) / elapsed, 1),
+                **summarize(samples),
+            })
+    return results
+
+
+# ----------------------------------------------------------------------------
+
+
+def int_list(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--only", type=lambda v: v.split(","), default=SECTIONS,
+                        help=f"Comma-separated sections ({','.join(SECTIONS)})")
+    parser.add_argument("--quick", action="store_true",
+                        help="Smaller sizes and fewer runs, for a smoke test")
+    parser.add_argument("--sizes", type=int_list,
+                        help="Session counts (default: 1000,10000,100000)")
+    parser.add_argument("--parse-mb", type=int_list, help="Output sizes in MiB (default: 1,16)")
+    parser.add_argument("--procs", type=int_list, help="Writer process counts (default: 1,4,16)")
+    parser.add_argument("--runs", type=int, help="hire calls per agent (default: 20)")
+    parser.add_argument("--saves", type=int, default=50, help="Saves per writer process")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake agent turn time (s)")
+    parser.add_argument("--payload", type=int, default=2048, help="Fake response size (bytes)")
+    parser.add_argument("--overhead-budget", type=float, default=0.25,
+                        help="Max median hire overhead per call (s)")
+    parser.add_argument("-o", "--output", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    unknown = set(args.only) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+    sizes = args.sizes or ([1000] if args.quick else [1000, 10000, 100000])
+    parse_mb = args.parse_mb or ([1] if args.quick else [1, 16])
+    procs = args.procs or ([1, 4] if args.quick else [1, 4, 16])
+    runs = args.runs or (4 if args.quick else 20)
+    repeat = 5 if args.quick else 20
+
+    import hire
+
+    report: dict = {
+        "benchmark": "suite",
+        "hire_version": hire.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    problems = []
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="hire-suite-") as tmp:
+        root = Path(tmp)
+        use_root(make_root(root / "main", {}))
+        if "overhead" in args.only:
+            report["overhead"] = bench_overhead(root, runs, args.latency, args.payload)
+            if "error" in report["overhead"]:
+                problems.append(f"overhead: {report['overhead']['error']}")
+            else:
+                for agent, result in report["overhead"]["agents"].items():
+                    if result["overhead"]["median_ms"] > args.overhead_budget * 1000:
+                        problems.append(f"overhead: {agent} median over budget")
+        if "sessions" in args.only:
+            report["sessions"] = bench_sessions(root, sizes, repeat)
+        if "parse" in args.only:
+            report["parse"] = bench_parse(parse_mb, 3)
+        if "contention" in args.only:
+            report["contention"] = bench_contention(root, procs, args.saves)
+    report["elapsed_s"] = round(time.perf_counter() - start, 1)
+    report["problems"] = problems
+    report["ok"] = not problems
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
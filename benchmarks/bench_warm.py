@@ -0,0 +1,127 @@
+"""Cold vs warm turn latency, with and without `hire serve`.
+
+Runs `hire claude ...` against benchmarks/fake_agent.py, which sleeps
+FAKE_STARTUP seconds before reading input like a real CLI booting its
+runtime. Each mode does a new-session turn followed by follow-up turns
+(`-c`): first with every turn spawning the agent (cold), then through a
+daemon that keeps workers warm. Fails if the daemon is not faster.
+
+Usage:
+    python benchmarks/bench_warm.py [--turns N] [--startup S] [--latency S]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FAKE_AGENT = Path(__file__).resolve().parent / "fake_agent.py"
+
+
+def make_env(root: Path, startup: float, latency: float) -> dict[str, str]:
+    """Set up an isolated config pointing claude at the fake agent."""
+    bin_dir = root / "bin"
+    bin_dir.mkdir()
+    wrapper = bin_dir / "claude"
+    wrapper.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_AGENT}" "$@"\n')
+    wrapper.chmod(0o755)
+
+    config_dir = root / "config" / "hire"
+    config_dir.mkdir(parents=True)
+    config = {
+        "adapters": {"claude": {"command": str(wrapper), "args": []}},
+        "defaults": {"agent": "claude"},
+        "metrics": {"enabled": False},
+    }
+    (config_dir / "config.json").write_text(json.dumps(config))
+
+    env = dict(os.environ)
+    env.update({
+        "XDG_CONFIG_HOME": str(root / "config"),
+        "XDG_DATA_HOME": str(root / "data"),
+        "PYTHONPATH": str(REPO_ROOT),
+        "FAKE_AGENT": "claude",
+        "FAKE_STARTUP": str(startup),
+        "FAKE_LATENCY": str(latency),
+    })
+    env.pop("HIRE_NO_DAEMON", None)
+    return env
+
+
+def run_turn(env: dict[str, str], *args: str) -> float:
+    """Run one hire call and return its wall time."""
+    cmd = [sys.executable, "-m", "hire.cli", "claude", "ping", *args]
+    start = time.perf_counter()
+    subprocess.run(cmd, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                   check=True)
+    return time.perf_counter() - start
+
+
+def run_mode(env: dict[str, str], turns: int) -> dict[str, float]:
+    """Time a new-session turn and turns-1 follow-ups, repeated a few times."""
+    new, follow = [], []
+    for _ in range(3):
+        new.append(run_turn(env))
+        follow.extend(run_turn(env, "-c") for _ in range(turns - 1))
+    return {
+        "new_session_s": round(statistics.median(new), 4),
+        "follow_up_s": round(statistics.median(follow), 4),
+    }
+
+
+def start_daemon(env: dict[str, str], root: Path) -> subprocess.Popen:
+    """Start `hire serve` and wait for its socket and idle worker."""
+    daemon = subprocess.Popen([sys.executable, "-m", "hire.cli", "serve"], env=env,
+                              stdin=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    socket_path = root / "data" / "hire" / "hire.sock"
+    deadline = time.monotonic() + 10
+    while not socket_path.exists():
+        if time.monotonic() > deadline or daemon.poll() is not None:
+            daemon.kill()
+            raise RuntimeError("hire serve did not start")
+        time.sleep(0.02)
+    # Let the first idle worker finish booting
+    time.sleep(float(env["FAKE_STARTUP"]) + 0.2)
+    return daemon
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--turns", type=int, default=5, help="Turns per conversation")
+    parser.add_argument("--startup", type=float, default=0.3, help="Fake agent startup (s)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake agent turn time (s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="hire-warm-") as tmp:
+        root = Path(tmp)
+        env = make_env(root, args.startup, args.latency)
+
+        cold = run_mode({**env, "HIRE_NO_DAEMON": "1"}, args.turns)
+        daemon = start_daemon(env, root)
+        try:
+            warm = run_mode(env, args.turns)
+        finally:
+            subprocess.run([sys.executable, "-m", "hire.cli", "serve", "--stop"], env=env,
+                           stdout=subprocess.DEVNULL)
+            daemon.wait(timeout=10)
+
+    results = {
+        "startup_s": args.startup,
+        "latency_s": args.latency,
+        "cold": cold,
+        "warm": warm,
+        # The daemon is only worth running if it actually saves time
+        "ok": all(warm[key] < cold[key] for key in cold),
+    }
+    print(json.dumps(results, indent=2))
+    return 0 if results["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Stand-in for the claude, codex and gemini CLIs in benchmarks.
+
+The agent is picked by FAKE_AGENT or by the name the script runs as, so a
+symlink or wrapper called `claude` behaves like claude. It prints output
+shaped like each CLI's: claude's json/stream-json, codex's JSONL events and
+gemini's json/stream-json, including the tool calls and reasoning that
+surround the answer in real runs.
+
+Environment:
+    FAKE_AGENT    claude, codex or gemini (default: from argv[0])
+    FAKE_STARTUP  seconds to sleep before reading input (default: 0.3),
+                  standing in for the real CLIs' runtime startup
+    FAKE_LATENCY  seconds to sleep per turn (default: 0.05)
+    FAKE_PAYLOAD  bytes of response text per turn (default: 64)
+    FAKE_EVENTS   tool calls (with output) before the answer (default: 1)
+    FAKE_TOOL_OUTPUT  bytes of output per tool call (default: 256)
+    FAKE_FAILURES  file holding a count of calls still to fail with a rate
+                  limit error; each failure decrements it (default: none)
+
+The *_events() functions are also imported by bench_suite.py to build
+large outputs for the parse benchmarks.
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+AGENTS = ["claude", "codex", "gemini"]
+
+
+def filler(label: str, size: int) -> str:
+    """Text of exactly size characters."""
+    text = f"{label} "
+    return (text * (size // len(text) + 1))[:size]
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, str(default)))
+
+
+def claude_events(
+    session_id: str, text: str, tools: int, tool_output: int, stream: bool
+) -> list[dict]:
+    """Events for one claude turn; without stream just the final result."""
+    result = {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "num_turns": tools + 1,
+        "result": text,
+        "session_id": session_id,
+        "total_cost_usd": 0.0123,
+        "usage": {"input_tokens": 1200, "output_tokens": len(text) // 4},
+    }
+    if not stream:
+        return [result]
+    events = [{"type": "system", "subtype": "init", "session_id": session_id,
+               "tools": ["Bash", "Read", "Edit"], "model": "fake"}]
+    for i in range(tools):
+        tool_id = f"toolu_{i:04d}"
+        events.append({"type": "assistant", "session_id": session_id, "message": {
+            "role": "assistant",
+            "content": [{"type": "tool_use", "id": tool_id, "name": "Read",
+                         "input": {"file_path": f"/src/module_{i}.py"}}],
+        }})
+        events.append({"type": "user", "session_id": session_id, "message": {
+            "role": "user",
+            "content": [{"type": "tool_result", "tool_use_id": tool_id,
+                         "content": filler(f"line {i}", tool_output)}],
+        }})
+    events.append({"type": "assistant", "session_id": session_id, "message": {
+        "role": "assistant", "content": [{"type": "text", "text": text}],
+    }})
+    events.append(result)
+    return events
+
+
+def codex_events(thread_id: str, text: str, tools: int, tool_output: int) -> list[dict]:
+    """JSONL events for one codex exec --json turn."""
+    events: list[dict] = [
+        {"type": "thread.started", "thread_id": thread_id},
+        {"type": "turn.started"},
+        {"type": "item.completed",
+         "item": {"id": "item_0", "type": "reasoning", "text": "**Planning the change**"}},
+    ]
+    for i in range(tools):
+        item = {"id": f"item_{i + 1}", "type": "command_execution",
+                "command": f"bash -lc 'cat src/module_{i}.py'"}
+        events.append({"type": "item.started",
+                       "item": {**item, "aggregated_output": "", "status": "in_progress"}})
+        events.append({"type": "item.completed", "item": {
+            **item,
+            "aggregated_output": filler(f"line {i}", tool_output),
+            "exit_code": 0,
+            "status": "completed",
+        }})
+    events.append({"type": "item.completed",
+                   "item": {"id": f"item_{tools + 1}", "type": "agent_message", "text": text}})
+    events.append({"type": "turn.completed", "usage": {
+        "input_tokens": 1200, "cached_input_tokens": 0, "output_tokens": len(text) // 4,
+    }})
+    return events
+
+
+def gemini_events(
+    session_id: str, text: str, tools: int, tool_output: int, stream: bool
+) -> list[dict]:
+    """Events for one gemini turn; without stream just the json document."""
+    if not stream:
+        return [{"session_id": session_id, "response": text, "stats": {
+            "models": {"fake": {"tokens": {"prompt": 1200, "candidates": len(text) // 4}}},
+            "tools": {"totalCalls": tools},
+        }}]
+    events: list[dict] = [{"type": "init", "session_id": session_id, "model": "fake"}]
+    for i in range(tools):
+        events.append({"type": "tool_use", "tool_name": "read_file", "tool_id": f"t{i}",
+                       "parameters": {"absolute_path": f"/src/module_{i}.py"}})
+        events.append({"type": "tool_result", "tool_id": f"t{i}", "status": "success",
+                       "output": filler(f"line {i}", tool_output)})
+    # Text arrives as deltas of a few hundred characters
+    for start in range(0, len(text), 400):
+        events.append({"type": "message", "role": "assistant",
+                       "content": text[start:start + 400], "delta": True})
+    events.append({"type": "result", "status": "success", "stats": {"tool_calls": tools}})
+    return events
+
+
+def _emit(event: dict) -> None:
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+def _turn_events(agent: str, args: list[str], session_id: str, turn: int) -> list[dict]:
+    text = filler(f"reply {turn}", _env_int("FAKE_PAYLOAD", 64))
+    tools = _env_int("FAKE_EVENTS", 1)
+    tool_output = _env_int("FAKE_TOOL_OUTPUT", 256)
+    stream = "stream-json" in args
+    if agent == "claude":
+        return claude_events(session_id, text, tools, tool_output, stream)
+    if agent == "codex":
+        return codex_events(session_id, text, tools, tool_output)
+    return gemini_events(session_id, text, tools, tool_output, stream)
+
+
+def run(agent: str, args: list[str], latency: float) -> None:
+    """Answer one prompt, or one per stdin line in claude's worker mode."""
+    session_id = args[args.index("--resume") + 1] if "--resume" in args else str(uuid.uuid4())
+    if agent == "codex" and "resume" in args:
+        session_id = args[args.index("resume") + 1]
+
+    if agent == "claude" and "--input-format" in args:
+        # Worker mode: one stream-json user message per stdin line
+        for turn, _ in enumerate(sys.stdin, 1):
+            time.sleep(latency)
+            for event in _turn_events(agent, args, session_id, turn):
+                _emit(event)
+        return
+
+    time.sleep(latency)
+    for event in _turn_events(agent, args, session_id, 1):
+        _emit(event)
+
+
+def install(bin_dir: Path) -> dict[str, str]:
+    """Write claude, codex and gemini wrappers running this script.
+
+    Returns the wrapper path for each agent.
+    """
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for agent in AGENTS:
+        wrapper = bin_dir / agent
+        script = Path(__file__).resolve()
+        wrapper.write_text(
+            f'#!/bin/sh\nFAKE_AGENT={agent} exec "{sys.executable}" "{script}" "$@"\n'
+        )
+        wrapper.chmod(0o755)
+        paths[agent] = str(wrapper)
+    return paths
+
+
+def _should_fail() -> bool:
+    """Take one failure from the FAKE_FAILURES counter, if any are left."""
+    path = os.environ.get("FAKE_FAILURES")
+    if not path:
+        return False
+    counter = Path(path)
+    remaining = int(counter.read_text() or "0") if counter.exists() else 0
+    if remaining <= 0:
+        return False
+    counter.write_text(str(remaining - 1))
+    return True
+
+
+def main() -> int:
+    agent = os.environ.get("FAKE_AGENT") or os.path.basename(sys.argv[0]).split(".")[0]
+    if agent not in AGENTS:
+        print(f"fake_agent: unknown agent {agent!r}", file=sys.stderr)
+        return 2
+    time.sleep(float(os.environ.get("FAKE_STARTUP", "0.3")))
+    if _should_fail():
+        print("Error: 429 Too Many Requests (rate limit)", file=sys.stderr)
+        return 1
+    run(agent, sys.argv[1:], float(os.environ.get("FAKE_LATENCY", "0.05")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,45 @@
-"""Agent adapters."""
+"""Agent adapters.
 
-from .base import AgentAdapter
-from .claude import ClaudeAdapter
-from .codex import CodexAdapter
-from .gemini import GeminiAdapter
+Adapter modules are imported on first use, so that commands which never talk
+to an agent do not pay for them (or for subprocess) at startup.
+"""
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-def get_adapter(agent: str) -> AgentAdapter:
+if TYPE_CHECKING:
+    from .base import AgentAdapter
+    from .claude import ClaudeAdapter
+    from .codex import CodexAdapter
+    from .gemini import GeminiAdapter
+
+# Agent name -> (module, class)
+ADAPTERS = {
+    "claude": ("claude", "ClaudeAdapter"),
+    "codex": ("codex", "CodexAdapter"),
+    "gemini": ("gemini", "GeminiAdapter"),
+}
+
+_LAZY_ATTRS = {
+    "AgentAdapter": "base",
+    **{class_name: module for module, class_name in ADAPTERS.values()},
+}
+
+
+def get_adapter(agent: str) -> "AgentAdapter":
     """Get an adapter for the specified agent."""
-    adapters = {
-        "claude": ClaudeAdapter,
-        "codex": CodexAdapter,
-        "gemini": GeminiAdapter,
-    }
-    if agent not in adapters:
-        raise ValueError(f"Unknown agent: {agent}. Available: {list(adapters.keys())}")
-    return adapters[agent]()
+    if agent not in ADAPTERS:
+        raise ValueError(f"Unknown agent: {agent}. Available: {list(ADAPTERS.keys())}")
+    module_name, class_name = ADAPTERS[agent]
+    adapter_class = getattr(import_module(f".{module_name}", __name__), class_name)
+    adapter: AgentAdapter = adapter_class()
+    return adapter
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        return getattr(import_module(f".{_LAZY_ATTRS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = ["AgentAdapter", "ClaudeAdapter", "CodexAdapter", "GeminiAdapter", "get_adapter"]
@@ -1,7 +1,117 @@
 """Base adapter class."""
 
+import subprocess
+import threading
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import AsyncIterator, Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ..limiter import SlotTimeoutError, acquire_slot, release_slot
+from ..process import (
+    CallBudget,
+    get_call_policy,
+    kill_tree,
+    open_stdin,
+    popen_kwargs,
+    run_command,
+    track_child,
+    untrack_child,
+)
+from ..timing import span
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Longest stdout line the async API accepts; codex puts whole tool outputs on one line
+ASYNC_LINE_LIMIT = 32 * 1024 * 1024
+
+
+class StreamingProcess:
+    """Run a command and iterate over its stdout line by line.
+
+    stderr is drained on a background thread so a chatty child cannot block
+    on a full pipe while we are reading stdout. Use as a context manager so
+    the child (and its process group) is killed if the caller stops
+    iterating early. With a timeout, the group is killed once it expires,
+    which ends the iteration and sets timed_out. stdin_path, if given, is
+    the file the child reads as its stdin.
+    """
+
+    def __init__(
+        self,
+        cmd: list[str],
+        timeout: float | None = None,
+        stdin_path: Path | None = None,
+    ) -> None:
+        stdin = open_stdin(stdin_path)
+        try:
+            self.process = subprocess.Popen(
+                cmd,
+                stdin=stdin,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+                **popen_kwargs(),
+            )
+        finally:
+            if stdin:
+                stdin.close()
+        track_child(self.process.pid)
+        self.timed_out = False
+        self._timer: threading.Timer | None = None
+        if timeout is not None:
+            self._timer = threading.Timer(timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+        self._stderr_chunks: list[str] = []
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
+        self._stderr_thread.start()
+
+    def _expire(self) -> None:
+        """Kill the child when its timeout runs out."""
+        if self.process.poll() is None:
+            self.timed_out = True
+            kill_tree(self.process.pid)
+
+    def _drain_stderr(self) -> None:
+        """Collect stderr until the child closes it."""
+        assert self.process.stderr is not None
+        for chunk in self.process.stderr:
+            self._stderr_chunks.append(chunk)
+
+    def __iter__(self) -> Iterator[str]:
+        assert self.process.stdout is not None
+        yield from self.process.stdout
+
+    def wait(self) -> int:
+        """Wait for the child to exit and return its exit code."""
+        returncode = self.process.wait()
+        if self._timer:
+            self._timer.cancel()
+        self._stderr_thread.join()
+        return returncode
+
+    @property
+    def stderr(self) -> str:
+        """Everything the child wrote to stderr (complete after wait())."""
+        return "".join(self._stderr_chunks)
+
+    def __enter__(self) -> "StreamingProcess":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._timer:
+            self._timer.cancel()
+        if self.process.poll() is None:
+            kill_tree(self.process.pid)
+            self.process.wait()
+        untrack_child(self.process.pid)
+        if self.process.stdout:
+            self.process.stdout.close()
+        self._stderr_thread.join()
 
 
 class AgentAdapter(ABC):
@@ -15,6 +125,7 @@ class AgentAdapter(ABC):
         message: str,
         session_id: str | None = None,
         model: str | None = None,
+        prompt_file: Path | None = None,
     ) -> dict[str, Any]:
         """
         Send a message to the agent and get a response.
@@ -23,6 +134,9 @@ class AgentAdapter(ABC):
             message: The message to send
             session_id: Optional CLI session ID for continuation
             model: Optional model to use
+            prompt_file: Optional file holding the whole prompt, passed to the
+                agent on stdin instead of message (for prompts too large for
+                a command-line argument; see hire.prompt_file)
 
         Returns:
             dict with keys:
@@ -32,11 +146,412 @@ class AgentAdapter(ABC):
         """
         pass
 
-    def build_command(
+    def stream(
         self,
         message: str,
         session_id: str | None = None,
         model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Send a message to the agent and yield events as they arrive.
+
+        Args:
+            message: The message to send
+            session_id: Optional CLI session ID for continuation
+            model: Optional model to use
+            prompt_file: Optional file holding the whole prompt, as in ask()
+
+        Yields:
+            dicts with a "type" key:
+                - text: {"type": "text", "text": ...} with response text to
+                  append to what has been printed so far
+                - result: {"type": "result", "result": ...} as the last event,
+                  where result has the same shape as the return value of ask()
+
+        The default implementation buffers through ask(); adapters whose CLI
+        can stream override it, usually with _stream_command().
+        """
+        result = self.ask(message, session_id=session_id, model=model, prompt_file=prompt_file)
+        if result.get("response"):
+            yield {"type": "text", "text": result["response"]}
+        yield {"type": "result", "result": result}
+
+    async def aask(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> dict[str, Any]:
+        """
+        Asyncio version of ask().
+
+        Runs the command from build_command() with
+        asyncio.create_subprocess_exec under the agent's timeout and retry
+        policy, and parses its output with parse_output(). Cancelling the
+        task (e.g. via asyncio.wait_for) kills the agent's process group.
+        """
+        import asyncio
+
+        cmd = self.build_command(None if prompt_file else message, session_id, model)
+        budget = CallBudget(get_call_policy(self.name))
+        while True:
+            try:
+                ticket = await self._aacquire_slot(budget)
+            except SlotTimeoutError as e:
+                return budget.finish(
+                    {"response": None, "session_id": session_id, "error": str(e), "raw": None}
+                )
+            try:
+                timeout = budget.start_attempt()
+                stdin = open_stdin(prompt_file)
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        stdin=stdin,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                        **popen_kwargs(),
+                    )
+                finally:
+                    if stdin:
+                        stdin.close()
+                track_child(process.pid)
+                timed_out = False
+                try:
+                    stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    stdout = stderr = b""
+                finally:
+                    if process.returncode is None:
+                        kill_tree(process.pid)
+                        await process.wait()
+                    untrack_child(process.pid)
+            finally:
+                await self._arelease_slot(ticket)
+
+            output = stdout.decode("utf-8", errors="replace")
+            if not timed_out and process.returncode == 0:
+                return budget.finish(self.parse_output(output, session_id))
+
+            if timed_out:
+                error = budget.timeout_error(timeout)
+            else:
+                error = stderr.decode("utf-8", errors="replace") or "Command failed"
+            delay = budget.retry_delay(error, timed_out)
+            if delay is None:
+                return budget.finish({
+                    "response": None,
+                    "session_id": session_id,
+                    "error": error,
+                    "raw": output,
+                })
+            await asyncio.sleep(delay)
+
+    async def astream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Asyncio version of stream(), yielding the same events.
+
+        Closing the generator or cancelling its task kills the agent's
+        process group.
+        """
+        import asyncio
+
+        cmd = self.build_command(None if prompt_file else message, session_id, model, stream=True)
+        budget = CallBudget(get_call_policy(self.name))
+        while True:
+            state = self.new_stream_state(session_id)
+            try:
+                ticket = await self._aacquire_slot(budget)
+            except SlotTimeoutError as e:
+                yield {"type": "result", "result": budget.finish(
+                    {"response": None, "session_id": session_id, "error": str(e), "raw": None}
+                )}
+                return
+            try:
+                timeout = budget.start_attempt()
+                stdin = open_stdin(prompt_file)
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        stdin=stdin,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                        limit=ASYNC_LINE_LIMIT,
+                        **popen_kwargs(),
+                    )
+                finally:
+                    if stdin:
+                        stdin.close()
+                assert process.stdout is not None and process.stderr is not None
+                track_child(process.pid)
+                expired: list[bool] = []
+
+                def expire(
+                    process: asyncio.subprocess.Process = process,
+                    expired: list[bool] = expired,
+                ) -> None:
+                    if process.returncode is None:
+                        expired.append(True)
+                        kill_tree(process.pid)
+
+                timer = None
+                if timeout is not None:
+                    timer = asyncio.get_running_loop().call_later(timeout, expire)
+                # Drained concurrently so a chatty child cannot block on a full pipe
+                stderr_task = asyncio.ensure_future(process.stderr.read())
+                try:
+                    async for line in process.stdout:
+                        for text in self.parse_stream_line(
+                            line.decode("utf-8", errors="replace"), state
+                        ):
+                            yield {"type": "text", "text": text}
+                    returncode = await process.wait()
+                    stderr = (await stderr_task).decode("utf-8", errors="replace")
+                finally:
+                    if timer:
+                        timer.cancel()
+                    if process.returncode is None:
+                        kill_tree(process.pid)
+                        await process.wait()
+                    untrack_child(process.pid)
+                    stderr_task.cancel()
+            finally:
+                await self._arelease_slot(ticket)
+
+            result, delay = self._stream_outcome(
+                budget, state, returncode, stderr, timeout, bool(expired)
+            )
+            if delay is None:
+                yield {"type": "result", "result": result}
+                return
+            await asyncio.sleep(delay)
+
+    async def _aacquire_slot(self, budget: CallBudget) -> str | None:
+        """Wait for a limiter slot without blocking the event loop."""
+        import asyncio
+
+        cancel = threading.Event()
+        waiter = asyncio.ensure_future(
+            asyncio.to_thread(acquire_slot, self.name, budget.remaining(), cancel)
+        )
+        try:
+            # Shielded, so a cancelled caller can still see what the thread got
+            return await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # Take the waiting thread out of the queue too, and give back a
+            # slot it took before noticing
+            cancel.set()
+            waiter.add_done_callback(self._release_abandoned_slot)
+            raise
+
+    def _release_abandoned_slot(self, waiter: "asyncio.Future[str | None]") -> None:
+        """Release the slot a cancelled _aacquire_slot() got, if any."""
+        if not waiter.cancelled() and waiter.exception() is None:
+            release_slot(self.name, waiter.result())
+
+    async def _arelease_slot(self, ticket: str | None) -> None:
+        """Give back a limiter slot without blocking the event loop."""
+        import asyncio
+
+        if ticket is not None:
+            await asyncio.to_thread(release_slot, self.name, ticket)
+
+    def _ask_command(
+        self,
+        cmd: list[str],
+        session_id: str | None,
+        prompt_file: Path | None = None,
+    ) -> dict[str, Any]:
+        """Run a command under the agent's timeout and retry policy and parse it."""
+        budget = CallBudget(get_call_policy(self.name))
+        while True:
+            try:
+                with span("queue"):
+                    ticket = acquire_slot(self.name, budget.remaining())
+            except SlotTimeoutError as e:
+                return budget.finish(
+                    {"response": None, "session_id": session_id, "error": str(e), "raw": None}
+                )
+            try:
+                timeout = budget.start_attempt()
+                with span("subprocess"):
+                    returncode, stdout, stderr = run_command(cmd, timeout, prompt_file)
+            finally:
+                release_slot(self.name, ticket)
+
+            if returncode == 0:
+                with span("parse"):
+                    return budget.finish(self.parse_output(stdout, session_id))
+
+            timed_out = returncode is None
+            error = budget.timeout_error(timeout) if timed_out else stderr or "Command failed"
+            delay = budget.retry_delay(error, timed_out)
+            if delay is None:
+                return budget.finish({
+                    "response": None,
+                    "session_id": session_id,
+                    "error": error,
+                    "raw": stdout,
+                })
+            with span("backoff"):
+                budget.sleep(delay)
+
+    def _ask_streaming(
+        self,
+        cmd: list[str],
+        session_id: str | None,
+        prompt_file: Path | None = None,
+    ) -> dict[str, Any]:
+        """Like _ask_command, but parse the output line by line as it arrives.
+
+        For CLIs whose output is a stream of events: stdout is never held in
+        full, so memory stays flat however long the run's output gets.
+        """
+        result: dict[str, Any] = {}
+        for event in self._stream_command(cmd, session_id, prompt_file):
+            if event["type"] == "result":
+                result = event["result"]
+        return result
+
+    def _stream_command(
+        self,
+        cmd: list[str],
+        session_id: str | None,
+        prompt_file: Path | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Run a streaming command and yield stream() events from its output."""
+        budget = CallBudget(get_call_policy(self.name))
+        while True:
+            state = self.new_stream_state(session_id)
+            try:
+                with span("queue"):
+                    ticket = acquire_slot(self.name, budget.remaining())
+            except SlotTimeoutError as e:
+                yield {"type": "result", "result": budget.finish(
+                    {"response": None, "session_id": session_id, "error": str(e), "raw": None}
+                )}
+                return
+            try:
+                timeout = budget.start_attempt()
+                # Parsing is interleaved with reading, so it is part of the subprocess span
+                with span("subprocess"), StreamingProcess(cmd, timeout, prompt_file) as process:
+                    for line in process:
+                        for text in self.parse_stream_line(line, state):
+                            yield {"type": "text", "text": text}
+                    returncode = process.wait()
+            finally:
+                release_slot(self.name, ticket)
+
+            result, delay = self._stream_outcome(
+                budget, state, returncode, process.stderr, timeout, process.timed_out
+            )
+            if delay is None:
+                yield {"type": "result", "result": result}
+                return
+            with span("backoff"):
+                budget.sleep(delay)
+
+    def _stream_outcome(
+        self,
+        budget: CallBudget,
+        state: dict[str, Any],
+        returncode: int,
+        stderr: str,
+        timeout: float | None,
+        timed_out: bool,
+    ) -> tuple[dict[str, Any], float | None]:
+        """Build the result of a streaming attempt, and the delay if it is retried."""
+        if returncode == 0 and not timed_out:
+            return budget.finish(self.stream_result(state)), None
+
+        error = budget.timeout_error(timeout) if timed_out else stderr or "Command failed"
+        # Text that was already passed on cannot be taken back, so only retry before any
+        delay = None if state["parts"] else budget.retry_delay(error, timed_out)
+        result = {
+            "response": None,
+            "session_id": state["initial_session_id"],
+            "error": error,
+            "raw": state["final"],
+        }
+        return budget.finish(result), delay
+
+    def parse_output(self, stdout: str, session_id: str | None = None) -> dict[str, Any]:
+        """Turn the stdout of a successful non-streaming run into an ask() result."""
+        raise NotImplementedError
+
+    def new_stream_state(self, session_id: str | None = None) -> dict[str, Any]:
+        """Create the parser state passed to parse_stream_line()."""
+        return {
+            "initial_session_id": session_id,
+            "session_id": session_id,
+            # Response text seen so far
+            "parts": [],
+            # The CLI's final event, if it has one
+            "final": None,
+        }
+
+    def parse_stream_line(self, line: str, state: dict[str, Any]) -> list[str]:
+        """Update state from one line of streaming output.
+
+        Returns the text to append to what has been printed so far.
+        """
+        raise NotImplementedError
+
+    def stream_result(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Build the ask()-shaped result once streaming output has ended."""
+        raise NotImplementedError
+
+    def build_command(
+        self,
+        message: str | None,
+        session_id: str | None = None,
+        model: str | None = None,
+        stream: bool = False,
     ) -> list[str]:
-        """Build the command to execute. Override in subclasses."""
+        """Build the command to execute. Override in subclasses.
+
+        A message of None means the prompt arrives on stdin (see
+        hire.prompt_file), and the CLI must be told to read it from there.
+        """
+        raise NotImplementedError
+
+    def build_worker_command(
+        self,
+        session_id: str | None = None,
+        model: str | None = None,
+    ) -> list[str] | None:
+        """
+        Build the command for a long-lived worker, or None if unsupported.
+
+        A worker reads one encoded prompt per stdin line (see
+        encode_worker_message) and answers each with the lines that
+        read_worker_turn consumes, so `hire serve` can start it ahead of
+        time and keep it for follow-up turns in the same session.
+        """
+        return None
+
+    def encode_worker_message(self, message: str) -> str:
+        """Encode a prompt as one line of worker input."""
+        raise NotImplementedError
+
+    def read_worker_turn(
+        self,
+        lines: Iterable[str],
+        session_id: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Read one turn of worker output and yield stream() events.
+
+        Must stop after the turn's result event without reading further, and
+        yield no result event if the lines end first.
+        """
         raise NotImplementedError
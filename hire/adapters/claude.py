@@ -1,11 +1,13 @@
 """Claude CLI adapter."""
 
 import json
-import shutil
-import subprocess
+from collections.abc import Iterable, Iterator
+from pathlib import Path
 from typing import Any
 
 from ..config import get_adapter_config
+from ..executables import resolve_executable
+from ..timing import span
 from .base import AgentAdapter
 
 
@@ -16,20 +18,27 @@ class ClaudeAdapter(AgentAdapter):
 
     def build_command(
         self,
-        message: str,
+        message: str | None,
         session_id: str | None = None,
         model: str | None = None,
+        stream: bool = False,
     ) -> list[str]:
         """Build the claude command."""
         config = get_adapter_config("claude")
         command = config.get("command", "claude")
         # Resolve full path for Windows .cmd/.bat files
-        resolved = shutil.which(command)
+        resolved = resolve_executable(command)
         if resolved:
             command = resolved
         args = config.get("args", [])
 
-        cmd = [command, "-p", message, "--output-format", "json"]
+        # Without a prompt argument, -p reads the prompt from stdin
+        cmd = [command, "-p"] if message is None else [command, "-p", message]
+        if stream:
+            # stream-json emits one event per line; claude requires --verbose for it
+            cmd.extend(["--output-format", "stream-json", "--verbose"])
+        else:
+            cmd.extend(["--output-format", "json"])
         cmd.extend(args)
 
         if session_id:
@@ -45,27 +54,18 @@ class ClaudeAdapter(AgentAdapter):
         message: str,
         session_id: str | None = None,
         model: str | None = None,
+        prompt_file: Path | None = None,
     ) -> dict[str, Any]:
         """Send a message to Claude and get a response."""
-        cmd = self.build_command(message, session_id, model)
+        with span("build_command"):
+            cmd = self.build_command(None if prompt_file else message, session_id, model)
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-        )
-
-        if result.returncode != 0:
-            return {
-                "response": None,
-                "session_id": session_id,
-                "error": result.stderr or "Command failed",
-                "raw": result.stdout,
-            }
+        return self._ask_command(cmd, session_id, prompt_file)
 
+    def parse_output(self, stdout: str, session_id: str | None = None) -> dict[str, Any]:
+        """Parse claude's --output-format json output."""
         try:
-            data = json.loads(result.stdout)
+            data = json.loads(stdout)
             return {
                 "response": data.get("result", ""),
                 "session_id": data.get("session_id", session_id),
@@ -74,7 +74,90 @@ class ClaudeAdapter(AgentAdapter):
         except json.JSONDecodeError:
             # If not JSON, return raw output
             return {
-                "response": result.stdout,
+                "response": stdout,
                 "session_id": session_id,
-                "raw": result.stdout,
+                "raw": stdout,
             }
+
+    def stream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Send a message to Claude and yield text as each message completes."""
+        with span("build_command"):
+            cmd = self.build_command(
+                None if prompt_file else message, session_id, model, stream=True
+            )
+        return self._stream_command(cmd, session_id, prompt_file)
+
+    def parse_stream_line(self, line: str, state: dict[str, Any]) -> list[str]:
+        """Parse one stream-json event."""
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return []
+        if not isinstance(event, dict):
+            return []
+
+        # Every event carries the session ID
+        state["session_id"] = event.get("session_id", state["session_id"])
+        event_type = event.get("type")
+
+        texts = []
+        if event_type == "assistant":
+            for block in event.get("message", {}).get("content", []):
+                if block.get("type") == "text" and block.get("text"):
+                    separator = "\n\n" if state["parts"] else ""
+                    state["parts"].append(block["text"])
+                    texts.append(separator + block["text"])
+        elif event_type == "result":
+            state["final"] = event
+        return texts
+
+    def stream_result(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Build the result from claude's result event or the collected text."""
+        final = state["final"]
+        if final is not None:
+            response_text = final.get("result", "")
+        else:
+            response_text = "\n\n".join(state["parts"])
+        return {
+            "response": response_text,
+            "session_id": state["session_id"],
+            "raw": final,
+        }
+
+    def build_worker_command(
+        self,
+        session_id: str | None = None,
+        model: str | None = None,
+    ) -> list[str]:
+        """Build a claude command that reads one prompt per stdin line."""
+        cmd = self.build_command("", session_id, model, stream=True)
+        # Prompts arrive as stream-json on stdin instead of as the -p argument
+        cmd[2:3] = ["--input-format", "stream-json"]
+        return cmd
+
+    def encode_worker_message(self, message: str) -> str:
+        """Encode a prompt as a stream-json user message."""
+        return json.dumps({
+            "type": "user",
+            "message": {"role": "user", "content": [{"type": "text", "text": message}]},
+        })
+
+    def read_worker_turn(
+        self,
+        lines: Iterable[str],
+        session_id: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield one turn's events from a worker, stopping at its result."""
+        state = self.new_stream_state(session_id)
+        for line in lines:
+            for text in self.parse_stream_line(line, state):
+                yield {"type": "text", "text": text}
+            if state["final"] is not None:
+                yield {"type": "result", "result": self.stream_result(state)}
+                return
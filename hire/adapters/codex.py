@@ -1,13 +1,31 @@
 """Codex CLI adapter."""
 
 import json
-import shutil
-import subprocess
+from collections import deque
+from collections.abc import Iterator
+from pathlib import Path
 from typing import Any
 
 from ..config import get_adapter_config
+from ..executables import resolve_executable
+from ..timing import span
 from .base import AgentAdapter
 
+# Types of the events and items ask() and stream() need from the JSONL output
+RESPONSE_MARKERS = ("thread.started", "agent_message")
+
+# Lines of output kept for the result's raw field
+RAW_TAIL_LINES = 50
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of text one at a time, without building a list."""
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start) + 1 or len(text)
+        yield text[start:end]
+        start = end
+
 
 class CodexAdapter(AgentAdapter):
     """Adapter for Codex CLI."""
@@ -16,15 +34,20 @@ class CodexAdapter(AgentAdapter):
 
     def build_command(
         self,
-        message: str,
+        message: str | None,
         session_id: str | None = None,
         model: str | None = None,
+        stream: bool = False,
     ) -> list[str]:
-        """Build the codex command."""
+        """Build the codex command.
+
+        --json output is already a stream of JSONL events, so stream needs no
+        extra flags.
+        """
         config = get_adapter_config("codex")
         command = config.get("command", "codex")
         # Resolve full path for Windows .cmd/.bat files
-        resolved = shutil.which(command)
+        resolved = resolve_executable(command)
         if resolved:
             command = resolved
         args = config.get("args", [])
@@ -37,12 +60,14 @@ class CodexAdapter(AgentAdapter):
         if model:
             cmd.extend(["--model", model])
 
+        # A prompt of "-" tells codex exec to read it from stdin
+        prompt = "-" if message is None else message
         if session_id:
             # Resume session
-            cmd.extend(["resume", session_id, message])
+            cmd.extend(["resume", session_id, prompt])
         else:
             # New session
-            cmd.append(message)
+            cmd.append(prompt)
 
         return cmd
 
@@ -51,57 +76,96 @@ class CodexAdapter(AgentAdapter):
         message: str,
         session_id: str | None = None,
         model: str | None = None,
+        prompt_file: Path | None = None,
     ) -> dict[str, Any]:
         """Send a message to Codex and get a response."""
-        cmd = self.build_command(message, session_id, model)
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-        )
-
-        if result.returncode != 0:
-            return {
-                "response": None,
-                "session_id": session_id,
-                "error": result.stderr or "Command failed",
-                "raw": result.stdout,
-            }
-
-        # Codex outputs JSONL (one JSON object per line)
-        # Parse all lines and extract the final response
-        lines = result.stdout.strip().split("\n")
-        response_text = ""
-        new_session_id = session_id
-
-        for line in lines:
-            if not line.strip():
-                continue
-            try:
-                event = json.loads(line)
-                event_type = event.get("type", "")
-
-                # Get thread_id from thread.started event
-                if event_type == "thread.started":
-                    new_session_id = event.get("thread_id", new_session_id)
-
-                # Get response text from item.completed with agent_message
-                if event_type == "item.completed":
-                    item = event.get("item", {})
-                    if item.get("type") == "agent_message":
-                        response_text = item.get("text", "")
-
-            except json.JSONDecodeError:
-                continue
-
-        # If no structured response found, use raw output
-        if not response_text:
-            response_text = result.stdout.strip()
-
-        return {
+        with span("build_command"):
+            cmd = self.build_command(None if prompt_file else message, session_id, model)
+
+        return self._ask_streaming(cmd, session_id, prompt_file)
+
+    def parse_output(self, stdout: str, session_id: str | None = None) -> dict[str, Any]:
+        """Parse codex's --json output (JSONL, one event per line)."""
+        state = self.new_stream_state(session_id)
+        for line in _iter_lines(stdout):
+            self.parse_stream_line(line, state)
+        return self.stream_result(state)
+
+    def stream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Send a message to Codex and yield each agent message as it completes."""
+        with span("build_command"):
+            cmd = self.build_command(
+                None if prompt_file else message, session_id, model, stream=True
+            )
+        return self._stream_command(cmd, session_id, prompt_file)
+
+    def new_stream_state(self, session_id: str | None = None) -> dict[str, Any]:
+        """Create the parser state, with the event types to capture from config."""
+        state = super().new_stream_state(session_id)
+        capture = get_adapter_config("codex").get("capture_events", [])
+        state["capture"] = frozenset(capture)
+        # Quoted strings a line must contain to be worth decoding
+        state["markers"] = tuple(f'"{name}"' for name in (*RESPONSE_MARKERS, *capture))
+        state["events"] = []
+        # Output that is not JSON, used as the response if no agent message came
+        state["plain"] = []
+        # The last lines of output, shown as raw output if the call fails
+        state["tail"] = deque(maxlen=RAW_TAIL_LINES)
+        return state
+
+    def parse_stream_line(self, line: str, state: dict[str, Any]) -> list[str]:
+        """Parse one JSONL event.
+
+        Tool calls and reasoning make up most of a long run's output and are
+        not needed, so lines are only decoded if they contain the name of an
+        event or item type we keep. The check can match inside a string
+        value; the decoded type is checked again below.
+        """
+        state["tail"].append(line)
+        if not any(marker in line for marker in state["markers"]):
+            if not line.lstrip().startswith("{"):
+                state["plain"].append(line)
+            return []
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return []
+        if not isinstance(event, dict):
+            return []
+
+        event_type = event.get("type", "")
+        if event_type in state["capture"]:
+            state["events"].append(event)
+
+        # Get thread_id from thread.started event
+        if event_type == "thread.started":
+            state["session_id"] = event.get("thread_id", state["session_id"])
+
+        # Get response text from item.completed with agent_message
+        if event_type == "item.completed":
+            item = event.get("item", {})
+            if item.get("type") == "agent_message" and item.get("text"):
+                separator = "\n\n" if state["parts"] else ""
+                # Only the last message is the response, so keep just that one
+                state["parts"] = [item["text"]]
+                return [separator + item["text"]]
+        return []
+
+    def stream_result(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Build the result; the last agent message is the response."""
+        # Without a structured response, fall back to any plain output
+        response_text = state["parts"][-1] if state["parts"] else "".join(state["plain"]).strip()
+        result = {
             "response": response_text,
-            "session_id": new_session_id,
-            "raw": result.stdout,
+            "session_id": state["session_id"],
+            "raw": "".join(state["tail"]),
         }
+        if state["capture"]:
+            result["events"] = state["events"]
+        return result
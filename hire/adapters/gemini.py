@@ -1,11 +1,13 @@
 """Gemini CLI adapter."""
 
 import json
-import shutil
-import subprocess
+from collections.abc import Iterator
+from pathlib import Path
 from typing import Any
 
 from ..config import get_adapter_config
+from ..executables import resolve_executable
+from ..timing import span
 from .base import AgentAdapter
 
 
@@ -16,21 +18,24 @@ class GeminiAdapter(AgentAdapter):
 
     def build_command(
         self,
-        message: str,
+        message: str | None,
         session_id: str | None = None,
         model: str | None = None,
+        stream: bool = False,
     ) -> list[str]:
         """Build the gemini command."""
         config = get_adapter_config("gemini")
         command = config.get("command", "gemini")
         # Resolve full path for Windows .cmd/.bat files
-        resolved = shutil.which(command)
+        resolved = resolve_executable(command)
         if resolved:
             command = resolved
         args = config.get("args", [])
 
         # gemini -p "message" -o json -y
-        cmd = [command, "-p", message, "-o", "json"]
+        cmd = [command] if message is None else [command, "-p", message]
+        # Without -p, gemini takes the prompt from stdin when it is not a terminal
+        cmd.extend(["-o", "stream-json" if stream else "json"])
         cmd.extend(args)
 
         # Resume uses "latest" or index number, not session ID
@@ -47,28 +52,18 @@ class GeminiAdapter(AgentAdapter):
         message: str,
         session_id: str | None = None,
         model: str | None = None,
+        prompt_file: Path | None = None,
     ) -> dict[str, Any]:
         """Send a message to Gemini and get a response."""
-        cmd = self.build_command(message, session_id, model)
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-        )
+        with span("build_command"):
+            cmd = self.build_command(None if prompt_file else message, session_id, model)
 
-        if result.returncode != 0:
-            return {
-                "response": None,
-                "session_id": session_id,
-                "error": result.stderr or "Command failed",
-                "raw": result.stdout,
-            }
+        return self._ask_command(cmd, session_id, prompt_file)
 
-        # Parse JSON output
+    def parse_output(self, stdout: str, session_id: str | None = None) -> dict[str, Any]:
+        """Parse gemini's -o json output."""
         try:
-            data = json.loads(result.stdout)
+            data = json.loads(stdout)
             response_text = data.get("response", data.get("result", data.get("text", "")))
             new_session_id = data.get("session_id", data.get("sessionId", session_id))
 
@@ -84,7 +79,54 @@ class GeminiAdapter(AgentAdapter):
         except json.JSONDecodeError:
             # Plain text output or JSON parsing failed
             return {
-                "response": result.stdout.strip(),
+                "response": stdout.strip(),
                 "session_id": session_id or "latest",
-                "raw": result.stdout,
+                "raw": stdout,
             }
+
+    def stream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Send a message to Gemini and yield response text deltas."""
+        with span("build_command"):
+            cmd = self.build_command(
+                None if prompt_file else message, session_id, model, stream=True
+            )
+        return self._stream_command(cmd, session_id, prompt_file)
+
+    def parse_stream_line(self, line: str, state: dict[str, Any]) -> list[str]:
+        """Parse one stream-json event."""
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return []
+        if not isinstance(event, dict):
+            return []
+
+        event_type = event.get("type")
+
+        if event_type == "init":
+            state["session_id"] = event.get(
+                "session_id", event.get("sessionId", state["session_id"])
+            )
+        elif event_type == "message" and event.get("role") == "assistant":
+            text = event.get("content", "")
+            if text:
+                state["parts"].append(text)
+                return [text]
+        elif event_type == "result":
+            state["final"] = event
+        return []
+
+    def stream_result(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Build the result from the streamed text deltas."""
+        return {
+            "response": "".join(state["parts"]),
+            # Fall back to "latest" for new sessions if no session_id returned
+            "session_id": state["session_id"] or "latest",
+            "raw": state["final"],
+        }
@@ -0,0 +1,60 @@
+"""Asyncio versions of the session API.
+
+Session stores do blocking file or SQLite I/O, which would stall the event
+loop, so each call runs in a worker thread via asyncio.to_thread. The stores
+are thread-safe themselves (the JSON store serializes on its mutex and
+sessions/.lock, the SQLite store on its connection lock), so calls need no
+extra locking here.
+
+For agent calls themselves use AgentAdapter.aask() and astream().
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from . import session
+
+T = TypeVar("T")
+
+
+async def _run(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking session function in a worker thread."""
+    return await asyncio.to_thread(func, *args)
+
+
+async def acreate_session(
+    agent: str, cli_session_id: str, name: str | None = None
+) -> dict[str, Any]:
+    """Create a new session."""
+    return await _run(session.create_session, agent, cli_session_id, name)
+
+
+async def asave_session(data: dict[str, Any]) -> None:
+    """Save a session to the configured store."""
+    await _run(session.save_session, data)
+
+
+async def aget_latest_session(agent: str) -> dict[str, Any] | None:
+    """Get the latest session for an agent."""
+    return await _run(session.get_latest_session, agent)
+
+
+async def afind_session(name_or_id: str) -> dict[str, Any] | None:
+    """Find a session by name or ID."""
+    return await _run(session.find_session, name_or_id)
+
+
+async def alist_sessions(agent: str | None = None) -> list[dict[str, Any]]:
+    """List all sessions, optionally filtered by agent."""
+    return await _run(session.list_sessions, agent)
+
+
+async def adelete_session(data: dict[str, Any]) -> bool:
+    """Delete a session."""
+    return await _run(session.delete_session, data)
+
+
+async def adelete_sessions(sessions: list[dict[str, Any]]) -> int:
+    """Delete several sessions at once. Returns how many were deleted."""
+    return await _run(session.delete_sessions, sessions)
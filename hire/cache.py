@@ -0,0 +1,203 @@
+"""Response cache for repeated prompts."""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+from .config import load_config
+from .fileutil import atomic_write_json, file_lock
+from .paths import ensure_dir, get_data_dir
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# @path references, as understood by the agents' file attachment syntax
+FILE_REF_PATTERN = re.compile(r"@([^\s\"'`]+)")
+
+
+def get_cache_dir() -> Path:
+    """Get the response cache directory (~/.local/share/hire/cache/)."""
+    return ensure_dir(get_data_dir() / "cache")
+
+
+def get_cache_config() -> dict[str, Any]:
+    """Get the cache settings from config, with defaults filled in."""
+    config = load_config().get("cache", {})
+    return {
+        "enabled": config.get("enabled", False),
+        "ttl": config.get("ttl", DEFAULT_TTL),
+        "max_entries": config.get("max_entries", DEFAULT_MAX_ENTRIES),
+        "max_bytes": config.get("max_bytes", DEFAULT_MAX_BYTES),
+    }
+
+
+def _file_digest(path: Path) -> str:
+    """Hash a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_cache_key(
+    agent: str,
+    message: str,
+    model: str | None,
+    args: list[str],
+) -> str:
+    """Build the cache key for a prompt.
+
+    Files referenced with @path are hashed too, so editing an attached file
+    invalidates the entry even though the prompt text is unchanged.
+    """
+    files = {}
+    for ref in FILE_REF_PATTERN.findall(message):
+        path = Path(ref)
+        try:
+            files[ref] = _file_digest(path) if path.is_file() else None
+        except OSError:
+            files[ref] = None
+
+    payload = json.dumps(
+        {
+            "agent": agent,
+            "model": model,
+            "args": args,
+            "message": message,
+            "files": files,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return get_cache_dir() / f"{key}.json"
+
+
+def _iter_entries() -> list[Path]:
+    return [p for p in get_cache_dir().glob("*.json") if p.name != "stats.json"]
+
+
+def _bump_stat(field: str) -> None:
+    """Increment a hit/miss counter.
+
+    Concurrent hire processes serialize on stats.lock (not on stats.json,
+    which is replaced on every write), so no increment is lost.
+    """
+    stats_path = get_cache_dir() / "stats.json"
+    with file_lock(get_cache_dir() / "stats.lock"):
+        try:
+            with open(stats_path, encoding="utf-8") as f:
+                stats = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            stats = {}
+        stats[field] = stats.get(field, 0) + 1
+        atomic_write_json(stats_path, stats)
+
+
+def get_cached(key: str, ttl: float = DEFAULT_TTL) -> dict[str, Any] | None:
+    """Get a cached result, or None if missing or older than ttl seconds.
+
+    The result holds the response only: the agent session that produced it
+    belongs to whoever asked first, so it is never handed out again.
+    """
+    path = _entry_path(key)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        _bump_stat("misses")
+        return None
+
+    if time.time() - entry.get("created_at", 0) > ttl:
+        path.unlink(missing_ok=True)
+        _bump_stat("misses")
+        return None
+
+    # The mtime doubles as the last-used time for LRU eviction
+    with contextlib.suppress(OSError):
+        os.utime(path)
+    _bump_stat("hits")
+    return {"response": entry.get("result", {}).get("response"), "session_id": None}
+
+
+def put_cached(
+    key: str,
+    result: dict[str, Any],
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> None:
+    """Cache a result and evict least recently used entries over the limits."""
+    entry = {
+        "created_at": time.time(),
+        # Only what is needed to answer again; the raw output can be large
+        "result": {"response": result.get("response")},
+    }
+    atomic_write_json(_entry_path(key), entry)
+
+    evict(max_entries, max_bytes)
+
+
+def evict(max_entries: int, max_bytes: int) -> int:
+    """Remove least recently used entries until under both limits."""
+    entries = []
+    for path in _iter_entries():
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total_bytes = sum(size for _, size, _ in entries)
+    if len(entries) <= max_entries and total_bytes <= max_bytes:
+        return 0
+
+    entries.sort()
+    removed = 0
+    for _, size, path in entries:
+        if len(entries) - removed <= max_entries and total_bytes <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total_bytes -= size
+        removed += 1
+    return removed
+
+
+def cache_stats() -> dict[str, Any]:
+    """Get entry count, size and hit/miss counters."""
+    entries = _iter_entries()
+    total_bytes = 0
+    for path in entries:
+        try:
+            total_bytes += path.stat().st_size
+        except OSError:
+            continue
+    try:
+        with open(get_cache_dir() / "stats.json", encoding="utf-8") as f:
+            counters = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        counters = {}
+    return {
+        "entries": len(entries),
+        "bytes": total_bytes,
+        "hits": counters.get("hits", 0),
+        "misses": counters.get("misses", 0),
+    }
+
+
+def clear_cache() -> int:
+    """Remove every cache entry and reset the counters. Returns entries removed."""
+    entries = _iter_entries()
+    for path in entries:
+        path.unlink(missing_ok=True)
+    (get_cache_dir() / "stats.json").unlink(missing_ok=True)
+    return len(entries)
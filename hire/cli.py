@@ -1,17 +1,59 @@
 """CLI entry point."""
 
-import argparse
+import os
 import sys
 
-from . import __version__
-from .commands import run_ask, run_delete, run_doctor, run_sessions, run_show
+from . import __version__, commands, timing
 
-
-SUBCOMMANDS = {"sessions", "show", "delete", "doctor", "help", "--help", "-h", "--version"}
+SUBCOMMANDS = {
+    "sessions", "show", "delete", "doctor", "migrate", "batch", "mr", "map-reduce", "cache", "gc",
+    "stats", "serve", "help", "--help", "-h", "--version",
+}
 
 
 def main() -> int:
     """Main entry point."""
+    timing.mark_start()
+    # HIRE_PROFILE=out.prof writes a cProfile dump; any other path gets span timings
+    profile_path = os.environ.get("HIRE_PROFILE")
+    if profile_path:
+        return run_profiled(profile_path)
+    return _main()
+
+
+def run_profiled(path: str) -> int:
+    """Run the CLI and write a profile to path.
+
+    A path ending in .prof or .pstats gets a cProfile dump (open it with
+    pstats or snakeviz); any other path gets the span timings as JSON.
+    """
+    if path.endswith((".prof", ".pstats")):
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(_main)
+        finally:
+            profiler.dump_stats(path)
+
+    import json
+
+    try:
+        return _main()
+    finally:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"argv": sys.argv[1:], "timings": timing.get_timings()}, f, indent=2)
+
+
+def _main() -> int:
+    """Parse arguments and dispatch to a command."""
+    # Fast path: answer without loading argparse or any command module
+    if sys.argv[1:] == ["--version"]:
+        print(f"hire {__version__}")
+        return 0
+
+    import argparse
+
     # Ensure UTF-8 output on Windows
     if sys.platform == "win32" and hasattr(sys.stdout, "reconfigure"):
         sys.stdout.reconfigure(encoding="utf-8", errors="replace")
@@ -48,6 +90,30 @@ def main() -> int:
         action="store_true",
         help="Output in JSON format",
     )
+    sessions_parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Output one JSON object per line, as sessions are read",
+    )
+    sessions_parser.add_argument(
+        "--limit",
+        type=int,
+        help="Show at most N sessions",
+    )
+    sessions_parser.add_argument(
+        "--offset",
+        type=int,
+        help="Skip the N most recent sessions",
+    )
+    sessions_parser.add_argument(
+        "--since",
+        help="Only sessions updated within a duration (e.g. 24h, 7d) or since a date",
+    )
+    sessions_parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="Rebuild the session index before listing",
+    )
 
     # show command
     show_parser = subparsers.add_parser("show", help="Show session details")
@@ -60,6 +126,22 @@ def main() -> int:
         action="store_true",
         help="Output in JSON format",
     )
+    show_parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Show the session's transcript",
+    )
+    show_parser.add_argument(
+        "--tail",
+        type=int,
+        metavar="N",
+        help="Show the last N turns of the transcript",
+    )
+    show_parser.add_argument(
+        "--turns",
+        metavar="A:B",
+        help="Show turns A to B of the transcript (e.g. 3:5, 3:, :5 or 4)",
+    )
 
     # delete command
     delete_parser = subparsers.add_parser("delete", help="Delete a session")
@@ -73,6 +155,21 @@ def main() -> int:
         action="store_true",
         help="Delete all sessions",
     )
+    delete_parser.add_argument(
+        "--agent",
+        choices=["claude", "codex", "gemini"],
+        help="Only delete sessions of this agent",
+    )
+    delete_parser.add_argument(
+        "--older-than",
+        metavar="AGE",
+        help="Only delete sessions not updated for AGE (e.g. 30m, 12h, 7d, 2w)",
+    )
+    delete_parser.add_argument(
+        "--name-glob",
+        metavar="PATTERN",
+        help="Only delete sessions whose name matches PATTERN (e.g. 'ci-*')",
+    )
     delete_parser.add_argument(
         "-f", "--force",
         action="store_true",
@@ -80,7 +177,145 @@ def main() -> int:
     )
 
     # doctor command
-    subparsers.add_parser("doctor", help="Check environment and agent availability")
+    doctor_parser = subparsers.add_parser(
+        "doctor", help="Check environment and agent availability"
+    )
+    doctor_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Forget cached agent executable paths and look them up again",
+    )
+
+    # batch command
+    batch_parser = subparsers.add_parser("batch", help="Run a JSONL file of prompts")
+    batch_parser.add_argument(
+        "file",
+        help="JSONL file with one job per line ('-' for stdin)",
+    )
+    batch_parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        help="Number of jobs to run concurrently (default: 4)",
+    )
+    batch_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore progress saved by an interrupted run",
+    )
+
+    # map-reduce command
+    mr_parser = subparsers.add_parser(
+        "mr", aliases=["map-reduce"], help="Run an instruction over input too large for one prompt"
+    )
+    mr_parser.add_argument("agent", help="Target agent: claude, codex, or gemini")
+    mr_parser.add_argument("instruction", help="Instruction to run on each chunk")
+    mr_parser.add_argument(
+        "files",
+        nargs="*",
+        help="Files to process (default: read stdin)",
+    )
+    mr_parser.add_argument(
+        "--split",
+        choices=["lines", "files", "hunks"],
+        help="Chunk boundaries (default: hunks for a diff, otherwise lines)",
+    )
+    mr_parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        help="Approximate tokens per chunk (default: 20000)",
+    )
+    mr_parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        help="Number of chunks to run concurrently (default: 4)",
+    )
+    mr_parser.add_argument("-m", "--model", help="Model to use")
+    mr_parser.add_argument("-n", "--name", help="Name the session of the final answer")
+    mr_parser.add_argument(
+        "--reduce",
+        help="Prompt for combining answers ({count} and {instruction} are filled in)",
+    )
+    mr_parser.add_argument("--json", action="store_true", help="Output in JSON format")
+    mr_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore progress saved by an interrupted run",
+    )
+
+    # cache command
+    cache_parser = subparsers.add_parser("cache", help="Show or clear the response cache")
+    cache_parser.add_argument(
+        "action",
+        nargs="?",
+        choices=["stats", "clear"],
+        default="stats",
+        help="Action (default: stats)",
+    )
+    cache_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output in JSON format",
+    )
+
+    # gc command
+    gc_parser = subparsers.add_parser(
+        "gc", help="Archive sessions expired by the retention policy"
+    )
+    gc_parser.add_argument(
+        "-n", "--dry-run",
+        action="store_true",
+        help="Show what would be archived without changing anything",
+    )
+
+    # stats command
+    stats_parser = subparsers.add_parser("stats", help="Show agent latency and throughput")
+    stats_parser.add_argument(
+        "target",
+        nargs="?",
+        choices=["claude", "codex", "gemini"],
+        help="Filter by agent",
+    )
+    stats_parser.add_argument(
+        "--since",
+        metavar="AGE",
+        help="Only include calls from the last AGE (e.g. 1h, 7d)",
+    )
+    stats_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output in JSON format",
+    )
+
+    # serve command
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a daemon that keeps agent processes warm"
+    )
+    serve_parser.add_argument(
+        "--idle",
+        type=int,
+        metavar="N",
+        help="Idle workers to keep per agent (default: 1)",
+    )
+    serve_parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Show whether the daemon is running and its worker counts",
+    )
+    serve_parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop a running daemon",
+    )
+
+    # migrate command
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="Copy sessions to another storage backend and switch to it"
+    )
+    migrate_parser.add_argument(
+        "backend",
+        choices=["json", "sqlite"],
+        help="Storage backend to migrate to",
+    )
 
     args = parser.parse_args()
 
@@ -90,13 +325,27 @@ def main() -> int:
 
     # Dispatch to command handlers
     if args.command == "sessions":
-        return run_sessions(args)
+        return commands.run_sessions(args)
     elif args.command == "show":
-        return run_show(args)
+        return commands.run_show(args)
     elif args.command == "delete":
-        return run_delete(args)
+        return commands.run_delete(args)
     elif args.command == "doctor":
-        return run_doctor(args)
+        return commands.run_doctor(args)
+    elif args.command == "batch":
+        return commands.run_batch(args)
+    elif args.command in ("mr", "map-reduce"):
+        return commands.run_mapreduce(args)
+    elif args.command == "cache":
+        return commands.run_cache(args)
+    elif args.command == "gc":
+        return commands.run_gc(args)
+    elif args.command == "stats":
+        return commands.run_stats(args)
+    elif args.command == "migrate":
+        return commands.run_migrate(args)
+    elif args.command == "serve":
+        return commands.run_serve(args)
     else:
         print_usage()
         return 1
@@ -104,6 +353,8 @@ def main() -> int:
 
 def run_default() -> int:
     """Run the default hire action."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="hire",
         description="Hire AI agents to do tasks",
@@ -112,7 +363,7 @@ def run_default() -> int:
     parser.add_argument(
         "target",
         nargs="?",
-        help="Target agent: claude, codex, or gemini",
+        help="Target agent: claude, codex, or gemini (comma-separate to ask several)",
     )
     parser.add_argument(
         "message",
@@ -142,6 +393,36 @@ def run_default() -> int:
         action="store_true",
         help="Output in JSON format",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the response as it arrives",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Use the response cache for this call",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the response cache",
+    )
+    parser.add_argument(
+        "--pack",
+        action="store_true",
+        help="Fit piped input to the agent's context window",
+    )
+    parser.add_argument(
+        "--no-pack",
+        action="store_true",
+        help="Send piped input in full even if packing is enabled",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print where the call spent its time to stderr (and in --json)",
+    )
     parser.add_argument(
         "--clip",
         action="store_true",
@@ -154,7 +435,7 @@ def run_default() -> int:
     )
 
     args = parser.parse_args()
-    return run_ask(args)
+    return commands.run_ask(args)
 
 
 def print_usage():
@@ -163,12 +444,25 @@ def print_usage():
 
 Usage:
   hire <target> <message>      Hire an agent to do a task
+  hire <t1>,<t2> <message>     Ask several agents concurrently
   hire -s <session> <message>  Continue a specific session
-  hire sessions [target]       List sessions
+  hire sessions [target]       List sessions (--jsonl, --limit, --offset, --since)
   hire show <name-or-id>       Show session details
+                               (--history, --tail N, --turns A:B)
   hire delete <name-or-id>     Delete a session
   hire delete --all            Delete all sessions
-  hire doctor                  Check environment
+  hire delete --older-than 7d  Delete sessions matching filters
+                               (--agent, --older-than, --name-glob)
+  hire batch <file> [-j N]     Run a JSONL file of prompts concurrently
+  hire mr <target> <instr>     Map-reduce piped input or files too large
+                               for one prompt (--split lines|files|hunks)
+  hire cache [stats|clear]     Show or clear the response cache
+  hire stats [target]          Show latency, error rate and calls per hour
+  hire gc [--dry-run]          Archive sessions expired by retention policy
+  hire serve                   Keep agent processes warm for faster turns
+                               (--status, --stop)
+  hire doctor [--refresh]      Check environment
+  hire migrate <backend>       Move sessions to json or sqlite storage
 
 Targets:
   claude, codex, gemini
@@ -179,6 +473,12 @@ Options:
   -n, --name NAME    Name the session
   -m, --model MODEL  Specify model
   --json             Output in JSON format
+  --stream           Print the response as it arrives
+  --cache            Use the response cache for this call
+  --no-cache         Bypass the response cache
+  --pack             Fit piped input to the agent's context window
+  --no-pack          Send piped input in full even if packing is enabled
+  --timings          Print a per-phase timing breakdown to stderr
   --clip             Copy output to clipboard
   -o, --out FILE     Write output to file
 
@@ -186,6 +486,7 @@ Examples:
   hire codex "Design a REST API"
   hire gemini "Research React 19 features" --json
   hire -s abc123 "Tell me more"
+  hire claude,codex,gemini "Review this design" --json
   hire sessions codex
 """)
 
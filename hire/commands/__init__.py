@@ -1,9 +1,64 @@
-"""CLI commands."""
+"""CLI commands.
 
-from .ask import run_ask
-from .sessions import run_sessions
-from .show import run_show
-from .delete import run_delete
-from .doctor import run_doctor
+Each command module is imported only when its command is dispatched, which
+keeps short commands like `hire --version` and `hire sessions` fast.
+"""
 
-__all__ = ["run_ask", "run_sessions", "run_show", "run_delete", "run_doctor"]
+from importlib import import_module
+
+# Set without importing typing, which would slow down every hire command;
+# type checkers treat it as True
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .ask import run_ask
+    from .batch import run_batch
+    from .cache import run_cache
+    from .delete import run_delete
+    from .doctor import run_doctor
+    from .gc import run_gc
+    from .mapreduce import run_mapreduce
+    from .migrate import run_migrate
+    from .serve import run_serve
+    from .sessions import run_sessions
+    from .show import run_show
+    from .stats import run_stats
+
+# Command function -> module
+COMMANDS = {
+    "run_ask": "ask",
+    "run_batch": "batch",
+    "run_cache": "cache",
+    "run_mapreduce": "mapreduce",
+    "run_sessions": "sessions",
+    "run_show": "show",
+    "run_stats": "stats",
+    "run_delete": "delete",
+    "run_doctor": "doctor",
+    "run_gc": "gc",
+    "run_migrate": "migrate",
+    "run_serve": "serve",
+}
+
+
+def __getattr__(name: str) -> "Any":
+    if name in COMMANDS:
+        return getattr(import_module(f".{COMMANDS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "run_ask",
+    "run_batch",
+    "run_cache",
+    "run_delete",
+    "run_doctor",
+    "run_gc",
+    "run_mapreduce",
+    "run_migrate",
+    "run_serve",
+    "run_sessions",
+    "run_show",
+    "run_stats",
+]
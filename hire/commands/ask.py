@@ -2,31 +2,62 @@
 
 import json
 import sys
+import time
 from argparse import Namespace
+from pathlib import Path
+from typing import Any
 
-from ..adapters import get_adapter
+from ..adapters import AgentAdapter, get_adapter
+from ..cache import get_cache_config, get_cached, make_cache_key, put_cached
 from ..clipboard import copy_to_clipboard
+from ..config import get_adapter_config
+from ..daemon import wrap_adapter
+from ..metrics import record_call
+from ..packing import format_report, get_packing_config, pack_prompt
+from ..prompt_file import PromptFile, get_spill_threshold, spill_prompt
 from ..session import (
     create_session,
     find_session,
     get_latest_session,
-    list_sessions,
+    iter_sessions,
     save_session,
 )
+from ..timing import format_timings, get_timings, record, span
+from ..transcript import record_turn
 
+STDIN_SEPARATOR = "\n\n--- stdin ---\n"
 
-def read_stdin() -> str | None:
-    """Read from stdin if available (pipe/redirect)."""
+
+def read_prompt(message: str | None) -> str | PromptFile | None:
+    """Build the prompt from the message argument and stdin (pipe/redirect).
+
+    Piped input over the spill threshold is copied in chunks to a prompt
+    file instead of being read into memory.
+    """
     if sys.stdin.isatty():
-        return None
-    content = sys.stdin.read()
-    return content.strip() if content else None
+        return message
+    threshold = get_spill_threshold()
+    head = sys.stdin.buffer.read(threshold + 1)
+    if len(head) <= threshold:
+        stdin = head.decode("utf-8", errors="replace").strip()
+        return build_message(message, stdin or None)
+    parts = [head]
+    if message:
+        parts.insert(0, f"{message}{STDIN_SEPARATOR}".encode())
+    return spill_prompt(parts, sys.stdin.buffer)
+
+
+def use_packing(args: Namespace) -> bool:
+    """Whether to pack the prompt to the agent's context window (--pack, config)."""
+    if getattr(args, "no_pack", False):
+        return False
+    return getattr(args, "pack", False) or get_packing_config()["enabled"]
 
 
 def build_message(message: str | None, stdin: str | None) -> str | None:
     """Build the final message from args and stdin."""
     if message and stdin:
-        return f"{message}\n\n--- stdin ---\n{stdin}"
+        return f"{message}{STDIN_SEPARATOR}{stdin}"
     elif stdin:
         return stdin
     else:
@@ -38,29 +69,77 @@ VALID_TARGETS = {"claude", "codex", "gemini"}
 
 def run_ask(args: Namespace) -> int:
     """Run the ask command."""
+    show_timings = getattr(args, "timings", False)
+    # Filled in by _ask once an agent is called, for the metrics log
+    call: dict[str, Any] = {}
+    try:
+        return _ask(args, show_timings, call)
+    finally:
+        timings = get_timings()
+        if call:
+            agent_s = timings.get("subprocess")
+            record_call(
+                agent=call["agent"],
+                model=call["model"],
+                prompt_bytes=call["prompt_bytes"],
+                response_bytes=call.get("response_bytes", 0),
+                ok=call.get("ok", False),
+                agent_s=agent_s,
+                overhead_s=timings["total"] - (agent_s or 0.0) if "total" in timings else None,
+                cached=call.get("cached", False),
+            )
+        if show_timings:
+            print(format_timings(timings), file=sys.stderr)
+
+
+def _ask(args: Namespace, show_timings: bool, call: dict[str, Any]) -> int:
+    """Run the ask command (timed and recorded by run_ask)."""
     target = args.target
     arg_message = args.message
-    stdin_content = read_stdin()
-    continue_session = getattr(args, "continue_session", False)
-    session_id = args.session
-    name = args.name
-    model = args.model
-    output_json = args.json
-    copy_clip = getattr(args, "clip", False)
-    out_file = getattr(args, "out", None)
+    # Several comma-separated targets fan out to all of them concurrently
+    fanout = bool(target and "," in target)
 
     # Handle case where target is actually the message (when target is omitted)
     # e.g., "hire 'message'" -> target='message', message=None
-    if target and target not in VALID_TARGETS and arg_message is None:
+    if not fanout and target and target not in VALID_TARGETS and arg_message is None:
         arg_message = target
         target = None
 
     # Build final message from args and stdin
-    message = build_message(arg_message, stdin_content)
+    with span("stdin"):
+        message = read_prompt(arg_message)
+    try:
+        if fanout:
+            from .fanout import run_fanout
+            return run_fanout(args, target.split(","), message)
+        return _ask_single(args, target, message, show_timings, call)
+    finally:
+        if isinstance(message, PromptFile):
+            message.remove()
+
+
+def _ask_single(
+    args: Namespace,
+    target: str | None,
+    message: str | PromptFile | None,
+    show_timings: bool,
+    call: dict[str, Any],
+) -> int:
+    """Ask a single agent."""
+    continue_session = getattr(args, "continue_session", False)
+    session_id = args.session
+    name = args.name
+    model = args.model
+    output_json = args.json
+    # Streaming prints text as it arrives, which does not mix with a JSON document
+    stream_output = getattr(args, "stream", False) and not output_json
+    copy_clip = getattr(args, "clip", False)
+    out_file = getattr(args, "out", None)
 
     # Load config for defaults
     from ..config import load_config
-    config = load_config()
+    with span("config"):
+        config = load_config()
 
     # Determine which session to use
     cli_session_id = None
@@ -69,7 +148,8 @@ def run_ask(args: Namespace) -> int:
     if session_id:
         # Use specified session
         try:
-            existing_session = find_session(session_id)
+            with span("session_lookup"):
+                existing_session = find_session(session_id)
         except ValueError as e:
             print(f"Error: {e}", file=sys.stderr)
             return 1
@@ -84,7 +164,8 @@ def run_ask(args: Namespace) -> int:
     elif name:
         # Check if named session exists
         try:
-            existing_session = find_session(name)
+            with span("session_lookup"):
+                existing_session = find_session(name)
         except ValueError as e:
             print(f"Error: {e}", file=sys.stderr)
             return 1
@@ -99,17 +180,22 @@ def run_ask(args: Namespace) -> int:
         # Continue latest session
         if not target:
             # Try to find latest session across all agents
-            sessions = list_sessions()
-            if sessions:
-                existing_session = sessions[0]
+            with span("session_lookup"):
+                existing_session = next(iter_sessions(limit=1), None)
+            if existing_session:
                 target = existing_session.get("agent")
         else:
-            existing_session = get_latest_session(target)
-        
+            with span("session_lookup"):
+                existing_session = get_latest_session(target)
+
         if existing_session:
             cli_session_id = existing_session.get("cli_session_id")
         else:
-            print(f"Warning: No previous session found{' for ' + target if target else ''}, starting new session", file=sys.stderr)
+            print(
+                f"Warning: No previous session found{' for ' + target if target else ''}, "
+                "starting new session",
+                file=sys.stderr,
+            )
 
     # Fall back to default agent if not specified
     if not target:
@@ -128,16 +214,74 @@ def run_ask(args: Namespace) -> int:
 
     # Get the adapter for the target agent
     try:
-        adapter = get_adapter(target)
+        with span("adapter_load"):
+            adapter = wrap_adapter(get_adapter(target))
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
+    # Only new, unnamed sessions are cached: a resumed conversation depends on
+    # its history, and a named one is meant to be continued, which a cached
+    # answer (with no agent conversation behind it) cannot be
+    cache_config = get_cache_config()
+    use_cache = cache_config["enabled"] or getattr(args, "cache", False)
+    if getattr(args, "no_cache", False):
+        use_cache = False
+    cache_key = None
+    result = None
+    # Fit piped input to the agent's context window
+    packing = None
+    if use_packing(args):
+        with span("pack"):
+            message, packing = pack_prompt(message, target, model)
+        if packing:
+            print(format_report(packing), file=sys.stderr)
+
+    if isinstance(message, PromptFile):
+        prompt_file = message.path
+        prompt_bytes = message.size
+        # Stands in for the prompt in the cache key; the agent reads the file
+        message = f"<prompt sha256:{message.digest}>"
+    else:
+        prompt_file = None
+        prompt_bytes = len(message.encode("utf-8"))
+    call.update(agent=target, model=model, prompt_bytes=prompt_bytes)
+    if use_cache and not cli_session_id and not name:
+        cache_key = make_cache_key(
+            target, message, model, get_adapter_config(target).get("args", [])
+        )
+        with span("cache"):
+            result = get_cached(cache_key, ttl=cache_config["ttl"])
+        if result is not None:
+            print("(Cached response)", file=sys.stderr)
+            stream_output = False
+            call["cached"] = True
+
     # Call the agent
-    result = adapter.ask(message, session_id=cli_session_id, model=model)
+    if result is None:
+        if stream_output:
+            result = stream_response(
+                adapter, message, session_id=cli_session_id, model=model, prompt_file=prompt_file
+            )
+        else:
+            result = adapter.ask(
+                message, session_id=cli_session_id, model=model, prompt_file=prompt_file
+            )
+        if cache_key and not result.get("error"):
+            put_cached(
+                cache_key,
+                result,
+                max_entries=cache_config["max_entries"],
+                max_bytes=cache_config["max_bytes"],
+            )
+
+    call["ok"] = not result.get("error")
+    call["response_bytes"] = len((result.get("response") or "").encode("utf-8"))
 
     if result.get("error"):
         print(f"Error: {result['error']}", file=sys.stderr)
+        if result.get("attempts", 1) > 1:
+            print(f"(Gave up after {result['attempts']} attempts)", file=sys.stderr)
         if result.get("raw"):
             print(f"Raw output: {result['raw']}", file=sys.stderr)
         return 1
@@ -145,7 +289,9 @@ def run_ask(args: Namespace) -> int:
     # Get the new session ID from the response
     new_cli_session_id = result.get("session_id")
 
-    # Save or update session
+    # Save or update session; a cached answer starts none
+    save_start = time.perf_counter()
+    session = None
     if existing_session and cli_session_id:
         # Update existing session
         existing_session["cli_session_id"] = new_cli_session_id or cli_session_id
@@ -153,29 +299,79 @@ def run_ask(args: Namespace) -> int:
             existing_session["name"] = name
         save_session(existing_session)
         session = existing_session
-    else:
+    elif not call.get("cached"):
         # Create new session
         session = create_session(
             agent=target,
             cli_session_id=new_cli_session_id or "unknown",
             name=name,
         )
+    record("session_save", time.perf_counter() - save_start)
+
+    if session:
+        with span("transcript"):
+            try:
+                record_turn(session, message, result.get("response"), model)
+            except OSError as e:
+                print(f"Warning: Could not save transcript: {e}", file=sys.stderr)
 
     # Output
     if output_json:
         output = {
             "response": result.get("response"),
-            "session_id": session["id"],
-            "cli_session_id": session["cli_session_id"],
+            "session_id": session["id"] if session else None,
+            "cli_session_id": session["cli_session_id"] if session else None,
             "agent": target,
-            "name": session.get("name"),
+            "name": session.get("name") if session else None,
         }
+        if call.get("cached"):
+            output["cached"] = True
+        if packing:
+            output["packing"] = packing
+        # Extra CLI events the adapter was configured to capture (codex capture_events)
+        if "events" in result:
+            output["events"] = result["events"]
+        if show_timings:
+            output["timings"] = get_timings()
         output_text = json.dumps(output, indent=2, ensure_ascii=False)
     else:
         output_text = result.get("response", "")
 
-    print(output_text)
+    with span("output"):
+        # Streamed text has already been printed
+        if not stream_output:
+            print(output_text)
+        write_output(output_text, copy_clip, out_file)
+
+    return 0
+
+
+def stream_response(
+    adapter: AgentAdapter,
+    message: str,
+    session_id: str | None = None,
+    model: str | None = None,
+    prompt_file: Path | None = None,
+) -> dict[str, Any]:
+    """Print the agent's response as it arrives and return the final result."""
+    result: dict[str, Any] = {"response": None, "error": "No result from agent"}
+    printed = False
+    events = adapter.stream(message, session_id=session_id, model=model, prompt_file=prompt_file)
+    for event in events:
+        if event["type"] == "text":
+            sys.stdout.write(event["text"])
+            sys.stdout.flush()
+            printed = True
+        elif event["type"] == "result":
+            result = event["result"]
+    if printed:
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+    return result
+
 
+def write_output(output_text: str, copy_clip: bool, out_file: str | None) -> None:
+    """Copy output to the clipboard and/or write it to a file, as requested."""
     # Copy to clipboard if requested
     if copy_clip:
         if copy_to_clipboard(output_text):
@@ -191,5 +387,3 @@ def run_ask(args: Namespace) -> int:
             print(f"\n(Written to {out_file})", file=sys.stderr)
         except OSError as e:
             print(f"\n(Failed to write to {out_file}: {e})", file=sys.stderr)
-
-    return 0
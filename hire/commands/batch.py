@@ -0,0 +1,236 @@
+"""Batch command implementation."""
+
+import hashlib
+import json
+import sys
+import time
+from argparse import Namespace
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+from ..adapters import AgentAdapter, get_adapter
+from ..daemon import wrap_adapter
+from ..metrics import record_call
+from ..paths import ensure_dir, get_data_dir
+from ..process import kill_children_on_interrupt
+from ..session import create_session, find_session, save_session
+from ..transcript import record_turn
+from .ask import VALID_TARGETS
+
+DEFAULT_CONCURRENCY = 4
+
+# Job fields that may be left out or null, and are strings otherwise
+OPTIONAL_FIELDS = ("agent", "model", "session", "name")
+
+
+def get_batches_dir() -> Path:
+    """Get the directory holding batch checkpoints."""
+    return ensure_dir(get_data_dir() / "batches")
+
+
+def parse_jobs(lines: list[str]) -> list[dict[str, Any]]:
+    """Parse JSONL input into jobs. Invalid lines become jobs with an error."""
+    jobs = []
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("expected a JSON object")
+            if not job.get("message"):
+                raise ValueError("missing 'message'")
+            if not isinstance(job["message"], str):
+                raise ValueError("'message' must be a string")
+            for field in OPTIONAL_FIELDS:
+                if job.get(field) is not None and not isinstance(job[field], str):
+                    raise ValueError(f"'{field}' must be a string or null")
+        except ValueError as e:
+            job = {"error": f"Invalid job: {e}"}
+        job["index"] = index
+        jobs.append(job)
+    return jobs
+
+
+def _session_key(job: dict[str, Any]) -> str | None:
+    """Jobs that touch the same session must not run at the same time."""
+    return job.get("session") or job.get("name")
+
+
+def _ask(adapter: AgentAdapter, job: dict[str, Any], cli_session_id: str | None) -> dict[str, Any]:
+    """Run one job's agent call in a worker thread."""
+    start = time.monotonic()
+    try:
+        result = adapter.ask(job["message"], session_id=cli_session_id, model=job.get("model"))
+    except Exception as e:
+        result = {"response": None, "session_id": cli_session_id, "error": str(e)}
+    result["elapsed"] = time.monotonic() - start
+    return result
+
+
+def run_batch(args: Namespace) -> int:
+    """Run a JSONL file of prompts through a bounded worker pool.
+
+    Each input line is a job object with "message" and optional "agent",
+    "model", "session" (name or ID to continue) and "name" (name for a new
+    session). Results are written to stdout as JSONL in completion order,
+    tagged with the input line index. Successful results are checkpointed, so
+    re-running the same input after an interruption only runs what is left.
+    """
+    concurrency = max(1, args.jobs or DEFAULT_CONCURRENCY)
+
+    try:
+        data = sys.stdin.buffer.read() if args.file == "-" else Path(args.file).read_bytes()
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    from ..config import load_config
+    default_agent = load_config().get("defaults", {}).get("agent")
+
+    jobs = parse_jobs(data.decode("utf-8").splitlines())
+
+    # Checkpoint keyed by input content, so the same file resumes where it stopped
+    checkpoint_path = get_batches_dir() / f"{hashlib.sha256(data).hexdigest()}.jsonl"
+    if args.restart:
+        checkpoint_path.unlink(missing_ok=True)
+
+    done: dict[int, dict[str, Any]] = {}
+    if checkpoint_path.exists():
+        with open(checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    done[record["index"]] = record
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        if done:
+            print(f"(Resuming: {len(done)} job(s) already completed)", file=sys.stderr)
+
+    failed = 0
+
+    def emit(record: dict[str, Any]) -> None:
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    # Replay earlier results so the output always covers every job
+    for index in sorted(done):
+        emit(done[index])
+
+    pending = [job for job in jobs if job["index"] not in done]
+    adapters: dict[str, AgentAdapter] = {}
+    busy_keys: set[str] = set()
+    running: dict[Future[dict[str, Any]], tuple[dict[str, Any], dict[str, Any] | None]] = {}
+
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool, \
+            kill_children_on_interrupt(pool):
+
+        def fail(job: dict[str, Any], error: str) -> None:
+            nonlocal failed
+            failed += 1
+            emit({"index": job["index"], "agent": job.get("agent"), "error": error})
+
+        while pending or running:
+            # Submit jobs in input order, skipping any whose session is in use
+            for job in list(pending):
+                if len(running) >= concurrency:
+                    break
+                key = _session_key(job)
+                if key and key in busy_keys:
+                    continue
+                pending.remove(job)
+
+                if job.get("error"):
+                    fail(job, job["error"])
+                    continue
+
+                # Session lookups and saves stay on this thread
+                existing = None
+                if job.get("session"):
+                    try:
+                        existing = find_session(job["session"])
+                    except ValueError as e:
+                        fail(job, str(e))
+                        continue
+                    if not existing:
+                        fail(job, f"Session not found: {job['session']}")
+                        continue
+
+                agent = job.get("agent") or (existing or {}).get("agent") or default_agent
+                if agent not in VALID_TARGETS:
+                    fail(job, f"Unknown agent: {agent}")
+                    continue
+                job["agent"] = agent
+                if agent not in adapters:
+                    adapters[agent] = wrap_adapter(get_adapter(agent))
+
+                cli_session_id = existing.get("cli_session_id") if existing else None
+                if key:
+                    busy_keys.add(key)
+                future = pool.submit(_ask, adapters[agent], job, cli_session_id)
+                running[future] = (job, existing)
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job, existing = running.pop(future)
+                key = _session_key(job)
+                if key:
+                    busy_keys.discard(key)
+
+                result = future.result()
+                record_call(
+                    agent=job["agent"],
+                    model=job.get("model"),
+                    prompt_bytes=len(job["message"].encode("utf-8")),
+                    response_bytes=len((result.get("response") or "").encode("utf-8")),
+                    ok=not result.get("error"),
+                    agent_s=result["elapsed"],
+                    overhead_s=None,
+                )
+                if result.get("error"):
+                    fail(job, result["error"])
+                    continue
+
+                new_cli_session_id = result.get("session_id")
+                if existing:
+                    existing["cli_session_id"] = new_cli_session_id or existing["cli_session_id"]
+                    if job.get("name"):
+                        existing["name"] = job["name"]
+                    save_session(existing)
+                    session = existing
+                else:
+                    session = create_session(
+                        agent=job["agent"],
+                        cli_session_id=new_cli_session_id or "unknown",
+                        name=job.get("name"),
+                    )
+                try:
+                    record_turn(session, job["message"], result.get("response"), job.get("model"))
+                except OSError as e:
+                    print(f"Warning: Could not save transcript: {e}", file=sys.stderr)
+
+                record = {
+                    "index": job["index"],
+                    "agent": job["agent"],
+                    "response": result.get("response"),
+                    "session_id": session["id"],
+                    "cli_session_id": session["cli_session_id"],
+                    "name": session.get("name"),
+                    "elapsed": round(result["elapsed"], 3),
+                    "attempts": result.get("attempts", 1),
+                }
+                checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+                emit(record)
+
+    if failed:
+        print(f"Error: {failed} job(s) failed; re-run to retry them", file=sys.stderr)
+        return 1
+
+    # Everything finished, so a later run of the same input starts afresh
+    checkpoint_path.unlink(missing_ok=True)
+    return 0
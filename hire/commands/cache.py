@@ -0,0 +1,28 @@
+"""Cache command implementation."""
+
+import json
+from argparse import Namespace
+
+from ..cache import cache_stats, clear_cache, get_cache_config, get_cache_dir
+
+
+def run_cache(args: Namespace) -> int:
+    """Run the cache command (stats or clear)."""
+    if args.action == "clear":
+        removed = clear_cache()
+        print(f"Removed {removed} cached response(s)")
+        return 0
+
+    stats = cache_stats()
+    if getattr(args, "json", False):
+        print(json.dumps(stats, indent=2))
+        return 0
+
+    config = get_cache_config()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "-"
+    print(f"Cache:   {get_cache_dir()} ({'enabled' if config['enabled'] else 'disabled'})")
+    print(f"Entries: {stats['entries']} / {config['max_entries']}")
+    print(f"Size:    {stats['bytes'] / 1024:.1f} KiB / {config['max_bytes'] / 1024:.0f} KiB")
+    print(f"Hits:    {stats['hits']} ({hit_rate} of {lookups} lookups)")
+    return 0
@@ -2,8 +2,26 @@
 
 import sys
 from argparse import Namespace
+from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
+from typing import Any
 
-from ..session import delete_session, find_session, list_sessions
+from ..session import delete_session, delete_sessions, find_session, list_sessions
+from ..timeutil import parse_duration
+
+
+def filter_sessions(
+    sessions: list[dict[str, Any]],
+    older_than: timedelta | None = None,
+    name_glob: str | None = None,
+) -> list[dict[str, Any]]:
+    """Keep sessions last updated before now - older_than and named like name_glob."""
+    if older_than is not None:
+        cutoff = (datetime.now() - older_than).isoformat()
+        sessions = [s for s in sessions if s.get("updated_at", "") < cutoff]
+    if name_glob is not None:
+        sessions = [s for s in sessions if fnmatchcase(s.get("name") or "", name_glob)]
+    return sessions
 
 
 def run_delete(args: Namespace) -> int:
@@ -11,26 +29,37 @@ def run_delete(args: Namespace) -> int:
     name_or_id = getattr(args, "name_or_id", None)
     delete_all = getattr(args, "all", False)
     force = getattr(args, "force", False)
+    agent = getattr(args, "agent", None)
+    older_than = getattr(args, "older_than", None)
+    name_glob = getattr(args, "name_glob", None)
+
+    # Filters select sessions in bulk, like --all
+    if delete_all or agent or older_than or name_glob:
+        if name_or_id:
+            print("Error: Give a session name or ID, or --all/filters, not both", file=sys.stderr)
+            return 1
+
+        try:
+            age = parse_duration(older_than) if older_than else None
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
 
-    # Delete all sessions
-    if delete_all:
-        sessions = list_sessions()
+        sessions = filter_sessions(list_sessions(agent), older_than=age, name_glob=name_glob)
         if not sessions:
             print("No sessions to delete")
             return 0
 
         # Confirm deletion unless --force
         if not force:
-            print(f"Delete all {len(sessions)} session(s)?")
+            what = "all" if delete_all and not (agent or older_than or name_glob) else "matching"
+            print(f"Delete {what} {len(sessions)} session(s)?")
             response = input("Type 'yes' to confirm: ")
             if response.lower() != "yes":
                 print("Cancelled")
                 return 0
 
-        deleted = 0
-        for session in sessions:
-            if delete_session(session):
-                deleted += 1
+        deleted = delete_sessions(sessions)
 
         print(f"Deleted {deleted} session(s)")
         return 0
@@ -1,11 +1,14 @@
 """Doctor command implementation."""
 
-import shutil
 import sys
 from argparse import Namespace
 
 from .. import __version__
+from ..executables import clear_executable_cache, resolve_executable
+from ..limiter import limiter_status
 from ..paths import get_config_path, get_sessions_dir
+from ..session import count_sessions
+from ..store import get_store_name
 
 
 AGENTS = {
@@ -21,12 +24,15 @@ def run_doctor(args: Namespace) -> int:
     print(f"Python {sys.version.split()[0]}")
     print()
 
+    if getattr(args, "refresh", False):
+        clear_executable_cache()
+
     # Check agents
     print("Checking agents...")
     found = 0
     missing = 0
     for name, cmd in AGENTS.items():
-        path = shutil.which(cmd)
+        path = resolve_executable(cmd)
         if path:
             print(f"  \u2713 {name} - {path}")
             found += 1
@@ -44,10 +50,29 @@ def run_doctor(args: Namespace) -> int:
         print(f"  - Config: {config_path} (not created yet, using defaults)")
 
     sessions_dir = get_sessions_dir()
-    session_count = sum(1 for _ in sessions_dir.rglob("*.json"))
+    session_count = count_sessions()
     print(f"  \u2713 Sessions: {sessions_dir} ({session_count} sessions)")
+    print(f"  \u2713 Storage: {get_store_name()}")
     print()
 
+    # Host-wide limits, for agents that have them
+    statuses = {name: limiter_status(name) for name in AGENTS}
+    limited = {
+        name: status for name, status in statuses.items()
+        if status["max_concurrent"] is not None or status["rate_per_minute"] is not None
+    }
+    if limited:
+        print("Checking limits...")
+        for name, status in limited.items():
+            limits = []
+            if status["max_concurrent"] is not None:
+                limits.append(f"max {status['max_concurrent']} at once")
+            if status["rate_per_minute"] is not None:
+                limits.append(f"{status['rate_per_minute']}/min")
+            print(f"  - {name}: {status['running']} running, {status['waiting']} queued "
+                  f"({', '.join(limits)})")
+        print()
+
     # Summary
     if missing == 0:
         print("All good!")
@@ -0,0 +1,167 @@
+"""Fan-out implementation: one prompt to several agents concurrently."""
+
+import json
+import sys
+import time
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from ..adapters import get_adapter
+from ..daemon import wrap_adapter
+from ..metrics import record_call
+from ..packing import format_report, get_packing_config, get_token_budget, pack_prompt
+from ..process import kill_children_on_interrupt
+from ..prompt_file import PromptFile
+from ..session import create_session
+from ..transcript import record_turn
+from .ask import VALID_TARGETS, use_packing, write_output
+
+
+def _ask_agent(
+    agent: str,
+    message: str,
+    model: str | None,
+    prompt_file: Path | None,
+) -> dict[str, Any]:
+    """Ask one agent in a worker thread and time the call."""
+    start = time.monotonic()
+    try:
+        adapter = wrap_adapter(get_adapter(agent))
+        result = adapter.ask(message, model=model, prompt_file=prompt_file)
+    except Exception as e:
+        # One agent failing must not sink the others
+        result = {"response": None, "session_id": None, "error": str(e)}
+    result["elapsed"] = time.monotonic() - start
+    return result
+
+
+def run_fanout(
+    args: Namespace,
+    targets: list[str],
+    message: str | PromptFile | None,
+) -> int:
+    """Send one message to several agents at once.
+
+    Each agent runs in its own thread; the threads spend their time waiting on
+    the agent subprocess, so the wall time is that of the slowest agent.
+    Every successful answer is saved as a new session. A prompt file is
+    shared: each agent opens it for reading separately.
+    """
+    name = args.name
+    model = args.model
+    output_json = args.json
+    copy_clip = getattr(args, "clip", False)
+    out_file = getattr(args, "out", None)
+
+    targets = [t.strip() for t in targets if t.strip()]
+    # Preserve order, drop duplicates
+    targets = list(dict.fromkeys(targets))
+
+    unknown = [t for t in targets if t not in VALID_TARGETS]
+    if unknown:
+        print(f"Error: Unknown agent(s): {', '.join(unknown)}", file=sys.stderr)
+        return 1
+
+    if getattr(args, "continue_session", False) or args.session:
+        print("Error: -c/-s cannot be combined with multiple targets", file=sys.stderr)
+        return 1
+
+    if not message:
+        print("Error: Message is required", file=sys.stderr)
+        print("Usage: hire <target>,<target> <message>", file=sys.stderr)
+        return 1
+
+    packing = None
+    if use_packing(args):
+        # One prompt for all, so it must fit the smallest budget
+        config = get_packing_config()
+        smallest = min(targets, key=lambda agent: get_token_budget(config, agent, model))
+        message, packing = pack_prompt(message, smallest, model, config)
+        if packing:
+            print(format_report(packing), file=sys.stderr)
+
+    if isinstance(message, PromptFile):
+        transcript_prompt = f"<prompt sha256:{message.digest}>"
+        prompt_file, prompt_bytes, message = message.path, message.size, ""
+    else:
+        transcript_prompt = message
+        prompt_file, prompt_bytes = None, len(message.encode("utf-8"))
+
+    start = time.monotonic()
+    results: dict[str, dict[str, Any]] = {}
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool, kill_children_on_interrupt(pool):
+        futures = {
+            pool.submit(_ask_agent, agent, message, model, prompt_file): agent
+            for agent in targets
+        }
+        # Sessions are saved from this thread, as each agent finishes
+        for future in as_completed(futures):
+            agent = futures[future]
+            result = future.result()
+            record_call(
+                agent=agent,
+                model=model,
+                prompt_bytes=prompt_bytes,
+                response_bytes=len((result.get("response") or "").encode("utf-8")),
+                ok=not result.get("error"),
+                agent_s=result["elapsed"],
+                overhead_s=None,
+            )
+            if not result.get("error"):
+                session = create_session(
+                    agent=agent,
+                    cli_session_id=result.get("session_id") or "unknown",
+                    name=f"{name}-{agent}" if name else None,
+                )
+                result["session"] = session
+                try:
+                    record_turn(session, transcript_prompt, result.get("response"), model)
+                except OSError as e:
+                    print(f"Warning: Could not save transcript: {e}", file=sys.stderr)
+            results[agent] = result
+
+    elapsed = time.monotonic() - start
+
+    if output_json:
+        entries = []
+        for agent in targets:
+            result = results[agent]
+            session = result.get("session", {})
+            entries.append({
+                "agent": agent,
+                "response": result.get("response"),
+                "error": result.get("error"),
+                "session_id": session.get("id"),
+                "cli_session_id": session.get("cli_session_id"),
+                "name": session.get("name"),
+                "elapsed": round(result["elapsed"], 3),
+                "attempts": result.get("attempts", 1),
+            })
+            if "events" in result:
+                entries[-1]["events"] = result["events"]
+        output = {"results": entries, "elapsed": round(elapsed, 3)}
+        if packing:
+            output["packing"] = packing
+        output_text = json.dumps(output, indent=2, ensure_ascii=False)
+    else:
+        sections = []
+        for agent in targets:
+            result = results[agent]
+            header = f"=== {agent} ({result['elapsed']:.1f}s) ==="
+            if result.get("error"):
+                sections.append(f"{header}\nError: {result['error']}")
+            else:
+                sections.append(f"{header}\n{result.get('response', '')}")
+        output_text = "\n\n".join(sections)
+
+    print(output_text)
+    write_output(output_text, copy_clip, out_file)
+
+    failed = [agent for agent in targets if results[agent].get("error")]
+    if failed:
+        print(f"Error: {len(failed)} agent(s) failed: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,28 @@
+"""GC command implementation."""
+
+from argparse import Namespace
+
+from ..retention import collect_garbage, get_archive_dir, get_retention_config
+
+
+def run_gc(args: Namespace) -> int:
+    """Run the gc command (archive and delete sessions expired by retention)."""
+    dry_run = getattr(args, "dry_run", False)
+    policy = get_retention_config()
+
+    if policy["max_per_agent"] is None and policy["max_age_days"] is None:
+        print("No retention policy configured (set retention.max_per_agent or "
+              "retention.max_age_days in config.json)")
+        return 0
+
+    expired = collect_garbage(dry_run=dry_run)
+
+    if dry_run:
+        print(f"Would archive {len(expired)} session(s)")
+        for session in expired:
+            agent = session.get("agent", "")
+            updated = session.get("updated_at", "")[:19].replace("T", " ")
+            print(f"  {agent:<10} {session['id'][:8]}  {updated}")
+    else:
+        print(f"Archived {len(expired)} session(s) to {get_archive_dir()}")
+    return 0
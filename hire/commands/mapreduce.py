@@ -0,0 +1,432 @@
+"""Map-reduce command implementation.
+
+Input too large for one prompt is split into chunks on line, file or diff
+hunk boundaries. The instruction runs over every chunk concurrently (map),
+and the partial answers are combined by a final reduce prompt. When the
+answers are themselves too long for one prompt, they are reduced in groups
+first, level by level.
+
+Every answer is checkpointed under mapreduce/ in the data directory, keyed by
+the input and settings, so re-running after a failure only redoes the calls
+that failed.
+"""
+
+import hashlib
+import io
+import json
+import sys
+import time
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from ..adapters import AgentAdapter, get_adapter
+from ..config import load_config
+from ..daemon import wrap_adapter
+from ..metrics import record_call
+from ..packing import CHARS_PER_TOKEN
+from ..paths import ensure_dir, get_data_dir
+from ..process import kill_children_on_interrupt
+from ..prompt_file import get_spill_threshold, spill_prompt
+from ..session import create_session
+from ..transcript import record_turn
+from .ask import VALID_TARGETS
+
+DEFAULT_CHUNK_TOKENS = 20_000
+DEFAULT_CONCURRENCY = 4
+
+# Each reduce level at least halves the answers, so this covers about a
+# million chunks; more levels means the answers are not shrinking
+MAX_REDUCE_LEVELS = 20
+
+REDUCE_PROMPT = (
+    "The input was split into {count} parts and the task below was run on each "
+    "part separately. Combine the partial answers that follow into a single "
+    "answer to the task, as if the whole input had been processed at once: "
+    "merge duplicates and keep every distinct finding.\n\nTask: {instruction}"
+)
+
+# A piece of input: a header repeated at the top of each chunk it lands in
+# (the file name or diff header), and the text itself
+Piece = tuple[str, str]
+
+
+def get_mapreduce_config() -> dict[str, Any]:
+    """Get the map-reduce settings from config, with defaults filled in."""
+    config = load_config().get("mapreduce", {})
+    return {
+        "chunk_tokens": config.get("chunk_tokens", DEFAULT_CHUNK_TOKENS),
+        "concurrency": config.get("concurrency", DEFAULT_CONCURRENCY),
+        "reduce_prompt": config.get("reduce_prompt", REDUCE_PROMPT),
+    }
+
+
+def get_mapreduce_dir() -> Path:
+    """Get the directory holding map-reduce checkpoints."""
+    return ensure_dir(get_data_dir() / "mapreduce")
+
+
+def fill_reduce_prompt(template: str, count: int, instruction: str) -> str:
+    """Fill {count} and {instruction} into a reduce prompt.
+
+    Plain replacement rather than str.format, so other braces in the
+    template and braces in the instruction are left as they are.
+    """
+    return template.replace("{count}", str(count)).replace("{instruction}", instruction)
+
+
+def is_diff(text: str) -> bool:
+    """Whether text looks like a unified diff."""
+    return text.startswith(("diff ", "--- ")) or "\ndiff --git " in text
+
+
+def split_lines(text: str) -> list[Piece]:
+    """Split text into lines."""
+    return [("", line) for line in text.splitlines(keepends=True)]
+
+
+def split_diff(text: str, by_hunk: bool) -> list[Piece]:
+    """Split a unified diff into files, or into hunks headed by their file's header.
+
+    Text with no hunk under it, like the commit message git show prints
+    before the first file or a binary file's header, is a piece of its own.
+    """
+    pieces: list[Piece] = []
+    header: list[str] = []
+    body: list[str] = []
+    in_header = True
+    has_hunks = False
+
+    def flush() -> None:
+        if body:
+            pieces.append(("".join(header), "".join(body)))
+            body.clear()
+        elif in_header and header:
+            pieces.append(("", "".join(header)))
+
+    lines = text.splitlines(keepends=True)
+    for index, line in enumerate(lines):
+        # A file starts at "diff ...", or at "--- " + "+++ " in plain diff -u
+        # output; a removed "-- " line inside a hunk has no "+++ " after it
+        next_file = line.startswith("diff ") or (
+            not in_header
+            and line.startswith("--- ")
+            and index + 1 < len(lines)
+            and lines[index + 1].startswith("+++ ")
+        )
+        if next_file:
+            flush()
+            header.clear()
+            in_header = True
+        if line.startswith("@@"):
+            in_header = False
+            has_hunks = True
+            if by_hunk:
+                flush()
+        if in_header:
+            header.append(line)
+        else:
+            body.append(line)
+    flush()
+    if not has_hunks:
+        # No hunks at all, so not really a diff
+        return split_lines(text)
+    return pieces
+
+
+def split_files(paths: list[str]) -> list[Piece]:
+    """Read files into one piece each, headed by the file name."""
+    pieces = []
+    for path in paths:
+        text = Path(path).read_text(encoding="utf-8", errors="replace")
+        if text and not text.endswith("\n"):
+            text += "\n"
+        pieces.append((f"=== {path} ===\n", text))
+    return pieces
+
+
+def make_chunks(pieces: list[Piece], max_chars: int) -> list[str]:
+    """Group pieces into chunks of at most about max_chars.
+
+    A piece too large for a chunk of its own is cut on line boundaries (or
+    mid-line, for a single huge line), keeping its header on every part.
+    """
+    chunks: list[str] = []
+    parts: list[str] = []
+    size = 0
+    last_header = None
+
+    def flush() -> None:
+        nonlocal size, last_header
+        if parts:
+            chunks.append("".join(parts))
+            parts.clear()
+        size = 0
+        last_header = None
+
+    def add(header: str, text: str) -> None:
+        nonlocal size, last_header
+        extra = len(text) + (len(header) if header != last_header else 0)
+        if parts and size + extra > max_chars:
+            flush()
+            extra = len(header) + len(text)
+        if header != last_header:
+            parts.append(header)
+            last_header = header
+        parts.append(text)
+        size += extra
+
+    for header, text in pieces:
+        room = max(1, max_chars - len(header))
+        if len(text) <= room:
+            add(header, text)
+            continue
+        for line in text.splitlines(keepends=True):
+            for start in range(0, len(line), room):
+                add(header, line[start:start + room])
+    flush()
+    return chunks
+
+
+def _call(
+    adapter: AgentAdapter,
+    prompt: str,
+    model: str | None,
+) -> dict[str, Any]:
+    """Run one prompt in a worker thread; prompts too long for argv go through a file."""
+    start = time.monotonic()
+    prompt_file = None
+    try:
+        data = prompt.encode("utf-8")
+        if len(data) > get_spill_threshold():
+            prompt_file = spill_prompt([data], io.BytesIO())
+        result = adapter.ask(
+            prompt,
+            model=model,
+            prompt_file=prompt_file.path if prompt_file else None,
+        )
+    except Exception as e:
+        result = {"response": None, "session_id": None, "error": str(e)}
+    finally:
+        if prompt_file:
+            prompt_file.remove()
+    result["elapsed"] = time.monotonic() - start
+    return result
+
+
+def _read_input(args: Namespace) -> tuple[str, list[Piece], str] | None:
+    """Read the file list or stdin and split it; return (digest, pieces, mode)."""
+    split = args.split
+    if args.files:
+        if split not in (None, "files"):
+            print("Error: a file list is always split by files", file=sys.stderr)
+            return None
+        try:
+            pieces = split_files(args.files)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return None
+        return _digest(pieces), pieces, "files"
+
+    if sys.stdin.isatty():
+        print("Error: Input is required (pipe it in or list files)", file=sys.stderr)
+        print('Usage: hire mr <agent> "instruction" < input', file=sys.stderr)
+        return None
+    text = sys.stdin.buffer.read().decode("utf-8", errors="replace")
+    if split is None:
+        split = "hunks" if is_diff(text) else "lines"
+    if split == "lines" or not is_diff(text):
+        pieces = split_lines(text)
+        split = "lines"
+    else:
+        pieces = split_diff(text, by_hunk=split == "hunks")
+    return _digest(pieces), pieces, split
+
+
+def _digest(pieces: list[Piece]) -> str:
+    digest = hashlib.sha256()
+    for header, text in pieces:
+        digest.update(header.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def run_mapreduce(args: Namespace) -> int:
+    """Run an instruction over input too large for one prompt.
+
+    Map calls run on a pool of -j workers. Completed answers are appended to
+    a JSONL checkpoint as they arrive; the checkpoint is removed once the
+    final answer has been printed.
+    """
+    agent = args.agent
+    instruction = args.instruction
+    model = args.model
+
+    if agent not in VALID_TARGETS:
+        print(f"Error: Unknown agent: {agent}", file=sys.stderr)
+        return 1
+
+    config = get_mapreduce_config()
+    chunk_tokens = args.chunk_tokens or config["chunk_tokens"]
+    concurrency = max(1, args.jobs or config["concurrency"])
+    max_chars = max(1, chunk_tokens) * CHARS_PER_TOKEN
+    reduce_prompt = args.reduce or config["reduce_prompt"]
+
+    read = _read_input(args)
+    if read is None:
+        return 1
+    digest, pieces, split = read
+    chunks = make_chunks(pieces, max_chars)
+    if not chunks:
+        print("Error: Input is empty", file=sys.stderr)
+        return 1
+
+    # Checkpoint keyed by input and everything that shapes the answers
+    settings = json.dumps([digest, agent, model, instruction, split, chunk_tokens, reduce_prompt])
+    key = hashlib.sha256(settings.encode("utf-8")).hexdigest()
+    checkpoint_path = get_mapreduce_dir() / f"{key}.jsonl"
+    if args.restart:
+        checkpoint_path.unlink(missing_ok=True)
+
+    done: dict[str, dict[str, Any]] = {}
+    if checkpoint_path.exists():
+        with open(checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    done[record["id"]] = record
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        if done:
+            print(f"(Resuming: {len(done)} call(s) already completed)", file=sys.stderr)
+
+    print(f"(Split input by {split} into {len(chunks)} chunk(s))", file=sys.stderr)
+
+    adapter = wrap_adapter(get_adapter(agent))
+    start = time.monotonic()
+    calls = 0
+    failed = 0
+
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool, \
+            kill_children_on_interrupt(pool):
+
+        def run_all(prompts: dict[str, str]) -> dict[str, str] | None:
+            """Run prompts not yet checkpointed; return every answer, or None on failure."""
+            nonlocal calls, failed
+            answers = {
+                call_id: done[call_id]["response"] for call_id in prompts if call_id in done
+            }
+            futures = {
+                pool.submit(_call, adapter, prompt, model): call_id
+                for call_id, prompt in prompts.items()
+                if call_id not in done
+            }
+            for future in as_completed(futures):
+                call_id = futures[future]
+                result = future.result()
+                calls += 1
+                record_call(
+                    agent=agent,
+                    model=model,
+                    prompt_bytes=len(prompts[call_id].encode("utf-8")),
+                    response_bytes=len((result.get("response") or "").encode("utf-8")),
+                    ok=not result.get("error"),
+                    agent_s=result["elapsed"],
+                    overhead_s=None,
+                )
+                if result.get("error"):
+                    failed += 1
+                    print(f"Error: {call_id}: {result['error'].strip()}", file=sys.stderr)
+                    continue
+                record = {
+                    "id": call_id,
+                    "response": result.get("response") or "",
+                    "session_id": result.get("session_id"),
+                    "elapsed": round(result["elapsed"], 3),
+                }
+                done[call_id] = record
+                answers[call_id] = record["response"]
+                checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+            if failed:
+                return None
+            return {call_id: answers[call_id] for call_id in prompts}
+
+        count = len(chunks)
+        prompts = {
+            f"map-{index}": f"{instruction}\n\n--- part {index + 1} of {count} ---\n{chunk}"
+            for index, chunk in enumerate(chunks)
+        }
+        answers = run_all(prompts)
+
+        # Reduce in groups that fit a chunk until one answer is left
+        level = 0
+        stuck = False
+        while answers is not None and len(answers) > 1:
+            if level == MAX_REDUCE_LEVELS:
+                stuck = True
+                break
+            level += 1
+            task = fill_reduce_prompt(reduce_prompt, len(answers), instruction)
+            sections = [
+                f"\n\n--- answer for part {index + 1} of {len(answers)} ---\n{answer.strip()}\n"
+                for index, answer in enumerate(answers.values())
+            ]
+            groups = make_chunks([("", section) for section in sections], max_chars)
+            if len(groups) == len(sections) and len(groups) > 1:
+                # Answers each a chunk long: pair them up so every level shrinks
+                groups = ["".join(sections[i:i + 2]) for i in range(0, len(sections), 2)]
+            prompts = {
+                f"reduce-{level}-{index}": task + group for index, group in enumerate(groups)
+            }
+            answers = run_all(prompts)
+
+    if answers is None:
+        print(f"Error: {failed} call(s) failed; re-run to retry them", file=sys.stderr)
+        return 1
+    if stuck:
+        print(
+            f"Error: {len(answers)} answers left after {level} reduce levels; "
+            "the answers are not getting shorter (try a larger --chunk-tokens)",
+            file=sys.stderr,
+        )
+        return 1
+
+    final_id, response = next(iter(answers.items()))
+    # The final call's session can be continued with -c to ask follow-ups
+    session = None
+    cli_session_id = done[final_id].get("session_id")
+    if cli_session_id:
+        session = create_session(agent=agent, cli_session_id=cli_session_id, name=args.name)
+        # Prompts too long for argv went through a file, so record those by hash
+        prompt = prompts[final_id]
+        data = prompt.encode()
+        if len(data) > get_spill_threshold():
+            prompt = f"<prompt sha256:{hashlib.sha256(data).hexdigest()}>"
+        try:
+            record_turn(session, prompt, response, model)
+        except OSError as e:
+            print(f"Warning: Could not save transcript: {e}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps({
+            "agent": agent,
+            "response": response,
+            "split": split,
+            "chunks": len(chunks),
+            "reduce_levels": level,
+            "calls": calls,
+            "resumed": len(done) - calls,
+            "session_id": session["id"] if session else None,
+            "elapsed": round(time.monotonic() - start, 3),
+        }, ensure_ascii=False, indent=2))
+    else:
+        print(response)
+
+    # Everything finished, so a later run of the same input starts afresh
+    checkpoint_path.unlink(missing_ok=True)
+    return 0
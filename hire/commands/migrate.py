@@ -0,0 +1,33 @@
+"""Migrate command implementation."""
+
+import copy
+import sys
+from argparse import Namespace
+
+from ..config import load_config, save_config
+from ..session import migrate_sessions
+from ..store import get_store_name
+
+
+def run_migrate(args: Namespace) -> int:
+    """Run the migrate command (copy sessions to another storage backend)."""
+    target = args.backend
+    current = get_store_name()
+
+    if target == current:
+        print(f"Already using the {target} backend")
+        return 0
+
+    try:
+        count = migrate_sessions(target)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    # Switch the config over only once every session has been copied
+    config = copy.deepcopy(load_config())
+    config.setdefault("storage", {})["backend"] = target
+    save_config(config)
+
+    print(f"Migrated {count} session(s) from {current} to {target}")
+    return 0
@@ -0,0 +1,51 @@
+"""Serve command implementation."""
+
+import signal
+import socket
+import sys
+from argparse import Namespace
+
+from ..daemon import get_daemon_config, get_socket_path, send_command
+
+
+def _interrupt(signum: int, frame: object) -> None:
+    raise KeyboardInterrupt
+
+
+def run_serve(args: Namespace) -> int:
+    """Run the serve command (daemon in the foreground, --status or --stop)."""
+    if getattr(args, "status", False):
+        status = send_command("status")
+        if status is None:
+            print("hire daemon is not running")
+            return 1
+        print(f"hire daemon running (pid {status['pid']}) on {get_socket_path()}")
+        print(f"Idle workers:    {status['idle_workers']}")
+        print(f"Session workers: {status['session_workers']}")
+        print(f"Turns:           {status['warm_turns']} warm, {status['cold_turns']} cold")
+        return 0
+
+    if getattr(args, "stop", False):
+        if send_command("shutdown") is None:
+            print("hire daemon is not running")
+            return 1
+        print("hire daemon stopped")
+        return 0
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: hire serve needs Unix domain sockets", file=sys.stderr)
+        return 1
+
+    from ..server import serve
+
+    config = get_daemon_config()
+    idle_workers = args.idle if args.idle is not None else config["idle_workers"]
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        serve(idle_workers=idle_workers, max_workers=config["max_workers"])
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -1,38 +1,124 @@
 """Sessions command implementation."""
 
 import json
+import os
+import sys
 from argparse import Namespace
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from itertools import islice
+from typing import Any
 
-from ..session import list_sessions
+from ..session import iter_sessions, rebuild_index
+from ..timeutil import parse_duration
+
+# Encoder output pieces joined per write in --json output
+WRITE_BATCH = 4096
+
+
+def parse_since(value: str) -> str:
+    """Turn --since (a duration like 7d, or an ISO date/time) into an ISO timestamp."""
+    try:
+        return (datetime.now() - parse_duration(value)).isoformat()
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(
+            f"Invalid --since '{value}' (expected e.g. 12h, 7d or 2024-01-31)"
+        ) from None
+
+
+class _LazyList(list):
+    """A non-empty list for the JSON encoder whose items come from an iterator."""
+
+    def __init__(self, first: dict[str, Any], rest: Iterator[dict[str, Any]]) -> None:
+        super().__init__()
+        self.first = first
+        self.rest = rest
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        yield self.first
+        yield from self.rest
 
 
 def run_sessions(args: Namespace) -> int:
-    """Run the sessions command."""
+    """Run the sessions command.
+
+    Sessions are printed as they are read from the store, so the first lines
+    appear at once and --limit stops without reading the rest.
+    """
     target = args.target
     output_json = getattr(args, "json", False)
+    output_jsonl = getattr(args, "jsonl", False)
+    limit = getattr(args, "limit", None)
+    offset = getattr(args, "offset", None) or 0
 
-    sessions = list_sessions(agent=target)
+    if (limit is not None and limit < 0) or offset < 0:
+        print("Error: --limit and --offset must not be negative", file=sys.stderr)
+        return 1
 
-    if output_json:
-        print(json.dumps(sessions, indent=2, ensure_ascii=False))
-    else:
-        if not sessions:
-            if target:
-                print(f"No sessions found for {target}")
-            else:
-                print("No sessions found")
-            return 0
+    since = None
+    if getattr(args, "since", None):
+        try:
+            since = parse_since(args.since)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
 
-        # Print table header
-        print(f"{'AGENT':<10} {'NAME':<20} {'ID':<10} {'UPDATED':<20}")
-        print("-" * 62)
+    if getattr(args, "reindex", False):
+        rebuild_index()
 
-        for session in sessions:
-            agent = session.get("agent", "")
-            name = session.get("name", "-") or "-"
-            session_id = session.get("id", "")[:8]
-            updated = session.get("updated_at", "")[:19].replace("T", " ")
+    sessions = iter_sessions(agent=target, since=since, offset=offset, limit=limit)
 
-            print(f"{agent:<10} {name:<20} {session_id:<10} {updated:<20}")
+    try:
+        if output_jsonl:
+            for session in sessions:
+                print(json.dumps(session, ensure_ascii=False))
+        elif output_json:
+            # Same document as json.dumps(list, indent=2), encoded as sessions arrive
+            first = next(sessions, None)
+            if first is None:
+                print("[]")
+            else:
+                encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+                chunks = encoder.iterencode(_LazyList(first, sessions))
+                # The encoder yields tiny pieces; write them in batches
+                while batch := "".join(islice(chunks, WRITE_BATCH)):
+                    sys.stdout.write(batch)
+                print()
+        else:
+            print_table(sessions, target)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader (e.g. head) has all it wants; don't fail on the final flush
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
 
     return 0
+
+
+def print_table(sessions: Iterable[dict[str, Any]], target: str | None) -> None:
+    """Print sessions as a table."""
+    header = False
+    for session in sessions:
+        if not header:
+            print(f"{'AGENT':<10} {'NAME':<20} {'ID':<10} {'UPDATED':<20}")
+            print("-" * 62)
+            header = True
+
+        agent = session.get("agent", "")
+        name = session.get("name", "-") or "-"
+        session_id = session.get("id", "")[:8]
+        updated = session.get("updated_at", "")[:19].replace("T", " ")
+
+        print(f"{agent:<10} {name:<20} {session_id:<10} {updated:<20}")
+
+    if not header:
+        if target:
+            print(f"No sessions found for {target}")
+        else:
+            print("No sessions found")
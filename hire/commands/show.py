@@ -3,14 +3,60 @@
 import json
 import sys
 from argparse import Namespace
+from typing import Any
 
 from ..session import find_session
+from ..transcript import count_turns, read_turns
+
+
+def parse_turns(value: str) -> tuple[int, int | None]:
+    """Turn a 1-based inclusive range like 3:5, 3: or :5 (or one turn, 4) into slice bounds."""
+    start, sep, end = value.partition(":")
+    try:
+        first = int(start) if start else 1
+        last = int(end) if end else None
+        if not sep:
+            last = first
+    except ValueError:
+        raise ValueError(f"Invalid --turns '{value}' (expected e.g. 4, 3:5, 3: or :5)") from None
+    if first < 1 or (last is not None and last < first):
+        raise ValueError(f"Invalid --turns '{value}' (turns are numbered from 1)")
+    return first - 1, last
+
+
+def format_turn(turn: dict[str, Any]) -> str:
+    """Format one transcript turn for display."""
+    time = (turn.get("time") or "")[:19].replace("T", " ")
+    model = f", {turn['model']}" if turn.get("model") else ""
+    prompt = "\n".join(f"> {line}" for line in (turn.get("prompt") or "").splitlines())
+    return (
+        f"=== Turn {turn['turn']} ({time}{model}) ===\n"
+        f"{prompt}\n\n"
+        f"{turn.get('response') or ''}"
+    )
 
 
 def run_show(args: Namespace) -> int:
     """Run the show command."""
     name_or_id = args.name_or_id
     output_json = getattr(args, "json", False)
+    tail = getattr(args, "tail", None)
+    turns_range = getattr(args, "turns", None)
+    history = getattr(args, "history", False) or tail is not None or turns_range is not None
+
+    # Turns to read, as slice bounds; --tail seeks to the end of the transcript
+    start, stop = 0, None
+    if tail is not None:
+        if tail < 0:
+            print("Error: --tail must not be negative", file=sys.stderr)
+            return 1
+        start, stop = (-tail, None) if tail else (0, 0)
+    elif turns_range is not None:
+        try:
+            start, stop = parse_turns(turns_range)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
 
     try:
         session = find_session(name_or_id)
@@ -22,7 +68,11 @@ def run_show(args: Namespace) -> int:
         print(f"Error: Session not found: {name_or_id}", file=sys.stderr)
         return 1
 
+    turns = read_turns(session["id"], start, stop) if history else []
+
     if output_json:
+        if history:
+            session = {**session, "history": turns}
         print(json.dumps(session, indent=2, ensure_ascii=False))
     else:
         print(f"Session: {session.get('id')}")
@@ -31,5 +81,9 @@ def run_show(args: Namespace) -> int:
         print(f"CLI ID:  {session.get('cli_session_id')}")
         print(f"Created: {session.get('created_at')}")
         print(f"Updated: {session.get('updated_at')}")
+        print(f"Turns:   {count_turns(session['id'])}")
+        for turn in turns:
+            print()
+            print(format_turn(turn))
 
     return 0
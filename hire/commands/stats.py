@@ -0,0 +1,53 @@
+"""Stats command implementation."""
+
+import json
+import sys
+import time
+from argparse import Namespace
+
+from ..metrics import get_metrics_path, iter_records, summarize
+from ..timeutil import parse_duration
+
+
+def _format_seconds(value: float | None) -> str:
+    return f"{value:.2f}s" if value is not None else "-"
+
+
+def run_stats(args: Namespace) -> int:
+    """Run the stats command (latency and throughput from the metrics log)."""
+    target = args.target
+    output_json = getattr(args, "json", False)
+
+    since = None
+    if args.since:
+        try:
+            since = time.time() - parse_duration(args.since).total_seconds()
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    records = [
+        r for r in iter_records(since=since)
+        if target is None or r.get("agent") == target
+    ]
+    summary = summarize(records, since=since)
+
+    if output_json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    if not summary:
+        print(f"No calls recorded in {get_metrics_path()}")
+        return 0
+
+    print(f"{'AGENT':<10} {'CALLS':>7} {'ERR%':>6} {'CALLS/H':>8} "
+          f"{'P50':>8} {'P95':>8} {'P99':>8} {'OVERHEAD':>9}")
+    print("-" * 71)
+    for agent, stats in summary.items():
+        print(
+            f"{agent:<10} {stats['calls']:>7} {stats['error_rate'] * 100:>5.1f}% "
+            f"{stats['calls_per_hour']:>8.1f} {_format_seconds(stats['p50_s']):>8} "
+            f"{_format_seconds(stats['p95_s']):>8} {_format_seconds(stats['p99_s']):>8} "
+            f"{_format_seconds(stats['overhead_p50_s']):>9}"
+        )
+    return 0
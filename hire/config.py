@@ -4,6 +4,7 @@ import copy
 import json
 from typing import Any
 
+from .fileutil import atomic_write_json
 from .paths import get_config_path
 
 # Default configuration
@@ -27,31 +28,53 @@ DEFAULT_CONFIG = {
     },
     "defaults": {
         "agent": "claude"
+    },
+    "storage": {
+        "backend": "json"
     }
 }
 
 
+# Parsed config keyed by the config file's (mtime_ns, size)
+_config_cache: tuple[tuple[int, int], dict[str, Any]] | None = None
+
+
 def load_config() -> dict[str, Any]:
-    """Load configuration from file, or return defaults."""
+    """Load configuration from file, or return defaults.
+
+    The parsed file is cached for the life of the process and re-read only
+    when its mtime or size changes. The returned dict is shared: copy it
+    before modifying.
+    """
+    global _config_cache
     config_path = get_config_path()
-    if config_path.exists():
-        try:
-            with open(config_path, encoding="utf-8") as f:
-                return json.load(f)
-        except (OSError, json.JSONDecodeError):
-            # Fall back to defaults on error
-            pass
-    return copy.deepcopy(DEFAULT_CONFIG)
+    try:
+        stat = config_path.stat()
+    except OSError:
+        return copy.deepcopy(DEFAULT_CONFIG)
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _config_cache is not None and _config_cache[0] == key:
+        return _config_cache[1]
+
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            config: dict[str, Any] = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        # Fall back to defaults on error
+        config = copy.deepcopy(DEFAULT_CONFIG)
+    _config_cache = (key, config)
+    return config
 
 
 def save_config(config: dict[str, Any]) -> None:
     """Save configuration to file."""
-    config_path = get_config_path()
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    global _config_cache
+    atomic_write_json(get_config_path(), config, indent=2)
+    _config_cache = None
 
 
 def get_adapter_config(agent: str) -> dict[str, Any]:
     """Get configuration for a specific adapter."""
-    config = load_config()
-    return config.get("adapters", {}).get(agent, {})
+    adapter_config: dict[str, Any] = load_config().get("adapters", {}).get(agent, {})
+    return adapter_config
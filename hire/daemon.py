@@ -0,0 +1,231 @@
+"""Client side of the `hire serve` daemon.
+
+The daemon listens on a Unix socket in the data directory. Each connection
+carries one JSON request line and gets back JSON lines: stream() events for
+an ask, or a single reply for the other operations. An ask carries the
+client's cwd and environment, which the agent runs in.
+"""
+
+import json
+import os
+import socket
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import Any
+
+from .adapters.base import AgentAdapter
+from .config import load_config
+from .paths import get_data_dir
+from .process import get_call_policy
+from .timing import span
+
+SOCKET_FILENAME = "hire.sock"
+DEFAULT_IDLE_WORKERS = 1
+DEFAULT_MAX_WORKERS = 8
+
+# Seconds to wait for the daemon to accept a connection or answer a control request
+CONNECT_TIMEOUT = 5.0
+# Extra seconds a turn's reply may take beyond the agent's own time limits
+REPLY_GRACE = 10.0
+
+
+def get_daemon_config() -> dict[str, Any]:
+    """Get the daemon settings from config, with defaults filled in."""
+    config = load_config().get("daemon", {})
+    return {
+        "enabled": config.get("enabled", True),
+        "idle_workers": config.get("idle_workers", DEFAULT_IDLE_WORKERS),
+        "max_workers": config.get("max_workers", DEFAULT_MAX_WORKERS),
+    }
+
+
+def get_socket_path() -> Path:
+    """Get the daemon socket path (~/.local/share/hire/hire.sock)."""
+    return get_data_dir() / SOCKET_FILENAME
+
+
+def connect() -> socket.socket | None:
+    """Connect to a running daemon, or return None if there is none."""
+    path = get_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _exchange(sock: socket.socket, request: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Send one request and yield the daemon's reply lines until it hangs up."""
+    with sock, sock.makefile("r", encoding="utf-8") as reader:
+        sock.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+        for line in reader:
+            yield json.loads(line)
+
+
+def send_command(op: str) -> dict[str, Any] | None:
+    """Send a control operation (status, shutdown) and return the reply."""
+    sock = connect()
+    if sock is None:
+        return None
+    try:
+        return next(_exchange(sock, {"op": op}), None)
+    except (OSError, ValueError):
+        return None
+
+
+class DaemonAdapter(AgentAdapter):
+    """Forward prompts to a running daemon, or call the agent directly.
+
+    The connection is made per call, so one instance can be shared by
+    threads and a daemon that goes away mid-run only costs the warm start.
+    """
+
+    def __init__(self, adapter: AgentAdapter) -> None:
+        self.adapter = adapter
+        self.name = adapter.name
+
+    def _connect(self, model: str | None, prompt_file: Path | None) -> socket.socket | None:
+        """Connect for a turn the daemon can run warm, or return None to run it here.
+
+        Prompts in a file go straight to the agent: the daemon's workers take
+        prompts as single lines. So do agents without a worker mode, which
+        the daemon could only run as a normal subprocess.
+        """
+        if prompt_file or self.adapter.build_worker_command(None, model) is None:
+            return None
+        return connect()
+
+    def _reply_timeout(self) -> float | None:
+        """Longest the daemon may take over a turn, from the agent's policy.
+
+        The daemon enforces the policy itself; this only stops a client from
+        waiting forever on a daemon that hangs. None if the agent has no
+        time limits, as a direct call would have none either.
+        """
+        policy = get_call_policy(self.name)
+        if policy["deadline"] is not None:
+            return float(policy["deadline"]) + REPLY_GRACE
+        if policy["timeout"] is None:
+            return None
+        retries = policy["retries"]
+        return float(
+            policy["timeout"] * (retries + 1) + policy["max_backoff"] * retries + REPLY_GRACE
+        )
+
+    def ask(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> dict[str, Any]:
+        """Send a message through the daemon and get a response."""
+        sock = self._connect(model, prompt_file)
+        if sock is None:
+            return self.adapter.ask(
+                message, session_id=session_id, model=model, prompt_file=prompt_file
+            )
+
+        result: dict[str, Any] = {
+            "response": None,
+            "session_id": session_id,
+            "error": "No result from daemon",
+        }
+        for event in self._forward(sock, message, session_id, model):
+            if event["type"] == "result":
+                result = event["result"]
+        return result
+
+    def stream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Send a message through the daemon and yield events as they arrive."""
+        sock = self._connect(model, prompt_file)
+        if sock is None:
+            yield from self.adapter.stream(
+                message, session_id=session_id, model=model, prompt_file=prompt_file
+            )
+        else:
+            yield from self._forward(sock, message, session_id, model)
+
+    async def aask(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> dict[str, Any]:
+        """Asyncio callers run the agent directly, without the daemon."""
+        return await self.adapter.aask(
+            message, session_id=session_id, model=model, prompt_file=prompt_file
+        )
+
+    async def astream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        prompt_file: Path | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Asyncio callers run the agent directly, without the daemon."""
+        async for event in self.adapter.astream(
+            message, session_id=session_id, model=model, prompt_file=prompt_file
+        ):
+            yield event
+
+    def _forward(
+        self,
+        sock: socket.socket,
+        message: str,
+        session_id: str | None,
+        model: str | None,
+    ) -> Iterator[dict[str, Any]]:
+        """Run one turn on the daemon, always ending with a result event."""
+        request = {
+            "op": "ask",
+            "agent": self.name,
+            "message": message,
+            "session_id": session_id,
+            "model": model,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        }
+        reply_timeout = self._reply_timeout()
+        sock.settimeout(reply_timeout)
+        # The daemon's turn stands in for the agent subprocess in timings and metrics
+        with span("subprocess"):
+            try:
+                for event in _exchange(sock, request):
+                    yield event
+                    if event.get("type") == "result":
+                        return
+            except TimeoutError:
+                error = f"hire daemon did not answer within {reply_timeout:g}s"
+            except (OSError, ValueError) as e:
+                error = f"Lost connection to hire daemon: {e}"
+            else:
+                error = "hire daemon closed the connection without a result"
+        yield {"type": "result", "result": {
+            "response": None,
+            "session_id": session_id,
+            "error": error,
+            "raw": None,
+        }}
+
+
+def wrap_adapter(adapter: AgentAdapter) -> AgentAdapter:
+    """Route an adapter's calls through the daemon when one may be running."""
+    if os.environ.get("HIRE_NO_DAEMON") or not get_daemon_config()["enabled"]:
+        return adapter
+    if not get_socket_path().exists():
+        return adapter
+    return DaemonAdapter(adapter)
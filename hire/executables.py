@@ -0,0 +1,92 @@
+"""Cached resolution of agent executables on PATH."""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+from .fileutil import atomic_write_json
+from .paths import get_data_dir
+
+CACHE_FILENAME = "executables.json"
+
+# In-process copy of the cache file
+_cache: dict[str, Any] | None = None
+
+
+def _get_cache_path() -> Path:
+    """Get the executable cache path (~/.local/share/hire/executables.json)."""
+    return get_data_dir() / CACHE_FILENAME
+
+
+def _path_key() -> str:
+    """Hash of everything shutil.which consults besides the file system."""
+    search = os.environ.get("PATH", "") + "\0" + os.environ.get("PATHEXT", "")
+    return hashlib.sha256(search.encode("utf-8")).hexdigest()
+
+
+def _load_cache() -> dict[str, Any]:
+    """Load the cache, discarding it if PATH has changed since it was written."""
+    global _cache
+    if _cache is None:
+        try:
+            with open(_get_cache_path(), encoding="utf-8") as f:
+                _cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            _cache = {}
+    if not isinstance(_cache, dict) or _cache.get("path_key") != _path_key():
+        _cache = {"path_key": _path_key(), "entries": {}}
+    return _cache
+
+
+def _save_cache(cache: dict[str, Any]) -> None:
+    """Write the cache file atomically; a failure only costs a future lookup."""
+    with contextlib.suppress(OSError):
+        atomic_write_json(_get_cache_path(), cache)
+
+
+def resolve_executable(command: str) -> str | None:
+    """Resolve a command to its full path, like shutil.which, with a cache.
+
+    A cached path is trusted only while PATH is unchanged and the file still
+    exists with the same mtime, so a removed or replaced binary is looked up
+    again instead of failing the run. Misses are not cached, so a newly
+    installed agent is found right away.
+    """
+    # Paths with a directory part depend on the cwd, not PATH
+    if os.sep in command or (os.altsep and os.altsep in command):
+        return shutil.which(command)
+
+    cache = _load_cache()
+    entry = cache["entries"].get(command)
+    if entry:
+        try:
+            if os.stat(entry["path"]).st_mtime_ns == entry["mtime_ns"]:
+                return str(entry["path"])
+        except (OSError, KeyError, TypeError):
+            pass
+
+    resolved = shutil.which(command)
+    if resolved:
+        try:
+            cache["entries"][command] = {
+                "path": resolved,
+                "mtime_ns": os.stat(resolved).st_mtime_ns,
+            }
+            _save_cache(cache)
+        except OSError:
+            pass
+    elif entry:
+        del cache["entries"][command]
+        _save_cache(cache)
+    return resolved
+
+
+def clear_executable_cache() -> None:
+    """Forget every cached executable path."""
+    global _cache
+    _cache = None
+    _get_cache_path().unlink(missing_ok=True)
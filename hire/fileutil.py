@@ -0,0 +1,97 @@
+"""Crash- and concurrency-safe file helpers."""
+
+import json
+import os
+import sys
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TextIO
+
+
+def atomic_write_json(
+    path: Path,
+    data: Any,
+    indent: int | None = None,
+    fsync: bool = False,
+) -> os.stat_result:
+    """Write JSON to path so readers see either the old or the new file.
+
+    The data goes to a temporary file in the same directory, which then
+    replaces path with a single rename. With fsync, the file (and on POSIX
+    its directory) is flushed to disk before returning, so the write also
+    survives a power loss.
+
+    Returns the stat of the file as written, taken before the rename so it
+    cannot describe a file another process put in its place since.
+    """
+    return _atomic_write(
+        path, lambda f: json.dump(data, f, indent=indent, ensure_ascii=False), fsync
+    )
+
+
+def atomic_write_lines(path: Path, lines: Iterable[str], fsync: bool = False) -> os.stat_result:
+    """Write lines of text to path atomically, like atomic_write_json."""
+    return _atomic_write(path, lambda f: f.writelines(lines), fsync)
+
+
+def _atomic_write(
+    path: Path,
+    write: Callable[[TextIO], None],
+    fsync: bool,
+) -> os.stat_result:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        stat = os.stat(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    if fsync and sys.platform != "win32":
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return stat
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on path for the duration of the block.
+
+    The lock only coordinates code that also takes it; plain readers are
+    unaffected. It is released automatically if the process dies.
+    """
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            # LK_LOCK gives up after ~10 seconds; keep waiting like flock does
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
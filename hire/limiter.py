@@ -0,0 +1,221 @@
+"""Host-wide per-agent concurrency and rate limits.
+
+Every hire process on the host shares one small state file per agent
+(limits/<agent>.json in the data directory), guarded by a lock file. It
+holds a FIFO queue of waiting callers, the slots currently running and a
+token bucket. A caller gets a slot once it is at the head of the queue, a
+slot is free and a token is available, so waiting callers are served in
+arrival order instead of failing. Entries of processes that died are
+dropped, so a crash cannot leak a slot.
+
+Limits are set per agent under adapters.<agent> in config.json:
+
+    max_concurrent   calls running at once across the host (default: unlimited)
+    rate_per_minute  calls started per minute (default: unlimited)
+    burst            calls that may start back to back before the rate applies (default: 1)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from .config import get_adapter_config
+from .fileutil import atomic_write_json, file_lock
+from .paths import ensure_dir, get_data_dir
+
+# Longest pause between checks while queued
+POLL_INTERVAL = 0.1
+
+
+class SlotTimeoutError(Exception):
+    """Raised when no slot became free within the caller's time limit."""
+
+
+def get_limit_config(agent: str) -> dict[str, Any]:
+    """Get an agent's limits from config, with defaults filled in."""
+    config = get_adapter_config(agent)
+    return {
+        "max_concurrent": config.get("max_concurrent"),
+        "rate_per_minute": config.get("rate_per_minute"),
+        "burst": config.get("burst", 1),
+    }
+
+
+def _limited(limits: dict[str, Any]) -> bool:
+    return limits["max_concurrent"] is not None or limits["rate_per_minute"] is not None
+
+
+def get_limits_dir() -> Path:
+    """Get the directory holding limiter state (~/.local/share/hire/limits/)."""
+    return ensure_dir(get_data_dir() / "limits")
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process with this ID is running."""
+    if sys.platform == "win32":
+        import ctypes
+
+        # PROCESS_QUERY_LIMITED_INFORMATION; fails for processes that are gone
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        ctypes.windll.kernel32.CloseHandle(handle)
+        # STILL_ACTIVE
+        return exit_code.value == 259
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _state(agent: str) -> Iterator[dict[str, Any]]:
+    """Lock an agent's limiter state for reading and modification."""
+    limits_dir = get_limits_dir()
+    path = limits_dir / f"{agent}.json"
+    with file_lock(limits_dir / f"{agent}.lock"):
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            state = {}
+        state.setdefault("queue", [])
+        state.setdefault("running", {})
+        before = json.dumps(state, sort_keys=True)
+
+        # Forget callers whose process is gone
+        alive: dict[int, bool] = {}
+
+        def is_alive(entry: dict[str, Any]) -> bool:
+            pid = entry["pid"]
+            if pid not in alive:
+                alive[pid] = _pid_alive(pid)
+            return alive[pid]
+
+        state["queue"] = [entry for entry in state["queue"] if is_alive(entry)]
+        state["running"] = {
+            ticket: entry for ticket, entry in state["running"].items() if is_alive(entry)
+        }
+
+        yield state
+        if json.dumps(state, sort_keys=True) != before:
+            atomic_write_json(path, state)
+
+
+def _tokens(state: dict[str, Any], limits: dict[str, Any], now: float) -> float:
+    """Tokens in the bucket at now, counting those earned since the last acquire.
+
+    Only an acquire stores the bucket, so callers polling in line never
+    rewrite the state file.
+    """
+    burst = max(1, limits["burst"])
+    tokens = state.get("tokens", burst)
+    last = state.get("refilled_at", now)
+    return float(min(burst, tokens + max(0.0, now - last) * limits["rate_per_minute"] / 60))
+
+
+def acquire_slot(
+    agent: str,
+    timeout: float | None = None,
+    cancel: threading.Event | None = None,
+) -> str | None:
+    """Wait in line for a slot to call an agent and return its ticket.
+
+    Returns None right away if the agent has no limits. Raises SlotTimeoutError
+    if no slot came free within timeout seconds. Setting cancel gives up
+    the place in line (and returns None).
+    """
+    limits = get_limit_config(agent)
+    if not _limited(limits):
+        return None
+
+    ticket = uuid.uuid4().hex
+    entry = {"pid": os.getpid(), "since": time.time()}
+    with _state(agent) as state:
+        state["queue"].append({"ticket": ticket, **entry})
+
+    start = time.monotonic()
+    acquired = False
+    try:
+        while True:
+            wait = POLL_INTERVAL
+            with _state(agent) as state:
+                now = time.time()
+                rate = limits["rate_per_minute"]
+                tokens = _tokens(state, limits, now) if rate is not None else 0.0
+                queue = state["queue"]
+                if not any(e["ticket"] == ticket for e in queue):
+                    # Dropped as dead (e.g. a paused process); queue up again at the back
+                    queue.append({"ticket": ticket, **entry})
+                head = queue[0]["ticket"] == ticket
+                slot_free = (
+                    limits["max_concurrent"] is None
+                    or len(state["running"]) < limits["max_concurrent"]
+                )
+                has_token = rate is None or tokens >= 1
+                if cancel is not None and cancel.is_set():
+                    return None
+                if head and slot_free and has_token:
+                    queue.pop(0)
+                    state["running"][ticket] = {"pid": entry["pid"], "since": now}
+                    if rate is not None:
+                        state["tokens"] = tokens - 1
+                        state["refilled_at"] = now
+                    acquired = True
+                    return ticket
+                if head and slot_free and rate:
+                    # Sleep until the next token instead of polling
+                    wait = max(0.01, (1 - tokens) * 60 / rate)
+
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise SlotTimeoutError(f"Timed out waiting for a free {agent} slot")
+                wait = min(wait, remaining)
+            time.sleep(wait)
+    finally:
+        if not acquired:
+            with _state(agent) as state:
+                state["queue"] = [e for e in state["queue"] if e["ticket"] != ticket]
+
+
+def release_slot(agent: str, ticket: str | None) -> None:
+    """Give back a slot taken with acquire_slot()."""
+    if ticket is None:
+        return
+    with _state(agent) as state:
+        state["running"].pop(ticket, None)
+
+
+@contextmanager
+def agent_slot(agent: str, timeout: float | None = None) -> Iterator[None]:
+    """Hold a slot for an agent call for the duration of the block."""
+    ticket = acquire_slot(agent, timeout)
+    try:
+        yield
+    finally:
+        release_slot(agent, ticket)
+
+
+def limiter_status(agent: str) -> dict[str, Any]:
+    """Current running and queued calls for an agent, with its limits."""
+    limits = get_limit_config(agent)
+    status = {"running": 0, "waiting": 0, **limits}
+    if not _limited(limits) or not (get_limits_dir() / f"{agent}.json").exists():
+        return status
+    with _state(agent) as state:
+        status["running"] = len(state["running"])
+        status["waiting"] = len(state["queue"])
+    return status
@@ -0,0 +1,165 @@
+"""Append-only per-call metrics log."""
+
+import json
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .config import load_config
+from .fileutil import file_lock
+from .paths import get_data_dir
+
+METRICS_FILENAME = "metrics.jsonl"
+LOCK_FILENAME = "metrics.lock"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+
+
+def get_metrics_config() -> dict[str, Any]:
+    """Get the metrics settings from config, with defaults filled in."""
+    config = load_config().get("metrics", {})
+    return {
+        "enabled": config.get("enabled", True),
+        "max_bytes": config.get("max_bytes", DEFAULT_MAX_BYTES),
+        "backups": config.get("backups", DEFAULT_BACKUPS),
+    }
+
+
+def get_metrics_path() -> Path:
+    """Get the metrics log path (~/.local/share/hire/metrics.jsonl)."""
+    return get_data_dir() / METRICS_FILENAME
+
+
+def _rotate(path: Path, max_bytes: int, backups: int) -> None:
+    """Shift metrics.jsonl -> .1 -> .2 ..., dropping the oldest.
+
+    The size is checked again under metrics.lock, so when several processes
+    see the log over the limit only the first rotates it.
+    """
+    with file_lock(path.with_name(LOCK_FILENAME)):
+        try:
+            if path.stat().st_size <= max_bytes:
+                return
+        except FileNotFoundError:
+            return
+        for n in range(backups - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{n}")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{n + 1}"))
+        if backups > 0:
+            os.replace(path, path.with_name(f"{path.name}.1"))
+        else:
+            path.unlink(missing_ok=True)
+
+
+def record_call(
+    agent: str,
+    model: str | None,
+    prompt_bytes: int,
+    response_bytes: int,
+    ok: bool,
+    agent_s: float | None,
+    overhead_s: float | None,
+    cached: bool = False,
+) -> None:
+    """Append one record for an agent call.
+
+    The record is written with a single O_APPEND write, so concurrent hire
+    processes never interleave lines. Failures are ignored: metrics must
+    never break a call.
+    """
+    config = get_metrics_config()
+    if not config["enabled"]:
+        return
+
+    record = {
+        "ts": round(time.time(), 3),
+        "agent": agent,
+        "model": model,
+        "prompt_bytes": prompt_bytes,
+        "response_bytes": response_bytes,
+        "ok": ok,
+        "agent_s": round(agent_s, 4) if agent_s is not None else None,
+        "overhead_s": round(overhead_s, 4) if overhead_s is not None else None,
+    }
+    if cached:
+        record["cached"] = True
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+    path = get_metrics_path()
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size > config["max_bytes"]:
+            _rotate(path, config["max_bytes"], config["backups"])
+    except OSError:
+        pass
+
+
+def iter_records(since: float | None = None) -> Iterator[dict[str, Any]]:
+    """Iterate over logged records, oldest file first, optionally from a timestamp."""
+    path = get_metrics_path()
+    backups = sorted(
+        path.parent.glob(f"{METRICS_FILENAME}.*"),
+        key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    for log_path in [*backups, path]:
+        try:
+            with open(log_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if since is not None and record.get("ts", 0) < since:
+                        continue
+                    yield record
+        except OSError:
+            continue
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of values (which must be sorted)."""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+def summarize(
+    records: list[dict[str, Any]],
+    since: float | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Aggregate records per agent: latency percentiles, error rate, calls per hour."""
+    now = time.time()
+    by_agent: dict[str, list[dict[str, Any]]] = {}
+    for record in records:
+        by_agent.setdefault(record.get("agent", "?"), []).append(record)
+
+    summary = {}
+    for agent, agent_records in sorted(by_agent.items()):
+        latencies = sorted(r["agent_s"] for r in agent_records if r.get("agent_s") is not None)
+        overheads = sorted(
+            r["overhead_s"] for r in agent_records if r.get("overhead_s") is not None
+        )
+        errors = sum(1 for r in agent_records if not r.get("ok"))
+        start = since if since is not None else min(r.get("ts", now) for r in agent_records)
+        hours = max((now - start) / 3600, 1 / 60)
+        summary[agent] = {
+            "calls": len(agent_records),
+            "errors": errors,
+            "error_rate": round(errors / len(agent_records), 4),
+            "calls_per_hour": round(len(agent_records) / hours, 2),
+            "p50_s": percentile(latencies, 50),
+            "p95_s": percentile(latencies, 95),
+            "p99_s": percentile(latencies, 99),
+            "overhead_p50_s": percentile(overheads, 50),
+        }
+    return summary
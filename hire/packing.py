@@ -0,0 +1,259 @@
+"""Fit large piped input into an agent's context window.
+
+Off unless packing.enabled is set in config or --pack is given. A prompt
+whose estimated size is over the token budget for the model (or agent) keeps
+its head and tail, and of the lines in between only the first of each kind:
+lines that differ just in numbers, IDs or timestamps count as repeats, which
+is what makes up most of a large log. Omitted sections are marked in the
+text, and a report says what was dropped.
+
+Packed prompts are cached by the hash of their content and settings, so
+rerunning the same input skips the work.
+
+Settings under packing in config.json:
+
+    enabled     pack every prompt over budget (default: false)
+    budgets     token budget per model or agent name, e.g. {"gemini": 800000}
+    head, tail  share of the budget for the start and end of the input
+                (default: 0.4 each; the rest holds the distinct middle lines)
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .config import load_config
+from .fileutil import atomic_write_json
+from .paths import ensure_dir, get_data_dir
+from .prompt_file import PromptFile, get_spill_threshold
+
+# Input tokens an agent is given by default, well inside its context window
+DEFAULT_BUDGETS = {"claude": 150_000, "codex": 200_000, "gemini": 800_000}
+DEFAULT_BUDGET = 100_000
+DEFAULT_HEAD = 0.4
+DEFAULT_TAIL = 0.4
+
+# Rough characters per token for English text, code and logs
+CHARS_PER_TOKEN = 4
+
+# Distinct middle lines counted before further ones are only kept or dropped
+MAX_TRACKED_LINES = 200_000
+
+# Packed prompts kept in the cache
+MAX_CACHED = 20
+
+# Numbers, hex IDs and the like, which vary between otherwise repeated lines
+_VARIABLE = re.compile(r"\b[0-9a-fA-F]{8,}\b|\d+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the tokens in text from its length."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def get_packing_config() -> dict[str, Any]:
+    """Get the packing settings from config, with defaults filled in."""
+    config = load_config().get("packing", {})
+    return {
+        "enabled": config.get("enabled", False),
+        "budgets": {**DEFAULT_BUDGETS, **config.get("budgets", {})},
+        "head": config.get("head", DEFAULT_HEAD),
+        "tail": config.get("tail", DEFAULT_TAIL),
+    }
+
+
+def get_token_budget(config: dict[str, Any], agent: str, model: str | None) -> int:
+    """Get the token budget for a model, falling back to the agent's."""
+    budgets = config["budgets"]
+    if model and model in budgets:
+        return int(budgets[model])
+    return int(budgets.get(agent, DEFAULT_BUDGET))
+
+
+def get_pack_cache_dir() -> Path:
+    """Get the packed prompt cache directory (~/.local/share/hire/packed/)."""
+    return ensure_dir(get_data_dir() / "packed")
+
+
+def pack_lines(
+    lines: Iterable[str],
+    budget: int,
+    head_share: float = DEFAULT_HEAD,
+    tail_share: float = DEFAULT_TAIL,
+) -> tuple[str, dict[str, Any]]:
+    """Pack lines into about budget tokens; return the text and a report.
+
+    Reads the lines once, holding no more than the budget's worth of them.
+    """
+    # A single line may take at most a tenth of the budget
+    max_line_chars = max(1, budget // 10) * CHARS_PER_TOKEN
+    head_budget = int(budget * head_share)
+    tail_budget = int(budget * tail_share)
+    middle_budget = budget - head_budget - tail_budget
+
+    head: list[str] = []
+    head_tokens = 0
+    tail: deque[tuple[str, int]] = deque()
+    tail_tokens = 0
+    # (key, line) of each distinct middle line kept, in input order
+    middle: list[tuple[bytes, str]] = []
+    middle_tokens = 0
+    counts: dict[bytes, int] = {}
+    report = {
+        "budget": budget,
+        "estimated_tokens": 0,
+        "lines": 0,
+        "omitted_lines": 0,
+        "repeated_lines": 0,
+        "dropped_lines": 0,
+        "truncated_lines": 0,
+    }
+
+    def to_middle(line: str, tokens: int) -> None:
+        nonlocal middle_tokens
+        report["omitted_lines"] += 1
+        key = hashlib.blake2b(_VARIABLE.sub("#", line).encode("utf-8"), digest_size=8).digest()
+        if key in counts:
+            counts[key] += 1
+            report["repeated_lines"] += 1
+            return
+        if len(counts) < MAX_TRACKED_LINES:
+            counts[key] = 1
+        if middle_tokens + tokens <= middle_budget:
+            middle.append((key, line))
+            middle_tokens += tokens
+        else:
+            report["dropped_lines"] += 1
+
+    for line in lines:
+        tokens = estimate_tokens(line)
+        report["lines"] += 1
+        report["estimated_tokens"] += tokens
+        if len(line) > max_line_chars:
+            line = line[:max_line_chars] + " [hire: line truncated]\n"
+            tokens = estimate_tokens(line)
+            report["truncated_lines"] += 1
+        if not tail and head_tokens + tokens <= head_budget:
+            head.append(line)
+            head_tokens += tokens
+            continue
+        tail.append((line, tokens))
+        tail_tokens += tokens
+        while tail_tokens > tail_budget and len(tail) > 1:
+            old, old_tokens = tail.popleft()
+            tail_tokens -= old_tokens
+            to_middle(old, old_tokens)
+
+    parts = head
+    if report["omitted_lines"]:
+        if parts and not parts[-1].endswith("\n"):
+            parts[-1] += "\n"
+        parts.append(
+            f"[hire: {report['omitted_lines']} lines omitted here; the first of each kind "
+            f"follows, {report['repeated_lines']} repeats and {report['dropped_lines']} "
+            "lines over budget dropped]\n"
+        )
+        for key, line in middle:
+            repeats = counts.get(key, 1) - 1
+            line = line.rstrip("\n")
+            parts.append(f"{line}  [+{repeats} similar]\n" if repeats else f"{line}\n")
+        parts.append("[hire: end of omitted lines]\n")
+    parts.extend(line for line, _ in tail)
+    text = "".join(parts)
+    report["packed_tokens"] = estimate_tokens(text)
+    return text, report
+
+
+def _read_lines(prompt: str | PromptFile) -> Iterator[str]:
+    if isinstance(prompt, PromptFile):
+        with open(prompt.path, encoding="utf-8", errors="replace") as f:
+            yield from f
+    else:
+        yield from prompt.splitlines(keepends=True)
+
+
+def _cache_get(key: str) -> dict[str, Any] | None:
+    path = get_pack_cache_dir() / f"{key}.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry: dict[str, Any] = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    # Touch, so pruning drops the least recently used entries; a concurrent
+    # prune may have removed the file since it was read
+    with contextlib.suppress(OSError):
+        os.utime(path)
+    return entry
+
+
+def _cache_put(key: str, entry: dict[str, Any]) -> None:
+    cache_dir = get_pack_cache_dir()
+    atomic_write_json(cache_dir / f"{key}.json", entry)
+    entries = sorted(cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for old in entries[:-MAX_CACHED]:
+        old.unlink(missing_ok=True)
+
+
+def pack_prompt(
+    prompt: str | PromptFile,
+    agent: str,
+    model: str | None,
+    config: dict[str, Any] | None = None,
+) -> tuple[str | PromptFile, dict[str, Any] | None]:
+    """Pack a prompt to the agent's budget.
+
+    Returns the prompt to send and a report, or the prompt unchanged and
+    None if it is within budget. A prompt file that is still large after
+    packing is rewritten in place.
+    """
+    config = config or get_packing_config()
+    budget = get_token_budget(config, agent, model)
+    size = prompt.size if isinstance(prompt, PromptFile) else len(prompt)
+    if size // CHARS_PER_TOKEN <= budget:
+        return prompt, None
+
+    if isinstance(prompt, PromptFile):
+        digest = prompt.digest
+    else:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    settings = json.dumps([digest, budget, config["head"], config["tail"]])
+    key = hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+    entry = _cache_get(key)
+    if entry is None:
+        text, report = pack_lines(_read_lines(prompt), budget, config["head"], config["tail"])
+        entry = {"text": text, "report": report}
+        _cache_put(key, entry)
+        cached = False
+    else:
+        text, report = entry["text"], entry["report"]
+        cached = True
+    report = {**report, "cached": cached}
+
+    if isinstance(prompt, PromptFile):
+        # The threshold is in bytes, like the size of the piped input it spilled
+        data = text.encode()
+        if len(data) > get_spill_threshold():
+            tmp = prompt.path.with_suffix(".packing")
+            tmp.write_bytes(data)
+            os.replace(tmp, prompt.path)
+            prompt.size = len(data)
+            prompt.digest = hashlib.sha256(data).hexdigest()
+            return prompt, report
+    return text, report
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Describe a packing report in one line."""
+    return (
+        f"(Packed input: ~{report['packed_tokens']:,} of ~{report['estimated_tokens']:,} "
+        f"tokens kept; {report['omitted_lines']:,} of {report['lines']:,} lines summarized, "
+        f"{report['repeated_lines']:,} repeats and {report['dropped_lines']:,} over budget "
+        "dropped" + (", cached" if report.get("cached") else "") + ")"
+    )
@@ -5,6 +5,17 @@ from pathlib import Path
 
 APP_NAME = "hire"
 
+# Directories this process has already created, so repeat calls skip mkdir
+_created_dirs: set[Path] = set()
+
+
+def ensure_dir(path: Path) -> Path:
+    """Create a directory (and parents) once per process and return it."""
+    if path not in _created_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(path)
+    return path
+
 
 def get_config_dir() -> Path:
     """Get XDG config directory (~/.config/hire/)."""
@@ -14,9 +25,7 @@ def get_config_dir() -> Path:
     else:
         base = Path.home() / ".config"
 
-    config_dir = base / APP_NAME
-    config_dir.mkdir(parents=True, exist_ok=True)
-    return config_dir
+    return ensure_dir(base / APP_NAME)
 
 
 def get_data_dir() -> Path:
@@ -27,9 +36,7 @@ def get_data_dir() -> Path:
     else:
         base = Path.home() / ".local" / "share"
 
-    data_dir = base / APP_NAME
-    data_dir.mkdir(parents=True, exist_ok=True)
-    return data_dir
+    return ensure_dir(base / APP_NAME)
 
 
 def get_config_path() -> Path:
@@ -49,5 +56,4 @@ def get_sessions_dir(agent: str | None = None) -> Path:
     sessions_dir = get_data_dir() / "sessions"
     if agent:
         sessions_dir = sessions_dir / agent
-    sessions_dir.mkdir(parents=True, exist_ok=True)
-    return sessions_dir
+    return ensure_dir(sessions_dir)
@@ -0,0 +1,240 @@
+"""Agent subprocess control: timeouts, process-group cleanup and retries.
+
+Per-agent settings live under adapters.<agent> in config.json:
+
+    timeout      seconds one attempt may run before it is killed (default: none)
+    deadline     seconds for the whole call, retries and waits included (default: none)
+    retries      extra attempts after a transient failure (default: 2)
+    backoff      base delay in seconds, doubled per retry, with full jitter (default: 1)
+    max_backoff  cap on a single delay in seconds (default: 30)
+    retry_patterns  extra regexes; stderr matching one marks a failure as transient
+"""
+
+import contextlib
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from .config import get_adapter_config
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 30.0
+
+# stderr text that marks a failure as worth retrying
+TRANSIENT_PATTERNS = [
+    r"rate[ _-]?limit",
+    r"too many requests",
+    r"\b429\b",
+    r"\b50[234]\b",
+    r"overloaded",
+    r"(temporarily|service) unavailable",
+    r"ECONNRESET|ETIMEDOUT|EAI_AGAIN",
+    r"connection (reset|refused|closed)",
+    r"try again later",
+]
+
+# Agent children still running. They have their own process groups, so Ctrl-C
+# does not reach them; kill_children() does, whichever thread started them.
+_children: set[int] = set()
+_children_lock = threading.Lock()
+# Set by kill_children(): no new child may run and no call is retried
+_interrupted = threading.Event()
+
+
+def get_call_policy(agent: str) -> dict[str, Any]:
+    """Get an agent's timeout and retry settings, with defaults filled in."""
+    config = get_adapter_config(agent)
+    return {
+        "timeout": config.get("timeout"),
+        "deadline": config.get("deadline"),
+        "retries": config.get("retries", DEFAULT_RETRIES),
+        "backoff": config.get("backoff", DEFAULT_BACKOFF),
+        "max_backoff": config.get("max_backoff", DEFAULT_MAX_BACKOFF),
+        "retry_patterns": TRANSIENT_PATTERNS + list(config.get("retry_patterns", [])),
+    }
+
+
+def is_transient(error: str, patterns: list[str]) -> bool:
+    """Whether an error message looks like a failure that may pass on retry."""
+    return any(re.search(pattern, error, re.IGNORECASE) for pattern in patterns)
+
+
+def popen_kwargs() -> dict[str, Any]:
+    """Popen arguments that start the child in its own process group.
+
+    Agent CLIs spawn helpers of their own, so on timeout or interrupt the
+    whole group is killed rather than just the direct child.
+    """
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def kill_tree(pid: int) -> None:
+    """Kill a child started with popen_kwargs() and everything it spawned."""
+    if sys.platform == "win32":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True)
+        return
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(pid, signal.SIGKILL)
+
+
+def track_child(pid: int) -> None:
+    """Register a running child started with popen_kwargs(), for kill_children()."""
+    with _children_lock:
+        _children.add(pid)
+    if _interrupted.is_set():
+        kill_tree(pid)
+
+
+def untrack_child(pid: int) -> None:
+    """Unregister a child once it has exited."""
+    with _children_lock:
+        _children.discard(pid)
+
+
+def kill_children() -> None:
+    """Kill every tracked child, and any started from now on.
+
+    For the main thread's interrupt handling: children started from worker
+    threads are otherwise left running until they finish on their own.
+    """
+    _interrupted.set()
+    with _children_lock:
+        pids = list(_children)
+    for pid in pids:
+        kill_tree(pid)
+
+
+@contextlib.contextmanager
+def kill_children_on_interrupt(pool: "Executor | None" = None) -> Iterator[None]:
+    """Kill every child (and cancel pool's queued calls) if the block is interrupted.
+
+    Use inside the executor's with block, so this runs before the executor
+    waits for its threads.
+    """
+    try:
+        yield
+    except BaseException:
+        kill_children()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+def open_stdin(path: Path | None) -> BinaryIO | None:
+    """Open a file to pass as a child's stdin, or None to inherit ours."""
+    return open(path, "rb") if path is not None else None
+
+
+def run_command(
+    cmd: list[str],
+    timeout: float | None,
+    stdin_path: Path | None = None,
+) -> tuple[int | None, str, str]:
+    """Run a command to completion and return (returncode, stdout, stderr).
+
+    returncode is None if the command ran past timeout and was killed.
+    stdin_path, if given, is the file the command reads as its stdin.
+    """
+    stdin = open_stdin(stdin_path)
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdin=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            **popen_kwargs(),
+        )
+    finally:
+        # The child has its own copy of the descriptor
+        if stdin:
+            stdin.close()
+    track_child(process.pid)
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        kill_tree(process.pid)
+        stdout, stderr = process.communicate()
+        return None, stdout, stderr
+    except BaseException:
+        # Interrupted: the child is not in our process group, so Ctrl-C missed it
+        kill_tree(process.pid)
+        process.wait()
+        raise
+    finally:
+        untrack_child(process.pid)
+    return process.returncode, stdout, stderr
+
+
+class CallBudget:
+    """Attempts, timeouts and backoff for one agent call under a policy."""
+
+    def __init__(self, policy: dict[str, Any]) -> None:
+        self.policy = policy
+        self.start = time.monotonic()
+        self.attempts = 0
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def remaining(self) -> float | None:
+        """Seconds left before the deadline, or None without one."""
+        deadline: float | None = self.policy["deadline"]
+        if deadline is None:
+            return None
+        return max(0.0, deadline - self.elapsed())
+
+    def start_attempt(self) -> float | None:
+        """Count an attempt and return its timeout, capped by the deadline."""
+        self.attempts += 1
+        timeout: float | None = self.policy["timeout"]
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def retry_delay(self, error: str, timed_out: bool) -> float | None:
+        """Seconds to wait before the next attempt, or None to give up.
+
+        Timeouts are not retried: a hung agent should fail fast. Nor is
+        anything after kill_children().
+        """
+        if timed_out or self.attempts > self.policy["retries"] or _interrupted.is_set():
+            return None
+        if not is_transient(error, self.policy["retry_patterns"]):
+            return None
+        cap = min(self.policy["max_backoff"], self.policy["backoff"] * 2 ** (self.attempts - 1))
+        delay = random.uniform(0, cap)
+        deadline = self.policy["deadline"]
+        if deadline is not None and self.elapsed() + delay >= deadline:
+            return None
+        return delay
+
+    def sleep(self, delay: float) -> None:
+        """Wait delay seconds before a retry, cut short by kill_children()."""
+        _interrupted.wait(delay)
+
+    def timeout_error(self, timeout: float | None) -> str:
+        """Error message for an attempt killed at its timeout."""
+        return f"Timed out after {timeout or 0:g}s"
+
+    def finish(self, result: dict[str, Any]) -> dict[str, Any]:
+        """Add attempts and elapsed seconds to a result and return it."""
+        result["attempts"] = self.attempts
+        result["elapsed"] = round(self.elapsed(), 3)
+        return result
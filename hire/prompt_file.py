@@ -0,0 +1,67 @@
+"""Large prompts: spill piped input to a file handed to the agent on stdin.
+
+Agent CLIs take the prompt as one argv element, and Linux caps a single
+argument at 128 KiB (MAX_ARG_STRLEN), so piping a big diff or log into hire
+would fail with E2BIG. Piped input over input.spill_bytes in config is
+instead copied in chunks to a file in the data directory, never held in
+memory whole. Adapters run the agent with that file as its stdin and tell the
+CLI to read the prompt from there (build_command with message=None).
+"""
+
+import hashlib
+import itertools
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO
+
+from .config import load_config
+from .paths import ensure_dir, get_data_dir
+
+# Below MAX_ARG_STRLEN with room for the rest of the command line
+DEFAULT_SPILL_BYTES = 100_000
+CHUNK_SIZE = 64 * 1024
+
+
+def get_spill_threshold() -> int:
+    """Bytes of piped input above which the prompt goes through a file."""
+    return int(load_config().get("input", {}).get("spill_bytes", DEFAULT_SPILL_BYTES))
+
+
+def get_spill_dir() -> Path:
+    """Get the directory for spilled prompts (~/.local/share/hire/spill/).
+
+    The data directory rather than /tmp, which is often memory-backed.
+    """
+    return ensure_dir(get_data_dir() / "spill")
+
+
+class PromptFile:
+    """A prompt written to disk: its path, size in bytes and SHA-256."""
+
+    def __init__(self, path: Path, size: int, digest: str) -> None:
+        self.path = path
+        self.size = size
+        self.digest = digest
+
+    def remove(self) -> None:
+        """Delete the file."""
+        self.path.unlink(missing_ok=True)
+
+
+def spill_prompt(parts: list[bytes], stream: BinaryIO) -> PromptFile:
+    """Write parts followed by the rest of stream to a new prompt file."""
+    fd, name = tempfile.mkstemp(prefix="prompt-", suffix=".txt", dir=get_spill_dir())
+    path = Path(name)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in itertools.chain(parts, iter(lambda: stream.read(CHUNK_SIZE), b"")):
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return PromptFile(path, size, digest.hexdigest())
@@ -0,0 +1,124 @@
+"""Session retention policy and garbage collection."""
+
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from .config import load_config
+from .paths import ensure_dir, get_data_dir
+from .session import delete_sessions, list_sessions
+from .transcript import archive_transcript
+
+DEFAULT_INTERVAL_HOURS = 24
+STAMP_FILENAME = "gc.stamp"
+
+
+def get_retention_config() -> dict[str, Any]:
+    """Get the retention settings from config, with defaults filled in."""
+    config = load_config().get("retention", {})
+    return {
+        "max_per_agent": config.get("max_per_agent"),
+        "max_age_days": config.get("max_age_days"),
+        "keep_named": config.get("keep_named", True),
+        "auto": config.get("auto", False),
+        "interval_hours": config.get("interval_hours", DEFAULT_INTERVAL_HOURS),
+    }
+
+
+def get_archive_dir() -> Path:
+    """Get the directory holding archived sessions."""
+    return ensure_dir(get_data_dir() / "archive")
+
+
+def select_expired(
+    sessions: list[dict[str, Any]],
+    policy: dict[str, Any],
+    now: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """Pick the sessions the policy no longer keeps.
+
+    Unnamed sessions (and named ones, unless keep_named) expire when older
+    than max_age_days or beyond the newest max_per_agent of their agent.
+    Named sessions kept by keep_named do not count towards max_per_agent.
+    """
+    max_per_agent = policy.get("max_per_agent")
+    max_age_days = policy.get("max_age_days")
+    if max_per_agent is None and max_age_days is None:
+        return []
+
+    cutoff = None
+    if max_age_days is not None:
+        cutoff = ((now or datetime.now()) - timedelta(days=max_age_days)).isoformat()
+
+    expired = []
+    kept_per_agent: dict[str, int] = {}
+    # Newest first, so the first max_per_agent of each agent are the ones kept
+    for session in sorted(sessions, key=lambda s: s.get("updated_at", ""), reverse=True):
+        if policy.get("keep_named", True) and session.get("name"):
+            continue
+        agent = session.get("agent", "")
+        too_old = cutoff is not None and session.get("updated_at", "") < cutoff
+        too_many = max_per_agent is not None and kept_per_agent.get(agent, 0) >= max_per_agent
+        if too_old or too_many:
+            expired.append(session)
+        else:
+            kept_per_agent[agent] = kept_per_agent.get(agent, 0) + 1
+    return expired
+
+
+def archive_sessions(sessions: list[dict[str, Any]]) -> Path:
+    """Append sessions to this month's compressed archive (JSONL in gzip).
+
+    Each call appends a new gzip member, which gzip readers concatenate
+    transparently, so earlier archived sessions are never rewritten.
+    """
+    archive_path = get_archive_dir() / f"sessions-{datetime.now():%Y-%m}.jsonl.gz"
+    with gzip.open(archive_path, "at", encoding="utf-8") as f:
+        for session in sessions:
+            f.write(json.dumps(session, ensure_ascii=False) + "\n")
+    return archive_path
+
+
+def collect_garbage(dry_run: bool = False) -> list[dict[str, Any]]:
+    """Archive and delete every session the retention policy expires.
+
+    Sessions are archived before they are deleted, so an interrupted run can
+    at worst archive a session twice, never lose one. Their transcripts are
+    moved to archive/transcripts/. Returns the expired sessions.
+    """
+    expired = select_expired(list_sessions(), get_retention_config())
+    if expired and not dry_run:
+        archive_sessions(expired)
+        transcripts_dir = ensure_dir(get_archive_dir() / "transcripts")
+        for session in expired:
+            archive_transcript(session["id"], transcripts_dir)
+        delete_sessions(expired, remove_transcripts=False)
+    return expired
+
+
+def maybe_collect_garbage() -> None:
+    """Run collect_garbage if retention.auto is on and it is due.
+
+    Cheap enough to call after every save: when not due, it costs one stat.
+    """
+    policy = get_retention_config()
+    if not policy["auto"]:
+        return
+
+    stamp_path = get_data_dir() / STAMP_FILENAME
+    try:
+        last_run = stamp_path.stat().st_mtime
+    except OSError:
+        last_run = 0.0
+    if time.time() - last_run < policy["interval_hours"] * 3600:
+        return
+
+    # Claim this run before doing it, so concurrent processes skip it
+    try:
+        stamp_path.touch()
+        collect_garbage()
+    except OSError:
+        pass
@@ -0,0 +1,428 @@
+"""`hire serve`: a local daemon that keeps agent processes warm.
+
+Agents whose CLI can read prompts on stdin (see
+AgentAdapter.build_worker_command) get long-lived workers. A few are started
+ahead of time for new sessions, and a worker that answered a turn is kept for
+that session's next turn, so neither pays the agent's startup cost. Other
+agents are run directly by the client.
+
+A worker runs in the cwd and environment of the request that started it, and
+is only reused for requests from the same cwd and environment.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from .adapters import ADAPTERS, AgentAdapter, get_adapter
+from .daemon import connect, get_socket_path
+from .limiter import SlotTimeoutError, acquire_slot, release_slot
+from .process import CallBudget, get_call_policy, kill_tree, popen_kwargs
+
+# Lines of stderr kept from each worker for error messages
+STDERR_TAIL_LINES = 50
+
+# Variables that differ between shells without changing how an agent runs
+VOLATILE_ENV = {"_", "OLDPWD", "SHLVL", "TERM_SESSION_ID", "WINDOWID"}
+
+# (cwd, digest of the environment) a worker runs in
+Context = tuple[str, str]
+
+
+def context_key(cwd: str, env: dict[str, str]) -> Context:
+    """Identify the cwd and environment a worker can serve."""
+    items = sorted((k, v) for k, v in env.items() if k not in VOLATILE_ENV)
+    return cwd, hashlib.sha256(json.dumps(items).encode()).hexdigest()
+
+
+class Worker:
+    """A long-lived agent process answering one prompt at a time."""
+
+    def __init__(
+        self,
+        adapter: AgentAdapter,
+        model: str | None,
+        cmd: list[str],
+        cwd: str,
+        env: dict[str, str],
+    ) -> None:
+        self.adapter = adapter
+        self.model = model
+        self.context = context_key(cwd, env)
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            cwd=cwd,
+            env=env,
+            **popen_kwargs(),
+        )
+        self._stderr: deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        self.timed_out = False
+        threading.Thread(target=self._drain_stderr, daemon=True).start()
+
+    def _drain_stderr(self) -> None:
+        """Keep the tail of stderr so a full pipe cannot block the worker."""
+        assert self.process.stderr is not None
+        for line in self.process.stderr:
+            self._stderr.append(line)
+
+    def alive(self) -> bool:
+        """Whether the process is still running."""
+        return self.process.poll() is None
+
+    def _expire(self) -> None:
+        """Kill the worker when a turn's timeout runs out, which ends the turn."""
+        if self.alive():
+            self.timed_out = True
+            kill_tree(self.process.pid)
+
+    def turn(
+        self,
+        message: str,
+        session_id: str | None,
+        timeout: float | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Send one prompt and yield its events, ending with a result event.
+
+        A turn still running after timeout seconds kills the worker and sets
+        timed_out.
+        """
+        assert self.process.stdin is not None and self.process.stdout is not None
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, self._expire)
+            timer.daemon = True
+            timer.start()
+        try:
+            self.process.stdin.write(self.adapter.encode_worker_message(message) + "\n")
+            self.process.stdin.flush()
+            for event in self.adapter.read_worker_turn(self.process.stdout, session_id):
+                yield event
+                if event["type"] == "result":
+                    return
+        except OSError:
+            pass
+        finally:
+            if timer:
+                timer.cancel()
+
+        # The worker died (or was killed) before finishing the turn
+        self.close()
+        yield {"type": "result", "result": {
+            "response": None,
+            "session_id": session_id,
+            "error": "".join(self._stderr) or "Agent worker exited",
+            "raw": None,
+        }}
+
+    def close(self) -> None:
+        """Stop the process and anything it spawned."""
+        if self.alive():
+            self.process.terminate()
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                self.process.wait(timeout=5)
+        # The worker has its own process group; take its helpers down with it
+        kill_tree(self.process.pid)
+        self.process.wait()
+
+
+class WorkerPool:
+    """Idle workers per (agent, model, context) and busy-free workers per session."""
+
+    def __init__(self, idle_workers: int, max_workers: int) -> None:
+        self.idle_workers = idle_workers
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        # (agent, model, context) -> idle workers, least recently used first
+        self._idle: OrderedDict[tuple[str, str | None, Context], list[Worker]] = OrderedDict()
+        # (agent, CLI session ID) -> worker holding that conversation, oldest first
+        self._sessions: OrderedDict[tuple[str, str], Worker] = OrderedDict()
+        self.warm_turns = 0
+        self.cold_turns = 0
+
+    def acquire(
+        self,
+        adapter: AgentAdapter,
+        model: str | None,
+        session_id: str | None,
+        cwd: str,
+        env: dict[str, str],
+    ) -> Worker | None:
+        """Take a worker for a turn, or None if the agent has no worker mode."""
+        context = context_key(cwd, env)
+        stale: list[Worker] = []
+        worker = None
+        with self._lock:
+            if session_id:
+                worker = self._sessions.pop((adapter.name, session_id), None)
+                if worker and (
+                    worker.model != model or worker.context != context or not worker.alive()
+                ):
+                    stale.append(worker)
+                    worker = None
+            else:
+                key = (adapter.name, model, context)
+                idle = self._idle.get(key, [])
+                if key in self._idle:
+                    self._idle.move_to_end(key)
+                while idle and worker is None:
+                    worker = idle.pop()
+                    if not worker.alive():
+                        stale.append(worker)
+                        worker = None
+            if worker:
+                self.warm_turns += 1
+        for old in stale:
+            old.close()
+
+        if not session_id:
+            # Replace the idle worker just taken (or start keeping one)
+            self.fill(adapter, model, cwd, env)
+        if worker:
+            return worker
+
+        cmd = adapter.build_worker_command(session_id, model)
+        if cmd is None:
+            return None
+        with self._lock:
+            self.cold_turns += 1
+        return Worker(adapter, model, cmd, cwd, env)
+
+    def release(self, worker: Worker, session_id: str | None) -> None:
+        """Keep a worker for its session's next turn, evicting the oldest."""
+        if not session_id or not worker.alive():
+            worker.close()
+            return
+        evicted: list[Worker] = []
+        with self._lock:
+            self._sessions[(worker.adapter.name, session_id)] = worker
+            while len(self._sessions) > self.max_workers:
+                evicted.append(self._sessions.popitem(last=False)[1])
+        for old in evicted:
+            old.close()
+
+    def fill(self, adapter: AgentAdapter, model: str | None, cwd: str, env: dict[str, str]) -> None:
+        """Start idle workers in the background up to idle_workers."""
+        key = (adapter.name, model, context_key(cwd, env))
+        with self._lock:
+            missing = self.idle_workers - len(self._idle.get(key, []))
+        for _ in range(missing):
+            threading.Thread(
+                target=self._spawn_idle, args=(adapter, model, cwd, env), daemon=True
+            ).start()
+
+    def _spawn_idle(
+        self,
+        adapter: AgentAdapter,
+        model: str | None,
+        cwd: str,
+        env: dict[str, str],
+    ) -> None:
+        cmd = adapter.build_worker_command(None, model)
+        if cmd is None:
+            return
+        try:
+            worker = Worker(adapter, model, cmd, cwd, env)
+        except OSError as e:
+            print(f"Warning: could not start {adapter.name} worker: {e}", file=sys.stderr)
+            return
+        unused: list[Worker] = []
+        with self._lock:
+            key = (adapter.name, model, worker.context)
+            idle = self._idle.setdefault(key, [])
+            self._idle.move_to_end(key)
+            if len(idle) < self.idle_workers:
+                idle.append(worker)
+            else:
+                unused.append(worker)
+            # Idle workers for contexts not used lately go first
+            while sum(len(workers) for workers in self._idle.values()) > self.max_workers:
+                unused.extend(self._idle.popitem(last=False)[1])
+        for old in unused:
+            old.close()
+
+    def status(self) -> dict[str, Any]:
+        """Counts of workers and turns, for `hire serve --status`."""
+        with self._lock:
+            return {
+                "idle_workers": sum(len(idle) for idle in self._idle.values()),
+                "session_workers": len(self._sessions),
+                "warm_turns": self.warm_turns,
+                "cold_turns": self.cold_turns,
+            }
+
+    def close(self) -> None:
+        """Stop every worker."""
+        with self._lock:
+            workers = [w for idle in self._idle.values() for w in idle]
+            workers.extend(self._sessions.values())
+            self._idle.clear()
+            self._sessions.clear()
+        for worker in workers:
+            worker.close()
+
+
+def run_turn(
+    pool: WorkerPool,
+    request: dict[str, Any],
+    send: Callable[[dict[str, Any]], None],
+) -> None:
+    """Answer an ask request, passing each event to send.
+
+    The worker runs in the client's cwd and environment, sent with the
+    request. Turns follow the agent's timeout, deadline and retry policy
+    like a direct call: a worker that runs out of time is killed (the pool
+    starts a fresh one for the next turn), and the result carries attempts
+    and elapsed.
+    """
+    session_id = request.get("session_id")
+    model = request.get("model")
+    cwd = request.get("cwd") or os.getcwd()
+    env = request.get("env") or dict(os.environ)
+    try:
+        adapter = get_adapter(request.get("agent", ""))
+    except ValueError as e:
+        send({"type": "result", "result": {
+            "response": None, "session_id": session_id, "error": str(e), "raw": None,
+        }})
+        return
+
+    budget = CallBudget(get_call_policy(adapter.name))
+    while True:
+        # Warm turns count against the agent's host-wide limits like any other call
+        try:
+            ticket = acquire_slot(adapter.name, budget.remaining())
+        except SlotTimeoutError as e:
+            send({"type": "result", "result": budget.finish(
+                {"response": None, "session_id": session_id, "error": str(e), "raw": None}
+            )})
+            return
+
+        result: dict[str, Any] = {}
+        sent_text = False
+        try:
+            try:
+                worker = pool.acquire(adapter, model, session_id, cwd, env)
+                if worker is None:
+                    # Clients run these directly, as the daemon could not speed them up
+                    raise ValueError(f"{adapter.name} has no worker mode")
+            except (ValueError, OSError) as e:
+                send({"type": "result", "result": budget.finish(
+                    {"response": None, "session_id": session_id, "error": str(e), "raw": None}
+                )})
+                return
+
+            new_session_id = None
+            timeout = budget.start_attempt()
+            try:
+                for event in worker.turn(request["message"], session_id, timeout):
+                    if event["type"] == "result":
+                        result = event["result"]
+                    else:
+                        sent_text = True
+                        send(event)
+                if not result.get("error"):
+                    new_session_id = result.get("session_id")
+            finally:
+                pool.release(worker, new_session_id)
+        finally:
+            release_slot(adapter.name, ticket)
+
+        error = result.get("error")
+        if not error:
+            send({"type": "result", "result": budget.finish(result)})
+            return
+        if worker.timed_out:
+            error = result["error"] = budget.timeout_error(timeout)
+        # Text that was already passed on cannot be taken back, so only retry before any
+        delay = None if sent_text else budget.retry_delay(error, worker.timed_out)
+        if delay is None:
+            send({"type": "result", "result": budget.finish(result)})
+            return
+        budget.sleep(delay)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Handle one request per connection."""
+
+    server: "HireServer"
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        op = request.get("op")
+        if op == "ask":
+            run_turn(self.server.pool, request, self._send)
+        elif op == "status":
+            self._send({"ok": True, "pid": os.getpid(), **self.server.pool.status()})
+        elif op == "shutdown":
+            self._send({"ok": True})
+            # shutdown() waits for serve_forever, so it cannot run on its thread
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self._send({"ok": False, "error": f"Unknown operation: {op}"})
+
+    def _send(self, obj: dict[str, Any]) -> None:
+        # A client that hung up still gets its turn finished, so the worker
+        # is left at a clean turn boundary for the next prompt
+        try:
+            self.wfile.write((json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+        except OSError:
+            pass
+
+
+class HireServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server owning a worker pool."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, pool: WorkerPool) -> None:
+        self.pool = pool
+        super().__init__(path, _Handler)
+
+
+def serve(idle_workers: int, max_workers: int) -> None:
+    """Run the daemon in the foreground until shut down or interrupted."""
+    path = get_socket_path()
+    if path.exists():
+        sock = connect()
+        if sock is not None:
+            sock.close()
+            raise RuntimeError(f"hire daemon is already running on {path}")
+        # Left behind by a daemon that did not shut down cleanly
+        path.unlink()
+
+    pool = WorkerPool(idle_workers, max_workers)
+    old_umask = os.umask(0o077)
+    try:
+        server = HireServer(str(path), pool)
+    finally:
+        os.umask(old_umask)
+
+    # Warm up workers for prompts sent from where the daemon was started
+    for agent in ADAPTERS:
+        pool.fill(get_adapter(agent), None, os.getcwd(), dict(os.environ))
+
+    print(f"Listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        pool.close()
@@ -1,15 +1,17 @@
 """Session management."""
 
-import json
-import uuid
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
-from .paths import get_data_dir, get_sessions_dir
+from .store import get_store
+from .transcript import remove_transcript
 
 
 def create_session(agent: str, cli_session_id: str, name: str | None = None) -> dict[str, Any]:
     """Create a new session."""
+    import uuid
+
     session = {
         "id": str(uuid.uuid4()),
         "cli_session_id": cli_session_id,
@@ -23,43 +25,18 @@ def create_session(agent: str, cli_session_id: str, name: str | None = None) ->
 
 
 def save_session(session: dict[str, Any]) -> None:
-    """Save a session to file."""
+    """Save a session to the configured store."""
     session["updated_at"] = datetime.now().isoformat()
-    sessions_dir = get_sessions_dir(session["agent"])
-
-    # Use session ID as filename (1 file per session)
-    filename = f"{session['id']}.json"
-    filepath = sessions_dir / filename
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(session, f, indent=2, ensure_ascii=False)
+    get_store().save(session)
 
-    # Update latest pointer
-    latest_path = sessions_dir / "latest.json"
-    with open(latest_path, "w", encoding="utf-8") as f:
-        json.dump({"session_id": session["id"], "filename": filename}, f)
+    # Opportunistic, throttled retention run (a no-op unless retention.auto)
+    from .retention import maybe_collect_garbage
+    maybe_collect_garbage()
 
 
 def get_latest_session(agent: str) -> dict[str, Any] | None:
     """Get the latest session for an agent."""
-    sessions_dir = get_sessions_dir(agent)
-    latest_path = sessions_dir / "latest.json"
-
-    if not latest_path.exists():
-        return None
-
-    try:
-        with open(latest_path, encoding="utf-8") as f:
-            latest = json.load(f)
-
-        filepath = sessions_dir / latest["filename"]
-        if not filepath.exists():
-            return None
-
-        with open(filepath, encoding="utf-8") as f:
-            return json.load(f)
-    except (OSError, json.JSONDecodeError, KeyError):
-        return None
+    return get_store().get_latest(agent)
 
 
 def get_session_by_id(session_id: str) -> dict[str, Any] | None:
@@ -67,59 +44,15 @@ def get_session_by_id(session_id: str) -> dict[str, Any] | None:
 
     Supports prefix matching but raises ValueError if multiple sessions match.
     """
-    sessions_base = get_sessions_dir()
-
-    if not sessions_base.exists():
-        return None
-
-    matches: list[dict[str, Any]] = []
-
-    for agent_dir in sessions_base.iterdir():
-        if not agent_dir.is_dir():
-            continue
-        for session_file in agent_dir.glob("*.json"):
-            if session_file.name == "latest.json":
-                continue
-            try:
-                with open(session_file, encoding="utf-8") as f:
-                    session = json.load(f)
-                    # Exact match takes priority
-                    if session["id"] == session_id:
-                        return session
-                    # Prefix match
-                    if session["id"].startswith(session_id):
-                        matches.append(session)
-            except (OSError, json.JSONDecodeError, KeyError):
-                continue
-
-    if len(matches) == 1:
-        return matches[0]
-    elif len(matches) > 1:
-        raise ValueError(f"Ambiguous session ID '{session_id}' matches {len(matches)} sessions")
-    return None
+    return get_store().get(session_id)
 
 
 def get_session_by_name(name: str) -> dict[str, Any] | None:
-    """Get a session by its name (searches all agents)."""
-    sessions_base = get_sessions_dir()
-
-    if not sessions_base.exists():
-        return None
-
-    for agent_dir in sessions_base.iterdir():
-        if not agent_dir.is_dir():
-            continue
-        for session_file in agent_dir.glob("*.json"):
-            if session_file.name == "latest.json":
-                continue
-            try:
-                with open(session_file, encoding="utf-8") as f:
-                    session = json.load(f)
-                    if session.get("name") == name:
-                        return session
-            except (OSError, json.JSONDecodeError):
-                continue
-    return None
+    """Get a session by its name (searches all agents).
+
+    If several sessions share the name, the most recently updated one wins.
+    """
+    return get_store().get_by_name(name)
 
 
 def find_session(name_or_id: str) -> dict[str, Any] | None:
@@ -135,75 +68,64 @@ def find_session(name_or_id: str) -> dict[str, Any] | None:
 
 def list_sessions(agent: str | None = None) -> list[dict[str, Any]]:
     """List all sessions, optionally filtered by agent."""
-    sessions_base = get_sessions_dir()
+    return get_store().list_sessions(agent)
 
-    if not sessions_base.exists():
-        return []
 
-    sessions = []
+def iter_sessions(
+    agent: str | None = None,
+    since: str | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield sessions newest first, optionally filtered and paged.
 
-    if agent:
-        agent_dirs = [sessions_base / agent]
-    else:
-        agent_dirs = [d for d in sessions_base.iterdir() if d.is_dir()]
+    since is an ISO timestamp; sessions updated before it are skipped.
+    """
+    return get_store().iter_sessions(agent, since=since, offset=offset, limit=limit)
 
-    for agent_dir in agent_dirs:
-        if not agent_dir.exists():
-            continue
-        for session_file in agent_dir.glob("*.json"):
-            if session_file.name == "latest.json":
-                continue
-            try:
-                with open(session_file, encoding="utf-8") as f:
-                    sessions.append(json.load(f))
-            except (OSError, json.JSONDecodeError):
-                continue
 
-    # Sort by updated_at descending
-    sessions.sort(key=lambda s: s.get("updated_at", ""), reverse=True)
-    return sessions
+def count_sessions(agent: str | None = None) -> int:
+    """Count sessions, optionally only those of one agent."""
+    return get_store().count(agent)
 
 
 def delete_session(session: dict[str, Any]) -> bool:
-    """Delete a session."""
-    sessions_dir = get_sessions_dir(session["agent"])
-
-    # Find and delete the session file
-    for session_file in sessions_dir.glob("*.json"):
-        if session_file.name == "latest.json":
-            continue
-        try:
-            with open(session_file, encoding="utf-8") as f:
-                s = json.load(f)
-        except (OSError, json.JSONDecodeError):
-            continue
-
-        if s["id"] == session["id"]:
-            session_file.unlink()
-
-            # Update latest if needed
-            latest_path = sessions_dir / "latest.json"
-            if latest_path.exists():
-                try:
-                    with open(latest_path, encoding="utf-8") as f:
-                        latest = json.load(f)
-                    if latest["session_id"] == session["id"]:
-                        # Find next most recent session for this agent
-                        remaining = list_sessions(session["agent"])
-                        if remaining:
-                            # Update latest to point to most recent remaining
-                            next_session = remaining[0]
-                            with open(latest_path, "w", encoding="utf-8") as f:
-                                json.dump({
-                                    "session_id": next_session["id"],
-                                    "filename": f"{next_session['id']}.json"
-                                }, f)
-                        else:
-                            # No sessions left, remove latest.json
-                            latest_path.unlink()
-                except (OSError, json.JSONDecodeError, KeyError):
-                    # If we can't read latest.json, just try to delete it
-                    latest_path.unlink(missing_ok=True)
-
-            return True
-    return False
+    """Delete a session and its transcript."""
+    deleted = get_store().delete(session)
+    remove_transcript(session["id"])
+    return deleted
+
+
+def delete_sessions(sessions: list[dict[str, Any]], remove_transcripts: bool = True) -> int:
+    """Delete several sessions and their transcripts. Returns how many were deleted.
+
+    Without remove_transcripts the transcripts are left to the caller, as
+    garbage collection archives them.
+    """
+    deleted = get_store().delete_many(sessions)
+    if remove_transcripts:
+        for session in sessions:
+            remove_transcript(session["id"])
+    return deleted
+
+
+def rebuild_index() -> None:
+    """Rebuild the configured store's lookup index."""
+    get_store().reindex()
+
+
+def migrate_sessions(target: str) -> int:
+    """Copy every session from the configured store into another backend.
+
+    Timestamps are preserved. Returns the number of sessions copied.
+    """
+    source = get_store()
+    destination = get_store(target)
+    if destination is source:
+        return 0
+
+    sessions = source.list_sessions()
+    # Oldest first, so each agent's latest session ends up as the latest
+    for session in reversed(sessions):
+        destination.save(session)
+    return len(sessions)
@@ -0,0 +1,57 @@
+"""Session storage backends.
+
+Backend modules are imported on first use, so the JSON default never loads
+sqlite3.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from ..config import load_config
+from .base import SessionStore
+
+if TYPE_CHECKING:
+    from .json_store import JsonSessionStore
+    from .sqlite_store import SqliteSessionStore
+
+# Backend name -> (module, class)
+STORES = {
+    "json": ("json_store", "JsonSessionStore"),
+    "sqlite": ("sqlite_store", "SqliteSessionStore"),
+}
+
+_instances: dict[str, SessionStore] = {}
+
+
+def get_store_name() -> str:
+    """Get the configured storage backend name."""
+    config = load_config()
+    return str(config.get("storage", {}).get("backend", "json"))
+
+
+def get_store(backend: str | None = None) -> SessionStore:
+    """Get the session store for a backend (defaults to the configured one)."""
+    backend = backend or get_store_name()
+    if backend not in STORES:
+        raise ValueError(f"Unknown storage backend: {backend}. Available: {list(STORES.keys())}")
+    if backend not in _instances:
+        module_name, class_name = STORES[backend]
+        store_class = getattr(import_module(f".{module_name}", __name__), class_name)
+        _instances[backend] = store_class()
+    return _instances[backend]
+
+
+def __getattr__(name: str) -> Any:
+    for module_name, class_name in STORES.values():
+        if name == class_name:
+            return getattr(import_module(f".{module_name}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "JsonSessionStore",
+    "SessionStore",
+    "SqliteSessionStore",
+    "get_store",
+    "get_store_name",
+]
@@ -0,0 +1,96 @@
+"""Base session store class."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from itertools import islice
+from typing import Any
+
+
+class SessionStore(ABC):
+    """Abstract base class for session storage backends.
+
+    Stores persist session dicts as given; timestamps are managed by
+    ``hire.session``, so copying sessions between stores preserves them.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    def save(self, session: dict[str, Any]) -> None:
+        """Insert or replace a session and make it the agent's latest."""
+        pass
+
+    @abstractmethod
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        """
+        Get a session by ID.
+
+        Args:
+            session_id: Full session ID or a unique prefix of one
+
+        Returns:
+            The session, or None if nothing matches
+
+        Raises:
+            ValueError: If the prefix matches more than one session
+        """
+        pass
+
+    @abstractmethod
+    def get_by_name(self, name: str) -> dict[str, Any] | None:
+        """Get the most recently updated session with the given name."""
+        pass
+
+    @abstractmethod
+    def get_latest(self, agent: str) -> dict[str, Any] | None:
+        """Get the latest session for an agent."""
+        pass
+
+    @abstractmethod
+    def list_sessions(self, agent: str | None = None) -> list[dict[str, Any]]:
+        """List sessions sorted by updated_at descending."""
+        pass
+
+    def iter_sessions(
+        self,
+        agent: str | None = None,
+        since: str | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield sessions sorted by updated_at descending, one at a time.
+
+        Only sessions updated at or after since (an ISO timestamp) are
+        included; offset and limit page through the result. Override when the
+        store can avoid building the full list first.
+        """
+        sessions = (
+            s for s in self.list_sessions(agent)
+            if since is None or s.get("updated_at", "") >= since
+        )
+        stop = None if limit is None else offset + limit
+        yield from islice(sessions, offset, stop)
+
+    def count(self, agent: str | None = None) -> int:
+        """Count sessions, optionally only those of one agent.
+
+        Override when the store can count without loading every session.
+        """
+        return len(self.list_sessions(agent))
+
+    @abstractmethod
+    def delete(self, session: dict[str, Any]) -> bool:
+        """Delete a session. Returns True if it existed."""
+        pass
+
+    def delete_many(self, sessions: list[dict[str, Any]]) -> int:
+        """Delete several sessions. Returns how many existed.
+
+        Override when the store can do better than one delete() per session.
+        """
+        return sum(1 for session in sessions if self.delete(session))
+
+    @abstractmethod
+    def reindex(self) -> None:
+        """Rebuild the store's lookup structures (indexes) from its sessions."""
+        pass
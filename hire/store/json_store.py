@@ -0,0 +1,481 @@
+"""JSON file session store (one file per session)."""
+
+import bisect
+import heapq
+import json
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from ..config import load_config
+from ..fileutil import atomic_write_json, atomic_write_lines, file_lock
+from ..paths import get_sessions_dir
+from .base import SessionStore
+
+# Bump when the on-disk index layout changes; older indexes are rebuilt.
+INDEX_VERSION = 2
+INDEX_FILENAME = "index.jsonl"
+LOCK_FILENAME = ".lock"
+# Index written by earlier versions, removed when the index is rebuilt
+OLD_INDEX_FILENAME = "index.json"
+
+# The index log is compacted (by the next reader) once it has more than
+# this many records and twice as many as there are sessions
+COMPACT_MIN_RECORDS = 1000
+
+# Index entry: (agent, name, updated_at)
+Entry = tuple[str, str | None, str]
+
+
+class JsonSessionStore(SessionStore):
+    """Store each session as sessions/<agent>/<id>.json.
+
+    Each agent directory also holds a latest.json pointer. sessions/index.jsonl
+    is an append-only log of (id, agent, name, updated_at) for every save and
+    delete, so a save appends one line instead of rewriting the index. It is
+    compacted once most of its records are outdated. Every record also holds
+    the mtimes of the agent directories after the write, which tells readers
+    whether sessions were added or removed behind the index's back.
+
+    Lookups by exact ID read the session file directly. Prefix, name and
+    listing lookups use the index, kept in memory and read incrementally as
+    the log grows; listings read only the session files they return.
+
+    Every file is replaced atomically, and writers serialize on an advisory
+    lock (sessions/.lock), so concurrent hire processes never leave a
+    truncated file or a latest pointer to the wrong session. Readers take
+    the lock only to rebuild a stale index.
+    """
+
+    name = "json"
+
+    def __init__(self) -> None:
+        # Guards the in-memory index below against concurrent threads
+        self._mutex = threading.RLock()
+        # Whether this thread holds the writers' lock (which is not reentrant)
+        self._local = threading.local()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget the in-memory index, so the log is read from the start."""
+        self._entries: dict[str, Entry] = {}
+        self._names: dict[str, set[str]] = {}
+        self._sorted_ids: list[str] | None = None
+        self._dirs: dict[str, int] | None = None
+        # Identity of the log file read so far, bytes consumed and records seen
+        self._file_key: tuple[int, int] | None = None
+        self._offset = 0
+        self._records = 0
+        self._valid = False
+
+    def _fsync(self) -> bool:
+        """Whether writes are flushed to disk (storage.fsync in config)."""
+        return bool(load_config().get("storage", {}).get("fsync", False))
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Take the writers' lock, unless this thread already holds it."""
+        if getattr(self._local, "locked", False):
+            yield
+            return
+        with self._mutex, file_lock(get_sessions_dir() / LOCK_FILENAME):
+            self._local.locked = True
+            try:
+                yield
+            finally:
+                self._local.locked = False
+
+    def _write_json(self, path: Path, data: Any, indent: int | None = None) -> os.stat_result:
+        """Atomically replace a JSON file."""
+        return atomic_write_json(path, data, indent=indent, fsync=self._fsync())
+
+    def _get_index_path(self) -> Path:
+        """Get the session index path (sessions/index.jsonl)."""
+        return get_sessions_dir() / INDEX_FILENAME
+
+    def _agent_dir_stamps(self) -> dict[str, int]:
+        """Get the mtime of every agent sessions directory.
+
+        A directory's mtime changes whenever a file is created or removed in it,
+        so comparing these against the stamps recorded in the index tells us if
+        sessions were added or deleted behind the index's back.
+        """
+        sessions_base = get_sessions_dir()
+        return {
+            d.name: d.stat().st_mtime_ns
+            for d in sessions_base.iterdir()
+            if d.is_dir()
+        }
+
+    def _iter_session_files(self, agent_dir: Path) -> Iterator[Path]:
+        """Iterate over session files in an agent directory."""
+        for session_file in agent_dir.glob("*.json"):
+            if session_file.name == "latest.json":
+                continue
+            yield session_file
+
+    def _read_session(self, path: Path) -> dict[str, Any] | None:
+        """Read a session file, or None if it is gone or unreadable."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                session = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return session if isinstance(session, dict) else None
+
+    # --- index ------------------------------------------------------------
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        """Apply one index record to the in-memory index."""
+        self._records += 1
+        if "dirs" in record:
+            self._dirs = record["dirs"]
+        if "version" in record:
+            if record["version"] != INDEX_VERSION:
+                self._valid = False
+            return
+        session_id = record["id"]
+        old = self._entries.pop(session_id, None)
+        if old is not None and old[1] is not None:
+            self._names.get(old[1], set()).discard(session_id)
+        if not record.get("deleted"):
+            entry = (record["agent"], record.get("name"), record.get("updated_at", ""))
+            self._entries[session_id] = entry
+            if entry[1] is not None:
+                self._names.setdefault(entry[1], set()).add(session_id)
+        if old is None or record.get("deleted"):
+            self._sorted_ids = None
+
+    def _refresh(self) -> None:
+        """Read index records appended since the last call."""
+        try:
+            with open(self._get_index_path(), "rb") as f:
+                stat = os.fstat(f.fileno())
+                key = (stat.st_dev, stat.st_ino)
+                if key != self._file_key or stat.st_size < self._offset:
+                    # New, or replaced by a compaction or rebuild
+                    self._reset()
+                    self._file_key = key
+                    self._valid = True
+                if stat.st_size == self._offset:
+                    return
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            self._reset()
+            return
+        # A record still being written has no newline yet; leave it for later
+        end = data.rfind(b"\n") + 1
+        first = self._offset == 0
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+                if first and record.get("version") != INDEX_VERSION:
+                    raise ValueError("not a current index")
+                first = False
+                self._apply(record)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                # Torn by a crash or from another version: rebuild
+                self._valid = False
+        self._offset += end
+
+    def _fresh(self) -> bool:
+        """Whether the in-memory index is valid and no session was added or removed since."""
+        return self._valid and self._dirs == self._agent_dir_stamps()
+
+    def _load_index(self) -> None:
+        """Bring the in-memory index up to date, rebuilding it if missing or stale."""
+        with self._mutex:
+            self._refresh()
+            if self._fresh() and self._records <= max(COMPACT_MIN_RECORDS, 2 * len(self._entries)):
+                return
+        # A writer may be between writing a file and logging it; wait for it
+        with self._lock():
+            self._refresh()
+            if not self._fresh():
+                self._rebuild_index()
+            elif self._records > max(COMPACT_MIN_RECORDS, 2 * len(self._entries)):
+                self._write_index(dict(self._entries), self._agent_dir_stamps())
+
+    def _rebuild_index(self) -> None:
+        """Rebuild the session index by scanning every session file (under the lock).
+
+        This is the slow path, used when the index is missing, corrupt or stale.
+        """
+        # Stamp before scanning: a file added mid-scan then shows up as stale
+        dirs = self._agent_dir_stamps()
+        entries: dict[str, Entry] = {}
+        for agent_dir in get_sessions_dir().iterdir():
+            if not agent_dir.is_dir():
+                continue
+            for session_file in self._iter_session_files(agent_dir):
+                session = self._read_session(session_file)
+                if session is None or "id" not in session or "agent" not in session:
+                    continue
+                entries[session["id"]] = (
+                    session["agent"],
+                    session.get("name"),
+                    session.get("updated_at", ""),
+                )
+        self._write_index(entries, dirs)
+        (get_sessions_dir() / OLD_INDEX_FILENAME).unlink(missing_ok=True)
+
+    def _write_index(self, entries: dict[str, Entry], dirs: dict[str, int]) -> None:
+        """Replace the index log with one record per session."""
+        lines = [json.dumps({"version": INDEX_VERSION, "dirs": dirs}) + "\n"]
+        for session_id, (agent, name, updated_at) in entries.items():
+            record = {"id": session_id, "agent": agent, "name": name, "updated_at": updated_at}
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        atomic_write_lines(self._get_index_path(), lines, fsync=self._fsync())
+        self._reset()
+        self._refresh()
+
+    def _append_index(self, records: list[dict[str, Any]]) -> None:
+        """Append records to the index log (under the lock), stamping the last one."""
+        records[-1]["dirs"] = self._agent_dir_stamps()
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+        with open(self._get_index_path(), "a+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    # Finish a record torn by a crash so it stays on its own line
+                    data = b"\n" + data
+            f.write(data)
+            if self._fsync():
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _last_stamps(self) -> dict[str, int] | None:
+        """Get the directory stamps of the index log's last record, or None if unreadable.
+
+        Every record carries them, so this is all a writer needs to check
+        the index is current without reading the whole log.
+        """
+        try:
+            with open(self._get_index_path(), "rb") as f:
+                end = f.seek(0, os.SEEK_END)
+                f.seek(max(0, end - 65536))
+                lines = f.read().split(b"\n")
+            # The last element is empty if the log ends in a complete record
+            if len(lines) < 2 or lines[-1]:
+                return None
+            dirs = json.loads(lines[-2]).get("dirs")
+        except (OSError, ValueError, AttributeError):
+            return None
+        return dirs if isinstance(dirs, dict) else None
+
+    def reindex(self) -> None:
+        """Rebuild the session index from the session files."""
+        with self._lock():
+            self._rebuild_index()
+
+    # --- store API --------------------------------------------------------
+
+    def save(self, session: dict[str, Any]) -> None:
+        """Save a session to file."""
+        with self._lock():
+            # Check the index is current before touching files (even creating
+            # the agent directory), so our own writes are not mistaken for
+            # external changes. Only a stale index needs reading in full.
+            if self._last_stamps() != self._agent_dir_stamps():
+                self._load_index()
+            sessions_dir = get_sessions_dir(session["agent"])
+
+            # Use session ID as filename (1 file per session)
+            filename = f"{session['id']}.json"
+            filepath = sessions_dir / filename
+            self._write_json(filepath, session, indent=2)
+
+            # Update latest pointer
+            latest_path = sessions_dir / "latest.json"
+            self._write_json(latest_path, {"session_id": session["id"], "filename": filename})
+
+            self._append_index([{
+                "id": session["id"],
+                "agent": session["agent"],
+                "name": session.get("name"),
+                "updated_at": session.get("updated_at", ""),
+            }])
+
+    def get_latest(self, agent: str) -> dict[str, Any] | None:
+        """Get the latest session for an agent."""
+        sessions_dir = get_sessions_dir(agent)
+        latest_path = sessions_dir / "latest.json"
+
+        if not latest_path.exists():
+            return None
+
+        try:
+            with open(latest_path, encoding="utf-8") as f:
+                latest = json.load(f)
+            return self._read_session(sessions_dir / latest["filename"])
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        """Get a session by its ID, with prefix matching."""
+        if not session_id:
+            return None
+
+        # Exact match takes priority, and needs no index
+        if Path(session_id).name == session_id and session_id != "latest":
+            for agent_dir in get_sessions_dir().iterdir():
+                path = agent_dir / f"{session_id}.json"
+                if agent_dir.is_dir() and path.exists():
+                    session = self._read_session(path)
+                    if session is not None:
+                        return session
+
+        # Prefix match, by bisecting the sorted IDs
+        with self._mutex:
+            self._load_index()
+            if self._sorted_ids is None:
+                self._sorted_ids = sorted(self._entries)
+            ids = self._sorted_ids
+            # IDs sharing the prefix are contiguous; the range ends before prefix + U+10FFFF
+            first = bisect.bisect_left(ids, session_id)
+            last = bisect.bisect_left(ids, session_id + "\U0010ffff", first)
+            matches = [(i, self._entries[i][0]) for i in ids[first:min(last, first + 1)]]
+            count = last - first
+
+        if count == 1:
+            match_id, agent = matches[0]
+            return self._read_session(get_sessions_dir(agent) / f"{match_id}.json")
+        elif count > 1:
+            raise ValueError(
+                f"Ambiguous session ID '{session_id}' matches {count} sessions"
+            )
+        return None
+
+    def get_by_name(self, name: str) -> dict[str, Any] | None:
+        """Get a session by its name."""
+        with self._mutex:
+            self._load_index()
+            candidates = sorted(
+                ((self._entries[i][2], i, self._entries[i][0]) for i in self._names.get(name, ())),
+                reverse=True,
+            )
+        for _, session_id, agent in candidates:
+            session = self._read_session(get_sessions_dir(agent) / f"{session_id}.json")
+            if session is not None:
+                return session
+        return None
+
+    def list_sessions(self, agent: str | None = None) -> list[dict[str, Any]]:
+        """List all sessions, optionally filtered by agent."""
+        return list(self.iter_sessions(agent))
+
+    def iter_sessions(
+        self,
+        agent: str | None = None,
+        since: str | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield sessions newest first, reading each file only as it is yielded.
+
+        Sorting and paging use the index alone; with a limit, only the top
+        offset + limit entries are selected (a heap) instead of sorting them all.
+        """
+        with self._mutex:
+            self._load_index()
+            matching = [
+                (updated_at, session_id, entry_agent)
+                for session_id, (entry_agent, _, updated_at) in self._entries.items()
+                if (agent is None or entry_agent == agent)
+                and (since is None or updated_at >= since)
+            ]
+
+        def key(item: tuple[str, str, str]) -> str:
+            return item[0]
+
+        if limit is None:
+            matching.sort(key=key, reverse=True)
+            page = matching[offset:]
+        else:
+            page = heapq.nlargest(offset + limit, matching, key=key)[offset:]
+        for _, session_id, entry_agent in page:
+            session = self._read_session(get_sessions_dir(entry_agent) / f"{session_id}.json")
+            if session is not None:
+                yield session
+
+    def count(self, agent: str | None = None) -> int:
+        """Count sessions from the index, without reading their files."""
+        with self._mutex:
+            self._load_index()
+            if agent is None:
+                return len(self._entries)
+            return sum(1 for entry in self._entries.values() if entry[0] == agent)
+
+    def _session_path(self, session: dict[str, Any]) -> Path | None:
+        """Get the file for a session, or None if its ID is not a plain filename."""
+        session_id = session["id"]
+        if not session_id or Path(session_id).name != session_id:
+            return None
+        return get_sessions_dir(session["agent"]) / f"{session_id}.json"
+
+    def _repoint_latest(self, agent: str) -> None:
+        """Point the agent's latest.json at its most recent remaining session."""
+        latest_path = get_sessions_dir(agent) / "latest.json"
+        if not latest_path.exists():
+            return
+        try:
+            with open(latest_path, encoding="utf-8") as f:
+                latest = json.load(f)
+            if latest["session_id"] in self._entries:
+                return
+
+            # Find next most recent session for this agent
+            remaining = [
+                (updated_at, session_id)
+                for session_id, (entry_agent, _, updated_at) in self._entries.items()
+                if entry_agent == agent
+            ]
+            if remaining:
+                # Update latest to point to most recent remaining
+                _, next_id = max(remaining)
+                self._write_json(latest_path, {
+                    "session_id": next_id,
+                    "filename": f"{next_id}.json"
+                })
+            else:
+                # No sessions left, remove latest.json
+                latest_path.unlink()
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            # If we can't read latest.json, just try to delete it
+            latest_path.unlink(missing_ok=True)
+
+    def delete(self, session: dict[str, Any]) -> bool:
+        """Delete a session."""
+        return self.delete_many([session]) == 1
+
+    def delete_many(self, sessions: list[dict[str, Any]]) -> int:
+        """Delete sessions by path, then fix each affected latest pointer once."""
+        deleted: list[dict[str, Any]] = []
+
+        with self._lock():
+            self._load_index()
+            for session in sessions:
+                path = self._session_path(session)
+                if path is None:
+                    continue
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                deleted.append(session)
+
+            if not deleted:
+                return 0
+            for session in deleted:
+                self._apply({"id": session["id"], "deleted": True})
+                self._records -= 1
+            for agent in {session["agent"] for session in deleted}:
+                self._repoint_latest(agent)
+            self._append_index([{"id": session["id"], "deleted": True} for session in deleted])
+
+        return len(deleted)
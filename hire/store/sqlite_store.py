@@ -0,0 +1,227 @@
+"""SQLite session store (single database file)."""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from ..config import load_config
+from ..paths import get_data_dir
+from .base import SessionStore
+
+DB_FILENAME = "sessions.db"
+
+# Rows fetched at a time when iterating over sessions
+FETCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    name TEXT,
+    updated_at TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_agent_updated ON sessions (agent, updated_at);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at);
+CREATE INDEX IF NOT EXISTS sessions_name ON sessions (name, updated_at);
+"""
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Get the smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class SqliteSessionStore(SessionStore):
+    """Store all sessions in one SQLite database in WAL mode.
+
+    The latest session for an agent is the one with the newest updated_at,
+    which an index answers directly, so no separate pointer is kept.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or get_data_dir() / DB_FILENAME
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            # Autocommit mode; writes use explicit transactions via `with conn`
+            conn = sqlite3.connect(
+                self.path,
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            # FULL syncs the WAL on every commit; NORMAL can lose the last
+            # commits on power loss but never corrupts the database
+            fsync = load_config().get("storage", {}).get("fsync", False)
+            conn.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _query(self, sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
+        """Run a query and decode the data column of every row."""
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save(self, session: dict[str, Any]) -> None:
+        """Insert or replace a session."""
+        data = json.dumps(session, ensure_ascii=False)
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions (id, agent, name, updated_at, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        session["id"],
+                        session["agent"],
+                        session.get("name"),
+                        session.get("updated_at", ""),
+                        data,
+                    ),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        """Get a session by its ID, with prefix matching."""
+        if not session_id:
+            return None
+
+        # Exact match takes priority
+        rows = self._query("SELECT data FROM sessions WHERE id = ?", (session_id,))
+        if rows:
+            return rows[0]
+
+        # Prefix match, as an index range scan
+        matches = self._query(
+            "SELECT data FROM sessions WHERE id >= ? AND id < ?",
+            (session_id, _prefix_upper_bound(session_id)),
+        )
+        if len(matches) == 1:
+            return matches[0]
+        elif len(matches) > 1:
+            raise ValueError(
+                f"Ambiguous session ID '{session_id}' matches {len(matches)} sessions"
+            )
+        return None
+
+    def get_by_name(self, name: str) -> dict[str, Any] | None:
+        """Get a session by its name."""
+        rows = self._query(
+            "SELECT data FROM sessions WHERE name = ? ORDER BY updated_at DESC LIMIT 1",
+            (name,),
+        )
+        return rows[0] if rows else None
+
+    def get_latest(self, agent: str) -> dict[str, Any] | None:
+        """Get the latest session for an agent."""
+        rows = self._query(
+            "SELECT data FROM sessions WHERE agent = ? ORDER BY updated_at DESC LIMIT 1",
+            (agent,),
+        )
+        return rows[0] if rows else None
+
+    def list_sessions(self, agent: str | None = None) -> list[dict[str, Any]]:
+        """List all sessions, optionally filtered by agent."""
+        if agent:
+            return self._query(
+                "SELECT data FROM sessions WHERE agent = ? ORDER BY updated_at DESC",
+                (agent,),
+            )
+        return self._query("SELECT data FROM sessions ORDER BY updated_at DESC")
+
+    def iter_sessions(
+        self,
+        agent: str | None = None,
+        since: str | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield sessions newest first, reading FETCH_SIZE rows at a time.
+
+        Filtering and paging happen in SQL on the updated_at indexes, so a
+        limited listing reads only the rows it returns.
+        """
+        where = []
+        params: list[Any] = []
+        if agent:
+            where.append("agent = ?")
+            params.append(agent)
+        if since is not None:
+            where.append("updated_at >= ?")
+            params.append(since)
+        sql = "SELECT data FROM sessions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        # SQLite needs a LIMIT for OFFSET; -1 means no limit
+        sql += " ORDER BY updated_at DESC LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+
+        with self._lock:
+            cursor = self._connect().execute(sql, params)
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    return
+                for row in rows:
+                    yield json.loads(row[0])
+        finally:
+            cursor.close()
+
+    def count(self, agent: str | None = None) -> int:
+        """Count sessions with COUNT(*), optionally for one agent."""
+        sql = "SELECT COUNT(*) FROM sessions"
+        params: tuple[Any, ...] = ()
+        if agent:
+            sql += " WHERE agent = ?"
+            params = (agent,)
+        with self._lock:
+            row = self._connect().execute(sql, params).fetchone()
+        return int(row[0])
+
+    def delete(self, session: dict[str, Any]) -> bool:
+        """Delete a session."""
+        with self._lock:
+            cursor = self._connect().execute(
+                "DELETE FROM sessions WHERE id = ?", (session["id"],)
+            )
+        return cursor.rowcount > 0
+
+    def delete_many(self, sessions: list[dict[str, Any]]) -> int:
+        """Delete several sessions in one transaction."""
+        with self._lock:
+            conn = self._connect()
+            before = conn.total_changes
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "DELETE FROM sessions WHERE id = ?",
+                    [(session["id"],) for session in sessions],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return conn.total_changes - before
+
+    def reindex(self) -> None:
+        """Rebuild the database's indexes."""
+        with self._lock:
+            self._connect().execute("REINDEX sessions")
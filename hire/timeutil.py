@@ -0,0 +1,15 @@
+"""Time and duration helpers."""
+
+import re
+from datetime import timedelta
+
+DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse a duration like 30m, 12h, 7d or 2w."""
+    match = re.fullmatch(r"(\d+)([smhdw])", value.strip())
+    if not match:
+        raise ValueError(f"Invalid duration '{value}' (expected e.g. 30m, 12h, 7d, 2w)")
+    amount, unit = match.groups()
+    return timedelta(**{DURATION_UNITS[unit]: int(amount)})
@@ -0,0 +1,83 @@
+"""Lightweight timing spans for profiling a hire invocation.
+
+Imported on every start, so it avoids pulling in anything heavier than time.
+"""
+
+import os
+import time
+
+# (name, seconds) for every finished span, in completion order
+_spans: list[tuple[str, float]] = []
+_main_start: float | None = None
+# Seconds between process start and mark_start(), when the OS tells us
+_startup: float | None = None
+
+
+def _process_age() -> float | None:
+    """Seconds since this process started (Linux only, 10ms resolution)."""
+    try:
+        with open("/proc/self/stat", encoding="ascii") as f:
+            # Fields after the ")" that ends the command name start at field 3;
+            # starttime is field 22
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def mark_start() -> None:
+    """Record that hire's own code has started running (call first thing in main)."""
+    global _main_start, _startup
+    _main_start = time.perf_counter()
+    _startup = _process_age()
+
+
+class _Span:
+    """Context manager behind span()."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        _spans.append((self.name, time.perf_counter() - self.start))
+
+
+def span(name: str) -> _Span:
+    """Time a block of work under a name (use with `with`)."""
+    return _Span(name)
+
+
+def record(name: str, seconds: float) -> None:
+    """Record a span measured elsewhere."""
+    _spans.append((name, seconds))
+
+
+def get_timings() -> dict[str, float]:
+    """Get total seconds per span name, plus startup and total when known.
+
+    Spans with the same name (e.g. several session lookups) are summed.
+    """
+    timings: dict[str, float] = {}
+    if _startup is not None:
+        timings["startup"] = _startup
+    for name, seconds in _spans:
+        timings[name] = timings.get(name, 0.0) + seconds
+    if _main_start is not None:
+        timings["total"] = time.perf_counter() - _main_start + (_startup or 0.0)
+    return {name: round(seconds, 6) for name, seconds in timings.items()}
+
+
+def format_timings(timings: dict[str, float]) -> str:
+    """Format timings as an aligned table of milliseconds."""
+    width = max((len(name) for name in timings), default=0)
+    return "\n".join(
+        f"{name:<{width}}  {seconds * 1000:10.1f} ms" for name, seconds in timings.items()
+    )
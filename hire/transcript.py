@@ -0,0 +1,209 @@
+"""Per-session transcripts: an append-only log of every turn.
+
+Each session's turns go to transcripts/<id>.jsonl in the data directory, one
+JSON record per line, or to <id>.jsonl.gz with transcripts.compress, where
+each record is its own gzip member (so the file is still a valid gzip
+stream). Earlier turns are never rewritten.
+
+Next to the log, <id>.idx holds the byte offset and length of every record
+as two fixed 8-byte integers. Counting turns is a stat of that file, and
+reading the last N turns or a range seeks straight to their records instead
+of parsing the whole log. Writers serialize on <id>.lock, which stays in
+place after its transcript is archived or deleted: unlinking it would let a
+writer still waiting on the old file and one opening a new file hold the
+lock at the same time.
+
+Garbage collection moves transcripts to archive/transcripts/ along with
+their sessions; only an explicit delete removes them.
+
+Settings under transcripts in config.json:
+
+    enabled     record turns (default: true)
+    compress    gzip new transcripts (default: false)
+"""
+
+import json
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .config import load_config
+from .fileutil import file_lock
+from .paths import ensure_dir, get_data_dir
+
+# Offset and length of a record, as little-endian unsigned 64-bit integers
+ENTRY = struct.Struct("<QQ")
+
+
+def get_transcript_config() -> dict[str, Any]:
+    """Get the transcript settings from config, with defaults filled in."""
+    config = load_config().get("transcripts", {})
+    return {
+        "enabled": config.get("enabled", True),
+        "compress": config.get("compress", False),
+    }
+
+
+def get_transcripts_dir() -> Path:
+    """Get the transcripts directory (~/.local/share/hire/transcripts/)."""
+    return ensure_dir(get_data_dir() / "transcripts")
+
+
+def _valid_id(session_id: str) -> bool:
+    """Whether session_id can name files in the transcripts directory."""
+    return bool(session_id) and Path(session_id).name == session_id
+
+
+def _paths(session_id: str) -> tuple[Path | None, Path]:
+    """Get a session's existing log (None if it has none) and its offsets file."""
+    base = get_transcripts_dir()
+    for name in (f"{session_id}.jsonl", f"{session_id}.jsonl.gz"):
+        if (base / name).exists():
+            return base / name, base / f"{session_id}.idx"
+    return None, base / f"{session_id}.idx"
+
+
+def append_turn(session_id: str, turn: dict[str, Any], compress: bool = False) -> int:
+    """Append a turn to a session's transcript; return its 1-based number.
+
+    A new transcript is gzipped if compress is set; an existing one keeps
+    its format. Writers serialize on the session's lock file, which is kept
+    apart from the offsets file so that file can be appended to while the
+    lock is held (Windows locks byte ranges of the file itself).
+    """
+    if not _valid_id(session_id):
+        raise ValueError(f"Invalid session ID: {session_id!r}")
+    data = (json.dumps(turn, ensure_ascii=False) + "\n").encode("utf-8")
+    fsync = load_config().get("storage", {}).get("fsync", False)
+    base = get_transcripts_dir()
+    idx_path = base / f"{session_id}.idx"
+    with file_lock(base / f"{session_id}.lock"):
+        log_path, _ = _paths(session_id)
+        if log_path is None:
+            suffix = ".jsonl.gz" if compress else ".jsonl"
+            log_path = get_transcripts_dir() / f"{session_id}{suffix}"
+        if log_path.suffix == ".gz":
+            import gzip
+            data = gzip.compress(data)
+
+        with open(log_path, "ab") as log:
+            offset = log.seek(0, os.SEEK_END)
+            log.write(data)
+            if fsync:
+                log.flush()
+                os.fsync(log.fileno())
+        # The entry goes in only once its record is complete, so readers
+        # (who never lock) see whole records; a torn record is never indexed
+        with open(idx_path, "ab") as idx:
+            # Drop a partial entry left by a crash, which would misalign the rest
+            end = idx.seek(0, os.SEEK_END)
+            if end % ENTRY.size:
+                idx.truncate(end - end % ENTRY.size)
+            idx.write(ENTRY.pack(offset, len(data)))
+            number = idx.tell() // ENTRY.size
+            if fsync:
+                idx.flush()
+                os.fsync(idx.fileno())
+    return number
+
+
+def record_turn(
+    session: dict[str, Any],
+    prompt: str,
+    response: str | None,
+    model: str | None = None,
+) -> None:
+    """Append a completed turn to its session's transcript, unless transcripts are off."""
+    config = get_transcript_config()
+    if not config["enabled"]:
+        return
+    turn = {
+        "time": datetime.now().isoformat(),
+        "agent": session["agent"],
+        "model": model,
+        "prompt": prompt,
+        "response": response,
+    }
+    append_turn(session["id"], turn, compress=config["compress"])
+
+
+def count_turns(session_id: str) -> int:
+    """Get the number of turns in a session's transcript."""
+    _, idx_path = _paths(session_id)
+    try:
+        return idx_path.stat().st_size // ENTRY.size
+    except OSError:
+        return 0
+
+
+def read_turns(
+    session_id: str,
+    start: int = 0,
+    stop: int | None = None,
+) -> list[dict[str, Any]]:
+    """Read turns[start:stop] of a session's transcript (0-based, negatives from the end).
+
+    Only the index entries of the requested turns and the bytes they span
+    are read. Each turn gets its 1-based number as "turn".
+    """
+    log_path, idx_path = _paths(session_id)
+    if log_path is None:
+        return []
+    count = count_turns(session_id)
+    first, last, _ = slice(start, stop).indices(count)
+    if first >= last:
+        return []
+
+    with open(idx_path, "rb") as idx:
+        idx.seek(first * ENTRY.size)
+        entries = list(ENTRY.iter_unpack(idx.read((last - first) * ENTRY.size)))
+
+    # Records are contiguous apart from any torn by a crash, so read them in one go
+    base = entries[0][0]
+    with open(log_path, "rb") as log:
+        log.seek(base)
+        data = log.read(entries[-1][0] + entries[-1][1] - base)
+
+    compressed = log_path.suffix == ".gz"
+    turns = []
+    for number, (offset, length) in enumerate(entries, first + 1):
+        chunk = data[offset - base:offset - base + length]
+        if compressed:
+            import gzip
+            chunk = gzip.decompress(chunk)
+        turn = json.loads(chunk)
+        turn["turn"] = number
+        turns.append(turn)
+    return turns
+
+
+def _file_names(session_id: str) -> tuple[str, ...]:
+    return (f"{session_id}.jsonl", f"{session_id}.jsonl.gz", f"{session_id}.idx")
+
+
+def archive_transcript(session_id: str, archive_dir: Path) -> bool:
+    """Move a session's transcript into archive_dir; return whether it had one."""
+    if not _valid_id(session_id):
+        return False
+    base = get_transcripts_dir()
+    moved = False
+    with file_lock(base / f"{session_id}.lock"):
+        for name in _file_names(session_id):
+            try:
+                os.replace(base / name, archive_dir / name)
+            except FileNotFoundError:
+                continue
+            moved = True
+    return moved
+
+
+def remove_transcript(session_id: str) -> None:
+    """Delete a session's transcript, if it has one."""
+    if not _valid_id(session_id):
+        return
+    base = get_transcripts_dir()
+    with file_lock(base / f"{session_id}.lock"):
+        for name in _file_names(session_id):
+            (base / name).unlink(missing_ok=True)
@@ -0,0 +1,33 @@
+"""Shared fixtures: every test gets its own config and data directories."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import hire.config
+import hire.store
+
+
+@pytest.fixture(autouse=True)
+def hire_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point hire's XDG directories at a fresh temporary directory."""
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    monkeypatch.setenv("HIRE_NO_DAEMON", "1")
+    monkeypatch.setattr(hire.config, "_config_cache", None)
+    monkeypatch.setattr(hire.store, "_instances", {})
+    return tmp_path
+
+
+@pytest.fixture
+def write_config(hire_home: Path):
+    """Write the given settings as config.json."""
+
+    def write(settings: dict[str, Any]) -> None:
+        path = hire.config.get_config_path()
+        path.write_text(json.dumps(settings), encoding="utf-8")
+        hire.config._config_cache = None
+
+    return write
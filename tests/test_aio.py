@@ -0,0 +1,79 @@
+"""Tests for the asyncio agent and session API, using the fake agent."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from benchmarks.fake_agent import install
+from hire import aio, process
+from hire.adapters import get_adapter
+
+
+@pytest.fixture
+def claude(hire_home, write_config, monkeypatch):
+    monkeypatch.setenv("FAKE_STARTUP", "0")
+    monkeypatch.setenv("FAKE_LATENCY", "0.5")
+    monkeypatch.setattr(process, "_interrupted", threading.Event())
+    paths = install(hire_home / "bin")
+    write_config({"adapters": {"claude": {"command": paths["claude"], "args": []}}})
+    return get_adapter("claude")
+
+
+def test_concurrent_calls_overlap(claude):
+    async def main():
+        return await asyncio.gather(*(claude.aask(f"question {i}") for i in range(4)))
+
+    start = time.monotonic()
+    results = asyncio.run(main())
+    assert time.monotonic() - start < 1.5
+    assert all(r["response"] and not r.get("error") for r in results)
+    assert len({r["session_id"] for r in results}) == 4
+
+
+def test_astream_yields_text_then_result(claude):
+    async def main():
+        return [event async for event in claude.astream("hi")]
+
+    events = asyncio.run(main())
+    assert events[-1]["type"] == "result"
+    text = "".join(e["text"] for e in events if e["type"] == "text")
+    assert text == events[-1]["result"]["response"]
+
+
+def test_cancelling_kills_the_agent(claude, monkeypatch):
+    monkeypatch.setenv("FAKE_LATENCY", "30")
+
+    async def main():
+        task = asyncio.ensure_future(claude.aask("hi"))
+        while not process._children:
+            await asyncio.sleep(0.01)
+        [pid] = process._children
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(task, timeout=0.2)
+        return pid
+
+    start = time.monotonic()
+    pid = asyncio.run(main())
+    assert time.monotonic() - start < 5
+    assert not process._children
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_session_functions_run_concurrently():
+    async def main():
+        created = await asyncio.gather(
+            *(aio.acreate_session("claude", f"cli-{i}", name=f"s{i}") for i in range(5))
+        )
+        found = await aio.afind_session("s3")
+        listed = await aio.alist_sessions("claude")
+        deleted = await aio.adelete_sessions(created[:2])
+        return created, found, listed, deleted
+
+    created, found, listed, deleted = asyncio.run(main())
+    assert found["id"] == created[3]["id"]
+    assert len(listed) == 5
+    assert deleted == 2
@@ -0,0 +1,57 @@
+"""Tests for batch job parsing and runs, using the fake agent."""
+
+import json
+from argparse import Namespace
+
+import pytest
+
+from benchmarks.fake_agent import install
+from hire.commands.batch import parse_jobs, run_batch
+
+
+@pytest.fixture
+def claude(hire_home, write_config, monkeypatch):
+    monkeypatch.setenv("FAKE_STARTUP", "0")
+    monkeypatch.setenv("FAKE_LATENCY", "0")
+    paths = install(hire_home / "bin")
+    write_config({
+        "defaults": {"agent": "claude"},
+        "adapters": {"claude": {"command": paths["claude"], "args": []}},
+    })
+
+
+@pytest.mark.parametrize("line, error", [
+    ("not json", "Invalid job: Expecting value"),
+    ("[1, 2]", "Invalid job: expected a JSON object"),
+    ('{"agent": "claude"}', "Invalid job: missing 'message'"),
+    ('{"message": 5}', "Invalid job: 'message' must be a string"),
+    ('{"message": "hi", "agent": ["claude"]}', "Invalid job: 'agent' must be a string or null"),
+    ('{"message": "hi", "session": {"id": 1}}', "Invalid job: 'session' must be a string"),
+    ('{"message": "hi", "model": 4}', "Invalid job: 'model' must be a string or null"),
+])
+def test_invalid_jobs_get_an_error(line, error):
+    [job] = parse_jobs([line])
+    assert job["error"].startswith(error)
+    assert job["index"] == 0
+
+
+def test_optional_fields_may_be_null():
+    [job] = parse_jobs(['{"message": "hi", "agent": null, "name": null}'])
+    assert "error" not in job
+
+
+def test_invalid_lines_do_not_stop_the_batch(claude, hire_home, capsys):
+    path = hire_home / "jobs.jsonl"
+    path.write_text("\n".join([
+        '{"message": "first"}',
+        '{"message": 5}',
+        '{"message": "third", "name": ["x"]}',
+        '{"message": "fourth", "name": "kept"}',
+    ]) + "\n")
+
+    assert run_batch(Namespace(file=str(path), jobs=2, restart=False)) == 1
+    records = {r["index"]: r for r in map(json.loads, capsys.readouterr().out.splitlines())}
+    assert sorted(records) == [0, 1, 2, 3]
+    assert records[0]["response"] and records[3]["name"] == "kept"
+    assert records[1]["error"] == "Invalid job: 'message' must be a string"
+    assert records[2]["error"] == "Invalid job: 'name' must be a string or null"
@@ -0,0 +1,118 @@
+"""Tests for the response cache and how ask uses it, using the fake agent."""
+
+import io
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from benchmarks.fake_agent import install
+from hire import cli
+from hire.cache import (
+    cache_stats,
+    clear_cache,
+    evict,
+    get_cache_dir,
+    get_cached,
+    make_cache_key,
+    put_cached,
+)
+from hire.session import count_sessions, list_sessions
+
+
+class Terminal(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def hire(hire_home, write_config, monkeypatch, capsys):
+    """Run hire with the given arguments; return its exit code and JSON output."""
+    monkeypatch.setenv("FAKE_STARTUP", "0")
+    monkeypatch.setenv("FAKE_LATENCY", "0")
+    paths = install(hire_home / "bin")
+    write_config({"adapters": {"claude": {"command": paths["claude"], "args": []}}})
+
+    def run(*args: str) -> dict:
+        monkeypatch.setattr(sys, "argv", ["hire", *args, "--json"])
+        monkeypatch.setattr(sys, "stdin", Terminal())
+        assert cli.main() == 0
+        return json.loads(capsys.readouterr().out)
+
+    return run
+
+
+def test_key_changes_with_referenced_file(tmp_path):
+    attached = tmp_path / "notes.txt"
+    attached.write_text("first")
+    message = f"summarize @{attached}"
+    key = make_cache_key("claude", message, None, [])
+
+    assert make_cache_key("claude", message, None, []) == key
+    attached.write_text("second")
+    assert make_cache_key("claude", message, None, []) != key
+    assert make_cache_key("claude", message, "opus", []) != make_cache_key(
+        "claude", message, None, []
+    )
+
+
+def test_entries_expire_after_ttl():
+    put_cached("k", {"response": "cached", "session_id": "cli-1"})
+    assert get_cached("k", ttl=60) == {"response": "cached", "session_id": None}
+
+    path = get_cache_dir() / "k.json"
+    entry = json.loads(path.read_text())
+    entry["created_at"] -= 120
+    path.write_text(json.dumps(entry))
+    assert get_cached("k", ttl=60) is None
+    assert not path.exists()
+
+
+def test_least_recently_used_entries_are_evicted():
+    for i in range(3):
+        put_cached(f"k{i}", {"response": f"answer {i}"})
+        # Distinct mtimes, oldest first
+        past = time.time() - 100 + i
+        os.utime(get_cache_dir() / f"k{i}.json", (past, past))
+    get_cached("k0")  # Using k0 makes k1 the least recently used
+
+    put_cached("k3", {"response": "answer 3"}, max_entries=3)
+    assert get_cached("k1") is None
+    assert get_cached("k0") is not None
+    assert evict(max_entries=1, max_bytes=10**9) == 2
+
+
+def test_stats_count_hits_and_misses():
+    put_cached("k", {"response": "cached"})
+    get_cached("k")
+    get_cached("k")
+    get_cached("missing")
+
+    stats = cache_stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 2, 1)
+    assert stats["bytes"] > 0
+    assert clear_cache() == 1
+    assert cache_stats()["hits"] == 0
+
+
+def test_hit_starts_no_session(hire):
+    first = hire("claude", "hello", "--cache")
+    assert first["session_id"]
+
+    second = hire("claude", "hello", "--cache")
+    assert second["cached"]
+    assert second["response"] == first["response"]
+    assert second["session_id"] is None
+    # The first session still owns its agent conversation alone
+    assert count_sessions() == 1
+    assert list_sessions()[0]["cli_session_id"] == first["cli_session_id"]
+
+
+def test_named_sessions_bypass_cache(hire):
+    hire("claude", "hello", "--cache")
+    named = hire("claude", "hello", "--cache", "-n", "work")
+    assert "cached" not in named
+    assert named["name"] == "work"
+    assert count_sessions() == 2
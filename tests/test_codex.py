@@ -0,0 +1,81 @@
+"""Tests for the codex adapter's line-by-line JSONL parser."""
+
+import asyncio
+import json
+import sys
+import threading
+
+import pytest
+
+from hire import process
+from hire.adapters import get_adapter
+
+THREAD = json.dumps({"type": "thread.started", "thread_id": "thread-1"})
+FIRST = json.dumps({"type": "item.completed", "item": {"type": "agent_message", "text": "first"}})
+LAST = json.dumps({"type": "item.completed", "item": {"type": "agent_message", "text": "last"}})
+REASONING = json.dumps({"type": "item.completed", "item": {"type": "reasoning", "text": "hmm"}})
+
+# Output written in pieces that split events mid-line, with no final newline
+CHUNKS = [THREAD + "\n" + FIRST[:20], FIRST[20:] + "\n" + REASONING[:5],
+          REASONING[5:] + "\n" + LAST[:30], LAST[30:]]
+
+SCRIPT = """\
+import json, pathlib, sys, time
+for chunk in json.loads(pathlib.Path(__file__).with_suffix(".json").read_text()):
+    sys.stdout.write(chunk)
+    sys.stdout.flush()
+    time.sleep(0.05)
+"""
+
+
+@pytest.fixture
+def codex(hire_home, write_config, monkeypatch):
+    """Configure codex to run a script writing CHUNKS one at a time."""
+    monkeypatch.setattr(process, "_interrupted", threading.Event())
+    script = hire_home / "chunks.py"
+    script.write_text(SCRIPT)
+    script.with_suffix(".json").write_text(json.dumps(CHUNKS))
+    wrapper = hire_home / "codex"
+    wrapper.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+    wrapper.chmod(0o755)
+    write_config({"adapters": {"codex": {"command": str(wrapper), "args": []}}})
+    return get_adapter("codex")
+
+
+def test_parse_output_without_trailing_newline():
+    result = get_adapter("codex").parse_output("\n".join([THREAD, FIRST, REASONING, LAST]))
+    assert result["response"] == "last"
+    assert result["session_id"] == "thread-1"
+
+
+def test_ask_reassembles_split_lines(codex):
+    result = codex.ask("hi")
+    assert not result.get("error")
+    assert result["response"] == "last"
+    assert result["session_id"] == "thread-1"
+    # The final line is kept even though it never ended
+    assert result["raw"].endswith(LAST)
+
+
+def test_stream_reassembles_split_lines(codex):
+    events = list(codex.stream("hi"))
+    assert [e["text"] for e in events if e["type"] == "text"] == ["first", "\n\nlast"]
+    assert events[-1]["result"]["response"] == "last"
+
+
+def test_astream_reassembles_split_lines(codex):
+    async def main():
+        return [event async for event in codex.astream("hi")]
+
+    events = asyncio.run(main())
+    assert [e["text"] for e in events if e["type"] == "text"] == ["first", "\n\nlast"]
+    assert events[-1]["result"]["session_id"] == "thread-1"
+
+
+def test_captured_events(codex, write_config):
+    config = {"command": codex.build_command("hi")[0], "args": [],
+              "capture_events": ["item.completed"]}
+    write_config({"adapters": {"codex": config}})
+    result = codex.ask("hi")
+    items = [e["item"]["type"] for e in result["events"]]
+    assert items == ["agent_message", "reasoning", "agent_message"]
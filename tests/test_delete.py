@@ -0,0 +1,87 @@
+"""Tests for deleting sessions one at a time and in bulk by filter."""
+
+from argparse import Namespace
+from datetime import datetime, timedelta
+
+import pytest
+
+from hire.commands.delete import run_delete
+from hire.session import list_sessions
+from hire.store import get_store
+
+
+def days_ago(days: int) -> str:
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def sessions():
+    """Sessions of several agents, ages and names."""
+    for session_id, agent, name, age in [
+        ("c-old", "claude", None, 30),
+        ("c-new", "claude", "work-1", 1),
+        ("x-old", "codex", "work-2", 30),
+        ("x-new", "codex", None, 1),
+        ("g-old", "gemini", "personal", 30),
+    ]:
+        get_store().save({"id": session_id, "agent": agent, "name": name,
+                          "cli_session_id": f"cli-{session_id}",
+                          "created_at": days_ago(age), "updated_at": days_ago(age)})
+
+
+def delete(**options) -> int:
+    args = {"name_or_id": None, "all": False, "force": True, "agent": None,
+            "older_than": None, "name_glob": None}
+    return run_delete(Namespace(**{**args, **options}))
+
+
+def remaining() -> list[str]:
+    return sorted(s["id"] for s in list_sessions())
+
+
+def test_agent_filter(sessions):
+    assert delete(agent="codex") == 0
+    assert remaining() == ["c-new", "c-old", "g-old"]
+
+
+def test_older_than_filter(sessions):
+    assert delete(older_than="7d") == 0
+    assert remaining() == ["c-new", "x-new"]
+
+
+def test_name_glob_filter(sessions):
+    assert delete(name_glob="work-*") == 0
+    assert remaining() == ["c-old", "g-old", "x-new"]
+
+
+def test_filters_combine(sessions):
+    assert delete(agent="claude", older_than="7d") == 0
+    assert remaining() == ["c-new", "g-old", "x-new", "x-old"]
+
+
+def test_no_match_deletes_nothing(sessions, capsys):
+    assert delete(agent="gemini", name_glob="work-*") == 0
+    assert "No sessions to delete" in capsys.readouterr().out
+    assert len(remaining()) == 5
+
+
+def test_filters_and_name_conflict(sessions):
+    assert delete(name_or_id="c-old", agent="claude") == 1
+    assert len(remaining()) == 5
+
+
+def test_bad_duration(sessions, capsys):
+    assert delete(older_than="soon") == 1
+    assert capsys.readouterr().err.startswith("Error:")
+    assert len(remaining()) == 5
+
+
+def test_confirmation_is_required_without_force(sessions, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda prompt: "no")
+    assert delete(agent="claude", force=False) == 0
+    assert len(remaining()) == 5
+
+
+def test_delete_one_by_name(sessions):
+    assert delete(name_or_id="personal") == 0
+    assert remaining() == ["c-new", "c-old", "x-new", "x-old"]
@@ -0,0 +1,127 @@
+"""Tests for the JSON session store and its index log."""
+
+import json
+
+import pytest
+
+from hire.paths import get_sessions_dir
+from hire.store import json_store
+from hire.store.json_store import JsonSessionStore
+
+
+def make_session(session_id: str, agent: str = "claude", name: str | None = None,
+                 updated_at: str = "2024-01-01T00:00:00") -> dict:
+    return {
+        "id": session_id,
+        "agent": agent,
+        "name": name,
+        "cli_session_id": f"cli-{session_id}",
+        "created_at": updated_at,
+        "updated_at": updated_at,
+    }
+
+
+def index_records() -> list[dict]:
+    path = get_sessions_dir() / json_store.INDEX_FILENAME
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_save_appends_small_records():
+    store = JsonSessionStore()
+    store.save(make_session("aaa1", name="first"))
+    store.save(make_session("aaa2", agent="codex"))
+
+    records = index_records()
+    assert records[0]["version"] == json_store.INDEX_VERSION
+    assert [r["id"] for r in records[1:]] == ["aaa1", "aaa2"]
+    # Only the lookup fields, never the whole session
+    assert "cli_session_id" not in records[1]
+    assert set(records[-1]["dirs"]) == {"claude", "codex"}
+
+
+def test_count_reads_no_session_files(monkeypatch):
+    store = JsonSessionStore()
+    for i in range(3):
+        store.save(make_session(f"s{i}", agent="claude" if i else "codex"))
+
+    monkeypatch.setattr(store, "_read_session", lambda path: pytest.fail(f"read {path}"))
+    assert store.count() == 3
+    assert store.count("claude") == 2
+    assert store.count("gemini") == 0
+
+
+def test_delete_updates_index_and_latest():
+    store = JsonSessionStore()
+    store.save(make_session("s1", updated_at="2024-01-01T00:00:00"))
+    store.save(make_session("s2", updated_at="2024-01-02T00:00:00"))
+
+    assert store.delete_many([make_session("s2"), make_session("gone")]) == 1
+    assert store.get("s")["id"] == "s1"
+    assert store.get_latest("claude")["id"] == "s1"
+    assert index_records()[-1]["deleted"] is True
+
+    # A fresh process sees the same state from the log alone
+    assert [s["id"] for s in JsonSessionStore().list_sessions()] == ["s1"]
+
+
+def test_other_process_writes_are_picked_up():
+    reader = JsonSessionStore()
+    writer = JsonSessionStore()
+    writer.save(make_session("s1"))
+    assert reader.get("s")["id"] == "s1"
+
+    writer.save(make_session("s2", updated_at="2024-01-02T00:00:00"))
+    assert [s["id"] for s in reader.list_sessions()] == ["s2", "s1"]
+    writer.delete(make_session("s1"))
+    assert [s["id"] for s in reader.list_sessions()] == ["s2"]
+
+
+def test_stale_index_is_rebuilt():
+    store = JsonSessionStore()
+    store.save(make_session("s1"))
+
+    # A session file added behind the store's back, e.g. copied in by hand
+    path = get_sessions_dir("claude") / "s2.json"
+    path.write_text(json.dumps(make_session("s2", name="manual")), encoding="utf-8")
+
+    assert JsonSessionStore().get_by_name("manual")["id"] == "s2"
+    assert store.get("s2")["id"] == "s2"
+
+
+def test_corrupt_or_old_index_is_rebuilt():
+    store = JsonSessionStore()
+    store.save(make_session("s1", name="keep"))
+    index_path = get_sessions_dir() / json_store.INDEX_FILENAME
+
+    # A record torn by a crash, then another save appended after it
+    with open(index_path, "a", encoding="utf-8") as f:
+        f.write('{"id": "s9", "ag')
+    store.save(make_session("s2"))
+    assert {s["id"] for s in JsonSessionStore().list_sessions()} == {"s1", "s2"}
+
+    # An index from an older version
+    (get_sessions_dir() / json_store.OLD_INDEX_FILENAME).write_text("{}", encoding="utf-8")
+    index_path.write_text('{"version": 1}\n', encoding="utf-8")
+    assert JsonSessionStore().get_by_name("keep")["id"] == "s1"
+    assert index_records()[0]["version"] == json_store.INDEX_VERSION
+    assert not (get_sessions_dir() / json_store.OLD_INDEX_FILENAME).exists()
+
+
+def test_log_is_compacted(monkeypatch):
+    monkeypatch.setattr(json_store, "COMPACT_MIN_RECORDS", 10)
+    store = JsonSessionStore()
+    for _ in range(20):
+        store.save(make_session("s1"))
+    assert len(index_records()) > 20
+
+    # The next reader compacts it down to one record per session
+    assert JsonSessionStore().get("s")["id"] == "s1"
+    assert [r.get("id") for r in index_records()] == [None, "s1"]
+
+
+def test_reindex():
+    store = JsonSessionStore()
+    store.save(make_session("s1"))
+    (get_sessions_dir() / json_store.INDEX_FILENAME).unlink()
+    store.reindex()
+    assert [r.get("id") for r in index_records()] == [None, "s1"]
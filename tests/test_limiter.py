@@ -0,0 +1,153 @@
+"""Tests for the host-wide limiter and async slot handling."""
+
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from hire import limiter
+from hire.adapters import base, get_adapter
+from hire.limiter import (
+    SlotTimeoutError,
+    acquire_slot,
+    get_limits_dir,
+    limiter_status,
+    release_slot,
+)
+
+
+@pytest.fixture
+def limits(write_config):
+    """Set claude's limits."""
+
+    def configure(**settings):
+        write_config({"adapters": {"claude": settings}})
+
+    return configure
+
+
+def test_unlimited_agents_get_no_ticket(limits):
+    limits()
+    assert acquire_slot("claude") is None
+    assert not (get_limits_dir() / "claude.json").exists()
+
+
+def test_max_concurrent(limits):
+    limits(max_concurrent=2)
+    first = acquire_slot("claude")
+    second = acquire_slot("claude")
+    assert limiter_status("claude")["running"] == 2
+    with pytest.raises(SlotTimeoutError):
+        acquire_slot("claude", timeout=0.2)
+    # A caller that gave up leaves the queue
+    assert limiter_status("claude")["waiting"] == 0
+
+    release_slot("claude", first)
+    third = acquire_slot("claude", timeout=1)
+    assert third is not None
+    for ticket in (second, third):
+        release_slot("claude", ticket)
+    assert limiter_status("claude")["running"] == 0
+
+
+def test_waiting_callers_are_served_in_order(limits):
+    limits(max_concurrent=1)
+    held = acquire_slot("claude")
+    order: list[int] = []
+
+    def caller(number: int) -> None:
+        ticket = acquire_slot("claude", timeout=10)
+        order.append(number)
+        time.sleep(0.05)
+        release_slot("claude", ticket)
+
+    threads = []
+    for number in range(4):
+        thread = threading.Thread(target=caller, args=(number,))
+        thread.start()
+        threads.append(thread)
+        # Queue each caller before the next
+        while limiter_status("claude")["waiting"] < number + 1:
+            time.sleep(0.01)
+
+    release_slot("claude", held)
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3]
+
+
+def test_token_bucket_refills_at_the_rate(limits):
+    limits(rate_per_minute=600, burst=2)
+    start = time.monotonic()
+    tickets = [acquire_slot("claude") for _ in range(2)]
+    assert time.monotonic() - start < 0.05
+
+    # The burst is spent; the next token comes after 60 / 600 seconds
+    tickets.append(acquire_slot("claude"))
+    assert 0.08 <= time.monotonic() - start < 1
+    with pytest.raises(SlotTimeoutError):
+        acquire_slot("claude", timeout=0.01)
+    for ticket in tickets:
+        release_slot("claude", ticket)
+
+
+def test_dead_callers_are_dropped(limits):
+    limits(max_concurrent=1)
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    state = {
+        "queue": [{"ticket": "waiting", "pid": dead.pid, "since": 0}],
+        "running": {"stale": {"pid": dead.pid, "since": 0}},
+    }
+    (get_limits_dir() / "claude.json").write_text(json.dumps(state))
+
+    ticket = acquire_slot("claude", timeout=1)
+    state = json.loads((get_limits_dir() / "claude.json").read_text())
+    assert list(state["running"]) == [ticket]
+    assert state["queue"] == []
+
+
+def test_cancel_gives_up_the_place_in_line(limits):
+    limits(max_concurrent=1)
+    held = acquire_slot("claude")
+    cancel = threading.Event()
+    cancel.set()
+    assert acquire_slot("claude", timeout=1, cancel=cancel) is None
+    assert limiter_status("claude")["waiting"] == 0
+    release_slot("claude", held)
+
+
+def test_cancelled_async_caller_releases_its_slot(limits, monkeypatch):
+    limits(max_concurrent=1)
+    acquired = threading.Event()
+    proceed = threading.Event()
+
+    def slow_acquire(*args):
+        # The thread gets its slot, but hands it back only after the caller is cancelled
+        ticket = limiter.acquire_slot(*args)
+        acquired.set()
+        proceed.wait(5)
+        return ticket
+
+    monkeypatch.setattr(base, "acquire_slot", slow_acquire)
+    adapter = get_adapter("claude")
+
+    async def main():
+        task = asyncio.ensure_future(adapter.aask("hi"))
+        await asyncio.to_thread(acquired.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        proceed.set()
+        # Let the thread finish and the release run
+        for _ in range(100):
+            if limiter_status("claude")["running"] == 0:
+                break
+            await asyncio.sleep(0.02)
+
+    asyncio.run(main())
+    assert limiter_status("claude")["running"] == 0
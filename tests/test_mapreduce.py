@@ -0,0 +1,112 @@
+"""Tests for map-reduce chunking and the reduce loop, using the fake agent."""
+
+import json
+from argparse import Namespace
+
+import pytest
+
+from benchmarks.fake_agent import install
+from hire.commands import mapreduce
+from hire.commands.mapreduce import (
+    fill_reduce_prompt,
+    make_chunks,
+    run_mapreduce,
+    split_diff,
+)
+from hire.transcript import read_turns
+
+
+@pytest.fixture
+def files(hire_home, write_config, monkeypatch):
+    """Configure claude to run the fake agent and write four input files."""
+    monkeypatch.setenv("FAKE_STARTUP", "0")
+    monkeypatch.setenv("FAKE_LATENCY", "0")
+    paths = install(hire_home / "bin")
+    write_config({"adapters": {"claude": {"command": paths["claude"], "args": []}}})
+    names = []
+    for i in range(4):
+        path = hire_home / f"part{i}.txt"
+        path.write_text(f"line {i}\n" * 10)
+        names.append(str(path))
+    return names
+
+
+def mr(files: list[str], instruction: str = "summarize", **options) -> Namespace:
+    args = {
+        "agent": "claude", "instruction": instruction, "files": files, "split": None,
+        "chunk_tokens": 50, "jobs": 2, "model": None, "name": None, "reduce": None,
+        "json": True, "restart": False,
+    }
+    return Namespace(**{**args, **options})
+
+
+def test_fill_reduce_prompt_leaves_other_braces():
+    template = "Merge {count} answers as {\"json\": true}.\nTask: {instruction}"
+    prompt = fill_reduce_prompt(template, 3, "count {words} in {instruction}")
+    assert prompt == 'Merge 3 answers as {"json": true}.\nTask: count {words} in {instruction}'
+
+
+GIT_SHOW = """\
+commit 0123456789abcdef
+Author: A Developer <dev@example.com>
+
+    Fix the parser
+
+ a.py | 2 +-
+ 1 file changed, 1 insertion(+), 1 deletion(-)
+
+diff --git a/a.py b/a.py
+--- a/a.py
++++ b/a.py
+@@ -1 +1 @@
+-old
++new
+@@ -10 +10 @@
+-x
++y
+diff --git a/logo.png b/logo.png
+Binary files a/logo.png and b/logo.png differ
+"""
+
+
+def test_split_diff_keeps_text_outside_hunks():
+    pieces = split_diff(GIT_SHOW, by_hunk=False)
+    preamble, first, binary = pieces
+    assert preamble == ("", GIT_SHOW[:GIT_SHOW.index("diff --git")])
+    assert first[0].startswith("diff --git a/a.py") and first[1].startswith("@@ -1 ")
+    assert binary[1].startswith("diff --git a/logo.png")
+    assert "".join(header + text for header, text in pieces) == GIT_SHOW
+
+    hunks = split_diff(GIT_SHOW, by_hunk=True)
+    assert hunks[0] == preamble
+    assert [text.split("\n")[0] for _, text in hunks[1:3]] == ["@@ -1 +1 @@", "@@ -10 +10 @@"]
+    assert hunks[-1] == binary
+
+
+def test_make_chunks_repeats_headers():
+    chunks = make_chunks([("== a ==\n", "x\n" * 30)], max_chars=30)
+    assert len(chunks) > 1
+    assert all(chunk.startswith("== a ==\n") for chunk in chunks)
+
+
+def test_answers_reduce_to_one(files, capsys):
+    assert run_mapreduce(mr(files, instruction="list {todo} items")) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output["chunks"] == 4
+    assert output["reduce_levels"] == 2
+    assert output["response"]
+    # The final reduce call is recorded as the session's first turn
+    [turn] = read_turns(output["session_id"])
+    assert turn["prompt"].startswith("The input was split into 2 parts")
+    assert turn["response"] == output["response"]
+
+
+def test_custom_reduce_prompt_with_braces(files, capsys):
+    assert run_mapreduce(mr(files, reduce="Merge {count} as {json} for: {instruction}")) == 0
+    assert json.loads(capsys.readouterr().out)["response"]
+
+
+def test_reduce_levels_are_capped(files, capsys, monkeypatch):
+    monkeypatch.setattr(mapreduce, "MAX_REDUCE_LEVELS", 1)
+    assert run_mapreduce(mr(files)) == 1
+    assert "2 answers left after 1 reduce levels" in capsys.readouterr().err
@@ -0,0 +1,98 @@
+"""Tests for the metrics log, its rotation and the stats summary."""
+
+import json
+import time
+from argparse import Namespace
+
+from hire.commands.stats import run_stats
+from hire.metrics import (
+    _rotate,
+    get_metrics_path,
+    iter_records,
+    percentile,
+    record_call,
+    summarize,
+)
+
+
+def call(agent: str = "claude", ok: bool = True, agent_s: float | None = 1.0) -> None:
+    record_call(agent=agent, model=None, prompt_bytes=10, response_bytes=20, ok=ok,
+                agent_s=agent_s, overhead_s=0.01)
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([1.0, 2.0, 3.0], 50) == 2.0
+    assert percentile([], 50) is None
+
+
+def test_records_are_appended():
+    call()
+    call("codex", ok=False, agent_s=None)
+    records = list(iter_records())
+    assert [r["agent"] for r in records] == ["claude", "codex"]
+    assert records[1]["ok"] is False and records[1]["agent_s"] is None
+
+
+def test_disabled_metrics_write_nothing(write_config):
+    write_config({"metrics": {"enabled": False}})
+    call()
+    assert not get_metrics_path().exists()
+
+
+def test_log_rotates_by_size(write_config):
+    write_config({"metrics": {"max_bytes": 500, "backups": 2}})
+    for _ in range(40):
+        call()
+
+    path = get_metrics_path()
+    names = {p.name for p in path.parent.glob("metrics.jsonl*")}
+    # The live log may have just been rotated away
+    assert names - {"metrics.jsonl"} == {"metrics.jsonl.1", "metrics.jsonl.2"}
+    # Only the kept generations are read back, oldest first
+    timestamps = [r["ts"] for r in iter_records()]
+    assert timestamps == sorted(timestamps)
+    assert len(timestamps) < 40
+
+
+def test_rotation_rechecks_the_size():
+    call()
+    path = get_metrics_path()
+    path.with_name("metrics.jsonl.1").write_text("previous generation\n")
+
+    # A second process that saw the log over the limit finds it rotated already
+    _rotate(path, max_bytes=10_000, backups=3)
+    assert path.exists()
+    assert path.with_name("metrics.jsonl.1").read_text() == "previous generation\n"
+    assert not path.with_name("metrics.jsonl.2").exists()
+
+
+def test_summarize_per_agent():
+    now = time.time()
+    records = [{"agent": "claude", "ts": now - 1800, "ok": True, "agent_s": float(s),
+                "overhead_s": 0.1} for s in range(1, 11)]
+    records.append({"agent": "claude", "ts": now, "ok": False, "agent_s": None})
+    records.append({"agent": "codex", "ts": now, "ok": True, "agent_s": 2.0})
+
+    summary = summarize(records, since=now - 3600)
+    claude = summary["claude"]
+    assert claude["calls"] == 11
+    assert claude["errors"] == 1
+    assert claude["error_rate"] == round(1 / 11, 4)
+    assert claude["calls_per_hour"] == 11.0
+    assert (claude["p50_s"], claude["p95_s"], claude["p99_s"]) == (5.0, 10.0, 10.0)
+    assert claude["overhead_p50_s"] == 0.1
+    assert summary["codex"]["p50_s"] == 2.0
+    assert summary["codex"]["overhead_p50_s"] is None
+
+
+def test_stats_command_filters_by_agent(capsys):
+    call("claude")
+    call("codex")
+    assert run_stats(Namespace(target="codex", since="1h", json=True)) == 0
+    assert list(json.loads(capsys.readouterr().out)) == ["codex"]
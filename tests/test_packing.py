@@ -0,0 +1,88 @@
+"""Tests for prompt packing and the spill threshold of packed prompt files."""
+
+import hashlib
+import io
+
+from hire import packing
+from hire.packing import pack_lines, pack_prompt
+from hire.prompt_file import PromptFile, spill_prompt
+
+
+def packing_config(budget: int) -> dict:
+    return {"enabled": True, "budgets": {"claude": budget}, "head": 0.4, "tail": 0.4}
+
+
+def spill(text: str) -> PromptFile:
+    return spill_prompt([], io.BytesIO(text.encode()))
+
+
+def test_lines_within_budget_are_kept():
+    lines = [f"line {i}\n" for i in range(10)]
+    text, report = pack_lines(lines, budget=1000)
+    assert text == "".join(lines)
+    assert report["omitted_lines"] == 0
+
+
+def test_middle_repeats_are_collapsed():
+    lines = ["start\n"] * 5 + [f"retry {i} failed\n" for i in range(500)] + ["done\n"] * 5
+    text, report = pack_lines(lines, budget=200)
+    assert text.startswith("start\n")
+    assert text.endswith("done\n")
+    assert report["repeated_lines"] > 0
+    assert "similar]" in text
+    assert report["packed_tokens"] < report["estimated_tokens"]
+
+
+def test_long_lines_are_truncated():
+    text, report = pack_lines(["x" * 10_000 + "\n"], budget=100)
+    assert report["truncated_lines"] == 1
+    assert len(text) < 1000
+
+
+def test_prompt_within_budget_is_unchanged():
+    prompt = "short prompt"
+    assert pack_prompt(prompt, "claude", None, packing_config(1000)) == (prompt, None)
+
+
+def test_packed_result_is_cached():
+    prompt = "".join(f"line {i}\n" for i in range(2000))
+    first, report = pack_prompt(prompt, "claude", None, packing_config(200))
+    assert report is not None and not report["cached"]
+    second, report = pack_prompt(prompt, "claude", None, packing_config(200))
+    assert second == first
+    assert report["cached"]
+
+
+def test_cache_hit_survives_a_concurrent_prune(monkeypatch):
+    prompt = "".join(f"line {i}\n" for i in range(2000))
+    first, _ = pack_prompt(prompt, "claude", None, packing_config(200))
+
+    def pruned(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+
+    # Another process removes the entry between reading and touching it
+    monkeypatch.setattr(packing.os, "utime", pruned)
+    second, report = pack_prompt(prompt, "claude", None, packing_config(200))
+    assert second == first
+    assert report is not None and report["cached"]
+
+
+def test_small_packed_file_becomes_text(write_config):
+    write_config({"input": {"spill_bytes": 10_000}})
+    prompt = spill("".join(f"line {i}\n" for i in range(5000)))
+
+    packed, report = pack_prompt(prompt, "claude", None, packing_config(500))
+    assert isinstance(packed, str)
+    assert report is not None
+
+
+def test_spill_threshold_counts_bytes(write_config):
+    # Under the threshold in characters, but over it in UTF-8
+    write_config({"input": {"spill_bytes": 5000}})
+    prompt = spill("".join(f"{'€' * 20} {i}\n" for i in range(5000)))
+
+    packed, report = pack_prompt(prompt, "claude", None, packing_config(1000))
+    assert packed is prompt
+    data = prompt.path.read_bytes()
+    assert len(data.decode()) <= 5000 < len(data) == prompt.size
+    assert prompt.digest == hashlib.sha256(data).hexdigest()
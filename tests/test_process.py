@@ -0,0 +1,116 @@
+"""Tests for agent subprocess timeouts, retries and interrupts, using the fake agent."""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_agent import install
+from hire import process
+from hire.adapters import get_adapter
+from hire.process import run_command
+
+FAKE_AGENT = Path(__file__).resolve().parent.parent / "benchmarks" / "fake_agent.py"
+
+
+@pytest.fixture
+def fake_env(monkeypatch):
+    monkeypatch.setenv("FAKE_STARTUP", "0")
+    monkeypatch.setenv("FAKE_LATENCY", "0")
+    # A fresh interrupt flag, so kill_children() in one test cannot leak into another
+    monkeypatch.setattr(process, "_interrupted", threading.Event())
+
+
+@pytest.fixture
+def claude(fake_env, hire_home, write_config):
+    """Configure claude to run the fake agent and return a function to set its policy."""
+    paths = install(hire_home / "bin")
+
+    def configure(**policy):
+        write_config({"adapters": {"claude": {"command": paths["claude"], "args": [], **policy}}})
+        return get_adapter("claude")
+
+    return configure
+
+
+def fake_cmd(*args: str) -> list[str]:
+    return [sys.executable, str(FAKE_AGENT), "-p", "hi", "--output-format", "json", *args]
+
+
+def test_run_command_returns_output(fake_env, monkeypatch):
+    monkeypatch.setenv("FAKE_AGENT", "claude")
+    returncode, stdout, _ = run_command(fake_cmd(), timeout=10)
+    assert returncode == 0
+    assert json.loads(stdout)["type"] == "result"
+
+
+def test_run_command_kills_at_timeout(fake_env, monkeypatch):
+    monkeypatch.setenv("FAKE_AGENT", "claude")
+    monkeypatch.setenv("FAKE_LATENCY", "30")
+    start = time.monotonic()
+    returncode, _, _ = run_command(fake_cmd(), timeout=0.5)
+    assert returncode is None
+    assert time.monotonic() - start < 5
+
+
+def test_transient_failures_are_retried(claude, hire_home, monkeypatch):
+    failures = hire_home / "failures"
+    failures.write_text("2")
+    monkeypatch.setenv("FAKE_FAILURES", str(failures))
+
+    result = claude(retries=2, backoff=0.01).ask("hi")
+    assert not result.get("error")
+    assert result["response"]
+    assert result["attempts"] == 3
+    assert failures.read_text() == "0"
+
+
+def test_retries_give_up(claude, hire_home, monkeypatch):
+    failures = hire_home / "failures"
+    failures.write_text("5")
+    monkeypatch.setenv("FAKE_FAILURES", str(failures))
+
+    result = claude(retries=1, backoff=0.01).ask("hi")
+    assert "429" in result["error"]
+    assert result["attempts"] == 2
+
+
+def test_timeout_is_not_retried(claude, monkeypatch):
+    monkeypatch.setenv("FAKE_LATENCY", "30")
+    start = time.monotonic()
+    result = claude(timeout=0.5, retries=3).ask("hi")
+    assert result["error"] == "Timed out after 0.5s"
+    assert result["attempts"] == 1
+    assert time.monotonic() - start < 5
+
+
+def test_deadline_caps_attempts(claude, hire_home, monkeypatch):
+    failures = hire_home / "failures"
+    failures.write_text("100")
+    monkeypatch.setenv("FAKE_FAILURES", str(failures))
+
+    result = claude(retries=100, backoff=0.2, deadline=1).ask("hi")
+    # The last attempt may get only what is left of the deadline and time out
+    assert "429" in result["error"] or result["error"].startswith("Timed out")
+    assert result["attempts"] < 100
+    assert result["elapsed"] < 2
+
+
+def test_kill_children_stops_calls_on_other_threads(claude, monkeypatch):
+    monkeypatch.setenv("FAKE_LATENCY", "30")
+    adapter = claude()
+    results = []
+    thread = threading.Thread(target=lambda: results.append(adapter.ask("hi")))
+    thread.start()
+    time.sleep(0.5)
+
+    start = time.monotonic()
+    process.kill_children()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert time.monotonic() - start < 5
+    assert results[0]["error"]
+    assert results[0]["attempts"] == 1
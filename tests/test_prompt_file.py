@@ -0,0 +1,111 @@
+"""Tests for spilling large piped prompts to a file read by the agent on stdin."""
+
+import hashlib
+import io
+import json
+import sys
+
+import pytest
+
+from benchmarks.fake_agent import install
+from hire import cli
+from hire.adapters import get_adapter
+from hire.commands.ask import STDIN_SEPARATOR, read_prompt
+from hire.prompt_file import PromptFile, get_spill_dir, spill_prompt
+
+THRESHOLD = 1000
+
+
+def piped(data: bytes) -> io.TextIOWrapper:
+    """A non-terminal stdin holding data."""
+    return io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+
+
+def spilled() -> list[str]:
+    return [p.name for p in get_spill_dir().iterdir()]
+
+
+@pytest.fixture(autouse=True)
+def threshold(write_config):
+    write_config({"input": {"spill_bytes": THRESHOLD}})
+
+
+def test_small_input_stays_in_memory(monkeypatch):
+    monkeypatch.setattr(sys, "stdin", piped(b"x" * THRESHOLD))
+    assert read_prompt("review") == f"review{STDIN_SEPARATOR}{'x' * THRESHOLD}"
+    assert spilled() == []
+
+
+def test_large_input_is_spilled(monkeypatch):
+    data = "é" * THRESHOLD
+    monkeypatch.setattr(sys, "stdin", piped(data.encode()))
+    prompt = read_prompt("review")
+    assert isinstance(prompt, PromptFile)
+
+    # The threshold is in bytes, and the message leads the file as it would the argument
+    content = prompt.path.read_bytes()
+    assert content.decode() == f"review{STDIN_SEPARATOR}{data}"
+    assert prompt.size == len(content)
+    assert prompt.digest == hashlib.sha256(content).hexdigest()
+    prompt.remove()
+    assert spilled() == []
+
+
+def test_spill_is_removed_when_reading_fails():
+    class Broken(io.BytesIO):
+        def read(self, size: int | None = -1) -> bytes:
+            raise OSError("pipe broke")
+
+    with pytest.raises(OSError):
+        spill_prompt([b"head"], Broken())
+    assert spilled() == []
+
+
+@pytest.mark.parametrize("agent", ["claude", "codex", "gemini"])
+def test_commands_read_the_prompt_from_stdin(agent):
+    # With no message, the CLI is told to read the prompt from its stdin
+    cmd = get_adapter(agent).build_command(None)
+    assert not any("review" in arg for arg in cmd)
+    if agent == "codex":
+        assert cmd[-1] == "-"
+
+
+@pytest.fixture
+def claude(hire_home, write_config, monkeypatch):
+    """A claude that saves the stdin it got, then answers like the fake agent."""
+    monkeypatch.setenv("FAKE_STARTUP", "0")
+    monkeypatch.setenv("FAKE_LATENCY", "0")
+    fake = install(hire_home / "bin")["claude"]
+    wrapper = hire_home / "claude"
+    wrapper.write_text(
+        f'#!/bin/sh\ncat > "{hire_home}/stdin"\nprintf "%s\\n" "$@" > "{hire_home}/argv"\n'
+        f'exec "{fake}" "$@" < /dev/null\n'
+    )
+    wrapper.chmod(0o755)
+    write_config({"input": {"spill_bytes": THRESHOLD},
+                  "adapters": {"claude": {"command": str(wrapper), "args": []}}})
+    return hire_home
+
+
+def test_ask_hands_the_spilled_prompt_to_the_agent(claude, monkeypatch, capsys):
+    data = "line\n" * THRESHOLD
+    monkeypatch.setattr(sys, "argv", ["hire", "claude", "review", "--json"])
+    monkeypatch.setattr(sys, "stdin", piped(data.encode()))
+    assert cli.main() == 0
+    assert json.loads(capsys.readouterr().out)["response"]
+
+    assert (claude / "stdin").read_text() == f"review{STDIN_SEPARATOR}{data}"
+    assert "review" not in (claude / "argv").read_text()
+    assert spilled() == []
+
+
+def test_ask_removes_the_spill_on_error(claude, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("agent broke")
+
+    monkeypatch.setattr(get_adapter("claude").__class__, "ask", fail)
+    monkeypatch.setattr(sys, "argv", ["hire", "claude", "review", "--json"])
+    monkeypatch.setattr(sys, "stdin", piped(b"x" * (THRESHOLD + 1)))
+    with pytest.raises(RuntimeError):
+        cli.main()
+    assert spilled() == []
@@ -0,0 +1,91 @@
+"""Tests for the retention policy and garbage collection."""
+
+import gzip
+import json
+from datetime import datetime
+
+from hire.retention import (
+    collect_garbage,
+    get_archive_dir,
+    maybe_collect_garbage,
+    select_expired,
+)
+from hire.session import list_sessions
+from hire.store import get_store
+
+NOW = datetime(2024, 6, 30)
+
+
+def make(session_id: str, day: int, agent: str = "claude", name: str | None = None) -> dict:
+    return {"id": session_id, "agent": agent, "name": name,
+            "updated_at": f"2024-06-{day:02d}T12:00:00"}
+
+
+def expired_ids(sessions: list[dict], **policy) -> list[str]:
+    return sorted(s["id"] for s in select_expired(sessions, policy, now=NOW))
+
+
+def test_no_policy_keeps_everything():
+    assert expired_ids([make("a", 1), make("b", 2)]) == []
+
+
+def test_max_age_days():
+    # The cutoff is 2024-06-20T00:00
+    sessions = [make("old", 1), make("before", 19), make("after", 20), make("new", 29)]
+    assert expired_ids(sessions, max_age_days=10) == ["before", "old"]
+    assert expired_ids(sessions, max_age_days=30) == []
+
+
+def test_max_per_agent_keeps_the_newest():
+    sessions = [make("c1", 1), make("c2", 2), make("c3", 3),
+                make("x1", 1, agent="codex"), make("x2", 2, agent="codex")]
+    assert expired_ids(sessions, max_per_agent=2) == ["c1"]
+    assert expired_ids(sessions, max_per_agent=1) == ["c1", "c2", "x1"]
+    assert expired_ids(sessions, max_per_agent=0) == ["c1", "c2", "c3", "x1", "x2"]
+
+
+def test_age_and_count_combine():
+    sessions = [make("c1", 1), make("c2", 25), make("c3", 26), make("c4", 27)]
+    assert expired_ids(sessions, max_age_days=10, max_per_agent=2) == ["c1", "c2"]
+
+
+def test_named_sessions_are_kept_and_not_counted():
+    sessions = [make("named-old", 1, name="work"), make("named-new", 29, name="notes"),
+                make("c1", 2), make("c2", 3)]
+    # The named sessions neither expire nor use up the agent's quota
+    assert expired_ids(sessions, max_per_agent=1, max_age_days=100) == ["c1"]
+    assert expired_ids(sessions, max_age_days=10) == ["c1", "c2"]
+
+
+def test_named_sessions_expire_without_keep_named():
+    sessions = [make("named-old", 1, name="work"), make("c1", 29)]
+    assert expired_ids(sessions, max_age_days=10, keep_named=False) == ["named-old"]
+    assert expired_ids(sessions, max_per_agent=1, keep_named=False) == ["named-old"]
+
+
+def test_collect_garbage_archives_then_deletes(write_config):
+    write_config({"retention": {"max_per_agent": 1}})
+    for session in [make("c1", 1), make("c2", 2), make("kept", 3, name="work")]:
+        get_store().save(session)
+
+    assert [s["id"] for s in collect_garbage(dry_run=True)] == ["c1"]
+    assert len(list_sessions()) == 3
+
+    assert [s["id"] for s in collect_garbage()] == ["c1"]
+    assert sorted(s["id"] for s in list_sessions()) == ["c2", "kept"]
+    [archive] = get_archive_dir().glob("sessions-*.jsonl.gz")
+    with gzip.open(archive, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["id"] for line in f] == ["c1"]
+
+
+def test_auto_gc_runs_once_per_interval(write_config):
+    write_config({"retention": {"max_per_agent": 1, "auto": True, "interval_hours": 24}})
+    get_store().save(make("c1", 1))
+    get_store().save(make("c2", 2))
+    maybe_collect_garbage()
+    assert [s["id"] for s in list_sessions()] == ["c2"]
+
+    # Not due again yet
+    get_store().save(make("c3", 3))
+    maybe_collect_garbage()
+    assert len(list_sessions()) == 2
@@ -0,0 +1,49 @@
+"""Tests for daemon turns run on warm workers."""
+
+import os
+import time
+
+import pytest
+
+from benchmarks.fake_agent import install
+from hire.server import WorkerPool, run_turn
+
+
+@pytest.fixture
+def pool(hire_home, write_config, monkeypatch):
+    monkeypatch.setenv("FAKE_STARTUP", "0")
+    paths = install(hire_home / "bin")
+    write_config({"adapters": {"claude": {"command": paths["claude"], "args": [], "timeout": 1}}})
+    pool = WorkerPool(idle_workers=0, max_workers=2)
+    yield pool
+    pool.close()
+
+
+def turn(pool: WorkerPool, latency: str, session_id: str | None = None) -> list[dict]:
+    env = {**os.environ, "FAKE_LATENCY": latency}
+    request = {"op": "ask", "agent": "claude", "message": "hi", "session_id": session_id,
+               "cwd": os.getcwd(), "env": env}
+    events: list[dict] = []
+    run_turn(pool, request, events.append)
+    return events
+
+
+def test_turn_reports_attempts_and_elapsed(pool):
+    result = turn(pool, "0")[-1]["result"]
+    assert result["response"]
+    assert result["attempts"] == 1
+    assert result["elapsed"] < 1
+
+
+def test_timed_out_worker_is_killed_and_replaced(pool):
+    start = time.monotonic()
+    result = turn(pool, "30")[-1]["result"]
+    assert result["error"] == "Timed out after 1s"
+    assert result["attempts"] == 1
+    assert time.monotonic() - start < 5
+
+    # The session's next turn gets a fresh worker
+    assert pool.status()["session_workers"] == 0
+    result = turn(pool, "0")[-1]["result"]
+    assert not result.get("error")
+    assert pool.status()["cold_turns"] == 2
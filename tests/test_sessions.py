@@ -0,0 +1,88 @@
+"""Tests for paging and ordering sessions, as used by `sessions` and `-c`."""
+
+import io
+import json
+import sys
+from argparse import Namespace
+
+import pytest
+from test_json_store import make_session
+
+from benchmarks.fake_agent import install
+from hire import cli
+from hire.commands.sessions import run_sessions
+from hire.session import iter_sessions
+from hire.store import STORES, get_store
+
+
+@pytest.fixture(params=sorted(STORES))
+def backend(request, write_config):
+    """Use each store backend in turn through the session functions."""
+    write_config({"storage": {"backend": request.param}})
+    return request.param
+
+
+@pytest.fixture
+def saved(backend):
+    """Seven sessions, s0 oldest, alternating between claude and codex."""
+    for i in range(7):
+        get_store().save(make_session(f"s{i}", agent="claude" if i % 2 else "codex",
+                                      updated_at=f"2024-01-0{i + 1}T12:00:00"))
+
+
+def ids(sessions) -> list[str]:
+    return [s["id"] for s in sessions]
+
+
+def test_pages_cover_every_session_once(saved):
+    pages = [ids(iter_sessions(offset=offset, limit=3)) for offset in (0, 3, 6)]
+    assert pages == [["s6", "s5", "s4"], ["s3", "s2", "s1"], ["s0"]]
+    assert ids(iter_sessions(offset=7, limit=3)) == []
+    assert ids(iter_sessions(limit=0)) == []
+
+
+def test_since_applies_before_paging(saved):
+    assert ids(iter_sessions(since="2024-01-03")) == ["s6", "s5", "s4", "s3", "s2"]
+    assert ids(iter_sessions(since="2024-01-03", offset=1, limit=2)) == ["s5", "s4"]
+    assert ids(iter_sessions("claude", since="2024-01-03", offset=1)) == ["s3"]
+    # since is inclusive
+    assert ids(iter_sessions(since="2024-01-07T12:00:00")) == ["s6"]
+
+
+def test_an_updated_session_comes_first(saved):
+    get_store().save(make_session("s2", agent="codex", updated_at="2024-01-09T12:00:00"))
+    assert ids(iter_sessions(limit=2)) == ["s2", "s6"]
+    assert ids(iter_sessions()) == ["s2", "s6", "s5", "s4", "s3", "s1", "s0"]
+
+
+def test_sessions_command_pages(saved, capsys):
+    def listed(**options) -> list[str]:
+        args = {"target": None, "json": False, "jsonl": True, "limit": None,
+                "offset": None, "since": None, "reindex": False}
+        assert run_sessions(Namespace(**{**args, **options})) == 0
+        return [json.loads(line)["id"] for line in capsys.readouterr().out.splitlines()]
+
+    assert listed(limit=2) == ["s6", "s5"]
+    assert listed(limit=2, offset=2) == ["s4", "s3"]
+    assert listed(target="codex", offset=1) == ["s4", "s2", "s0"]
+    assert listed(since="2024-01-06", limit=5) == ["s6", "s5"]
+    assert run_sessions(Namespace(target=None, limit=-1)) == 1
+
+
+def test_continue_resumes_the_newest_session(saved, hire_home, write_config, monkeypatch,
+                                             capsys, backend):
+    monkeypatch.setenv("FAKE_STARTUP", "0")
+    monkeypatch.setenv("FAKE_LATENCY", "0")
+    paths = install(hire_home / "bin")
+    write_config({"storage": {"backend": backend}, "adapters": {
+        agent: {"command": paths[agent], "args": []} for agent in ("claude", "codex")
+    }})
+
+    # Without a target, -c picks the newest session of any agent
+    monkeypatch.setattr(sys, "argv", ["hire", "-c", "again", "--json"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO())
+    monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+    assert cli.main() == 0
+    output = json.loads(capsys.readouterr().out)
+    assert (output["session_id"], output["agent"]) == ("s6", "codex")
+    assert output["cli_session_id"] == "cli-s6"
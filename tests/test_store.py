@@ -0,0 +1,121 @@
+"""Tests every session store backend must pass, and migration between them."""
+
+from argparse import Namespace
+
+import pytest
+from test_json_store import make_session
+
+from hire.commands.migrate import run_migrate
+from hire.store import STORES, get_store, get_store_name
+
+
+@pytest.fixture(params=sorted(STORES))
+def store(request):
+    return get_store(request.param)
+
+
+def ids(sessions) -> list[str]:
+    return [s["id"] for s in sessions]
+
+
+def test_get_exact_and_prefix(store):
+    store.save(make_session("abc-1"))
+    store.save(make_session("abd-2"))
+    store.save(make_session("xyz-3", agent="gemini"))
+
+    assert store.get("abc-1")["cli_session_id"] == "cli-abc-1"
+    assert store.get("abd")["id"] == "abd-2"
+    assert store.get("xy")["agent"] == "gemini"
+    assert store.get("nope") is None
+    assert store.get("") is None
+    with pytest.raises(ValueError, match="matches 2 sessions"):
+        store.get("ab")
+
+
+def test_exact_id_wins_over_longer_ids(store):
+    store.save(make_session("abc"))
+    store.save(make_session("abc-2"))
+
+    assert store.get("abc")["id"] == "abc"
+    with pytest.raises(ValueError, match="matches 2 sessions"):
+        store.get("ab")
+
+
+def test_get_by_name_prefers_newest(store):
+    store.save(make_session("s1", name="work", updated_at="2024-01-01T00:00:00"))
+    store.save(make_session("s2", name="work", updated_at="2024-02-01T00:00:00"))
+    store.save(make_session("s3", name="other"))
+
+    assert store.get_by_name("work")["id"] == "s2"
+    assert store.get_by_name("missing") is None
+
+    # Renaming moves the session to its new name
+    store.save(make_session("s2", name="renamed", updated_at="2024-03-01T00:00:00"))
+    assert store.get_by_name("work")["id"] == "s1"
+    assert store.get_by_name("renamed")["id"] == "s2"
+
+
+def test_iter_sessions_pages_newest_first(store):
+    for i in range(5):
+        store.save(make_session(f"s{i}", agent="claude" if i % 2 else "codex",
+                                updated_at=f"2024-01-0{i + 1}T00:00:00"))
+
+    assert ids(store.list_sessions()) == ["s4", "s3", "s2", "s1", "s0"]
+    assert ids(store.iter_sessions(offset=1, limit=2)) == ["s3", "s2"]
+    assert ids(store.iter_sessions(offset=4, limit=5)) == ["s0"]
+    assert ids(store.iter_sessions(limit=0)) == []
+    assert ids(store.iter_sessions("claude")) == ["s3", "s1"]
+    assert ids(store.iter_sessions(since="2024-01-04")) == ["s4", "s3"]
+    assert ids(store.iter_sessions("codex", since="2024-01-02", limit=1)) == ["s4"]
+
+
+def test_latest_and_count(store):
+    store.save(make_session("c1", updated_at="2024-01-01T00:00:00"))
+    store.save(make_session("c2", updated_at="2024-01-02T00:00:00"))
+    store.save(make_session("x1", agent="codex", updated_at="2024-01-03T00:00:00"))
+
+    assert store.get_latest("claude")["id"] == "c2"
+    assert store.get_latest("gemini") is None
+    assert store.count() == 3
+    assert store.count("claude") == 2
+
+
+def test_delete_many(store):
+    for i in range(4):
+        store.save(make_session(f"s{i}", updated_at=f"2024-01-0{i + 1}T00:00:00"))
+
+    assert store.delete_many([make_session("s3"), make_session("s1"), make_session("gone")]) == 2
+    assert ids(store.list_sessions()) == ["s2", "s0"]
+    assert store.get_latest("claude")["id"] == "s2"
+    assert store.get("s3") is None
+    assert store.delete(make_session("s0"))
+    assert not store.delete(make_session("s0"))
+    assert store.count() == 1
+
+
+def test_migrate_json_to_sqlite(write_config, capsys):
+    write_config({"storage": {"backend": "json"}})
+    source = get_store("json")
+    saved = [
+        make_session("a1", updated_at="2024-01-01T00:00:00"),
+        make_session("a2", name="kept", updated_at="2024-01-03T00:00:00"),
+        make_session("b1", agent="codex", updated_at="2024-01-02T00:00:00"),
+    ]
+    saved[0]["created_at"] = "2023-12-31T00:00:00"
+    for session in saved:
+        source.save(session)
+
+    assert run_migrate(Namespace(backend="sqlite")) == 0
+    assert "Migrated 3 session(s) from json to sqlite" in capsys.readouterr().out
+    assert get_store_name() == "sqlite"
+
+    destination = get_store("sqlite")
+    # Sessions are copied whole, timestamps included
+    assert destination.list_sessions() == source.list_sessions()
+    assert destination.get("a1")["created_at"] == "2023-12-31T00:00:00"
+    assert destination.get_latest("claude")["id"] == "a2"
+    assert destination.get_latest("codex")["id"] == "b1"
+    assert destination.get_by_name("kept")["id"] == "a2"
+
+    assert run_migrate(Namespace(backend="sqlite")) == 0
+    assert "Already using the sqlite backend" in capsys.readouterr().out
@@ -0,0 +1,84 @@
+"""Tests for session transcripts and what happens to them on gc and delete."""
+
+import gzip
+
+import pytest
+
+from hire.retention import collect_garbage, get_archive_dir
+from hire.session import create_session, delete_session, delete_sessions
+from hire.transcript import (
+    append_turn,
+    count_turns,
+    get_transcripts_dir,
+    read_turns,
+    record_turn,
+)
+
+
+def turns(count: int) -> list[dict]:
+    return [{"prompt": f"question {i}", "response": f"answer {i}"} for i in range(count)]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_append_and_read_back(compress):
+    for number, turn in enumerate(turns(5), 1):
+        assert append_turn("s1", turn, compress=compress) == number
+
+    assert count_turns("s1") == 5
+    assert [t["prompt"] for t in read_turns("s1")] == [f"question {i}" for i in range(5)]
+    assert [t["turn"] for t in read_turns("s1", -2)] == [4, 5]
+    assert [t["response"] for t in read_turns("s1", 1, 3)] == ["answer 1", "answer 2"]
+    suffix = ".jsonl.gz" if compress else ".jsonl"
+    assert (get_transcripts_dir() / f"s1{suffix}").exists()
+    if compress:
+        assert len(gzip.decompress((get_transcripts_dir() / "s1.jsonl.gz").read_bytes())
+                   .splitlines()) == 5
+
+
+def test_lock_is_a_separate_file():
+    append_turn("s1", turns(1)[0])
+    assert (get_transcripts_dir() / "s1.lock").exists()
+    assert (get_transcripts_dir() / "s1.idx").stat().st_size == 16
+
+
+def test_partial_index_entry_is_dropped():
+    append_turn("s1", turns(1)[0])
+    with open(get_transcripts_dir() / "s1.idx", "ab") as idx:
+        idx.write(b"\0" * 5)
+    assert append_turn("s1", turns(2)[1]) == 2
+    assert [t["prompt"] for t in read_turns("s1")] == ["question 0", "question 1"]
+
+
+def test_invalid_session_id_is_rejected():
+    with pytest.raises(ValueError):
+        append_turn("../escape", turns(1)[0])
+
+
+def test_gc_archives_transcripts(write_config):
+    write_config({"retention": {"max_per_agent": 1}})
+    old = create_session("claude", "cli-old")
+    record_turn(old, "old question", "old answer")
+    new = create_session("claude", "cli-new")
+    record_turn(new, "new question", "new answer")
+
+    assert [s["id"] for s in collect_garbage()] == [old["id"]]
+    assert count_turns(old["id"]) == 0
+    assert count_turns(new["id"]) == 1
+    archived = get_archive_dir() / "transcripts"
+    assert sorted(p.name for p in archived.iterdir()) == [f"{old['id']}.idx", f"{old['id']}.jsonl"]
+    # The lock stays, so writers waiting on it still exclude each other
+    assert (get_transcripts_dir() / f"{old['id']}.lock").exists()
+
+
+def test_delete_removes_transcripts():
+    first = create_session("claude", "cli-1")
+    second = create_session("claude", "cli-2")
+    for session in (first, second):
+        record_turn(session, "question", "answer")
+
+    assert delete_session(first)
+    assert delete_sessions([second]) == 1
+    # Only the lock files are left
+    names = sorted(p.name for p in get_transcripts_dir().iterdir())
+    assert names == sorted(f"{s['id']}.lock" for s in (first, second))
+    assert not (get_archive_dir() / "transcripts").exists()